@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'events.instrumentation.MetricsMiddleware',  # first, so its timings cover the whole stack
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -85,6 +87,71 @@ DATABASES = {
     }
 }
 
+# SQLite tuning applied to every new connection (see events/sqlite.py)
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',  # readers don't block writers (and vice versa)
+    'synchronous': 'NORMAL',  # fsync at checkpoints only; safe with WAL
+    'busy_timeout': 5000,  # ms to wait on a locked database before failing
+    'mmap_size': 268435456,  # 256 MiB memory-mapped reads
+    'cache_size': -65536,  # 64 MiB page cache (negative = KiB)
+    'temp_store': 'MEMORY',
+}
+SQLITE_PRAGMAS = {}
+SQLITE_READ_ONLY_ALIASES = ()
+EVENTS_DB_READ_ALIAS = None  # alias ReadReplicaRouter sends event/review reads to
+
+# `EVENTS_DB_PROFILE=production` enables the tuned SQLite profile: WAL and
+# pragmas, persistent connections, and a read-only replica connection for
+# event/review reads. EVENTS_DB_REPLICA_NAME may point it at a replicated copy
+# of the database file; by default it opens the primary file read-only.
+EVENTS_DB_PROFILE = os.environ.get('EVENTS_DB_PROFILE', 'development')
+
+if EVENTS_DB_PROFILE == 'production':
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 600,  # keep connections open across requests
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'timeout': 5},  # seconds, mirrors busy_timeout
+    })
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ.get('EVENTS_DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    SQLITE_READ_ONLY_ALIASES = ('replica',)
+    EVENTS_DB_READ_ALIAS = 'replica'
+
+DATABASE_ROUTERS = ['events.routers.ReadReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# The event response cache and the authentication change marks need a cache
+# every worker process shares and that lives outside the database: set
+# EVENTS_REDIS_URL to use Redis. Without it the default cache is a
+# per-process LocMemCache, which events/cache.py treats as "no shared cache":
+# event reads go straight to the database and authentication loads the user
+# on every request. A DatabaseCache is refused the same way, since it would
+# put each cached read back on the database it is meant to spare.
+if os.environ.get('EVENTS_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['EVENTS_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'event-management',
+        }
+    }
+
+EVENTS_CACHE_ALIAS = 'default'  # shared cache for event responses and auth change marks (see above)
+EVENTS_CACHE_TIMEOUT = 60 * 60 * 24  # safety expiry; entries are invalidated by version bumps
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -122,6 +189,18 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# User uploads (profile pictures and their resized variants)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Square profile picture variants built after each upload (events/images.py),
+# name -> edge in pixels; each one is stored as WebP and JPEG
+EVENTS_PROFILE_PICTURE_VARIANTS = {
+    'thumb': 64,
+    'small': 160,
+    'medium': 320,
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -129,19 +208,54 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'events.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ),
 }
 
+# CachedJWTAuthentication: per-process LRU of authenticated users. Saves and
+# deletes invalidate entries in every process through EVENTS_CACHE_ALIAS, so
+# it is only used when that is a shared non-database cache (EVENTS_REDIS_URL)
+EVENTS_AUTH_USER_CACHE = {
+    'max_size': 10000,  # users kept per process
+    'ttl': 30,  # seconds before a cached user is reloaded anyway
+}
+# Safe requests to views with `lightweight_user = True` authenticate from the
+# token claims alone (a TokenUser, no database access). Like the user cache
+# above, needs a shared non-database cache (EVENTS_REDIS_URL); ignored without
+EVENTS_AUTH_LIGHTWEIGHT_READS = True
+
+# Where events.dispatch runs background tasks: 'celery' (broker below),
+# 'threadpool' (bounded in-process workers, no broker) or 'inline'
+EVENTS_TASK_BACKEND = 'celery'
+EVENTS_TASK_POOL = {
+    'workers': 4,  # worker threads
+    'max_queue': 1000,  # pending tasks before submitters block
+    'submit_timeout': 5.0,  # seconds a submitter waits on a full queue before QueueFull
+    'shutdown_timeout': 30.0,  # seconds to drain queued tasks at exit
+}
+
 CELERY_BROKER_URL = 'sqla+sqlite:///celerydb.sqlite3'  # lightweight broker
 CELERY_RESULT_BACKEND = 'django-db'
+CELERY_TASK_TRACK_STARTED = True  # records date_started, so /metrics can report Celery run times
 CELERY_CACHE_BACKEND = 'django-cache'
+CELERY_BEAT_SCHEDULE = {
+    'purge-revoked-tokens': {
+        'task': 'events.tasks.purge_revoked_tokens',
+        'schedule': 3600.0,  # seconds
+    },
+}
+
+# Transactional outbox for event notifications (see events/outbox.py)
+EVENTS_OUTBOX_AUTODRAIN = True  # drain in a background thread shortly after commit
+EVENTS_OUTBOX_COALESCE_SECONDS = 2.0  # edits landing within this window share one drain
+EVENTS_OUTBOX_BATCH_SIZE = 100  # messages handed to Celery per transaction
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'noreply@testevent.com'
+EVENT_EMAIL_CHUNK_SIZE = 500  # invitees per notification sub-task / mail connection
 
 
 SIMPLE_JWT = {
@@ -149,4 +263,23 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),   # 🔄 refresh token valid for 7 days
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    # Rotated refresh tokens are revoked in events.revocation instead of the token_blacklist app
+    'TOKEN_REFRESH_SERIALIZER': 'events.serializers.RevocableTokenRefreshSerializer',
+}
+
+# Per-route latency / query histograms on /metrics (see events/instrumentation.py)
+EVENTS_METRICS = {
+    'token': os.environ.get('EVENTS_METRICS_TOKEN'),  # Prometheus bearer token; staff sessions also work
+    'profile_sample_rate': 0.0,  # e.g. 0.01 to run 1% of requests under cProfile
+    'profile_threshold': 1.0,  # seconds; sampled requests slower than this are saved
+    'profile_dir': BASE_DIR / 'profiles',
+    'profile_keep': 50,
+}
+
+# Revoked refresh tokens: in-memory Bloom filter backed by the RevokedToken table
+EVENTS_TOKEN_REVOCATION = {
+    'capacity': 1000000,  # jtis the filter is sized for before it grows
+    'error_rate': 0.001,  # false positives cost one indexed lookup
+    'sync_interval': 1.0,  # seconds another process's revocation may go unseen here (one indexed read per interval)
+    'rebuild_interval': 3600,  # seconds between background rebuilds that drop expired jtis from the filter
 }
\ No newline at end of file
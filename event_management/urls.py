@@ -14,9 +14,12 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from events.instrumentation import metrics_view
 from events.views import home
 
 
@@ -26,4 +29,8 @@ urlpatterns = [
     path('api/', include('events.urls')), 
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('metrics', metrics_view, name='metrics'),
 ]
+
+# Uploaded media in development (production serves MEDIA_ROOT from the web server)
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,37 +1,203 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
+from django.utils.text import smart_split, unescape_string_literal
+
 from .models import UserProfile, Event, RSVP, Review
+from .search import search_events, search_reviews, uses_fts
+
+# ==============================
+# Scalable changelists
+# ==============================
+# Changelists over large tables avoid the three things that made them time
+# out: per-row queries for `organizer` / `event` / `user` (list_select_related),
+# exact COUNT(*)s (EstimatedCountPaginator + show_full_result_count = False)
+# and `LIKE '%term%'` scans (searches go through the FTS5 indexes and
+# case-insensitive prefix ranges on the LOWER(...) indexes of auth_user,
+# migration 0016).
+
+PREFIX_END = '\U0010ffff'  # Sorts after every character a name can contain
+USER_SEARCH_FIELDS = ('username', 'email', 'first_name', 'last_name')  # Each has a LOWER() index
+MAX_SEARCH_MATCHES = 1000  # Newest full-text matches a search pages through (a common word can match every row)
+
+
+def table_estimate(model, using):
+    """
+    Row count estimate from the database's statistics, without scanning the
+    table. None when the backend keeps none.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s',
+                [table],
+            )
+        elif connection.vendor == 'sqlite':
+            # The highest rowid is one B-tree descent; deleted rows make it an overestimate
+            cursor.execute(f'SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}')
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Exact counts for small results, estimates for large ones: the table
+    statistics for an unfiltered changelist, and a count capped at
+    `count_limit` rows (a LIMITed subquery) for a filtered or searched one.
+    """
+    exact_below = 10000  # Tables estimated smaller than this are counted exactly
+    count_limit = 10000  # Filtered results count at most this many rows
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = table_estimate(queryset.model, queryset.db)
+            if estimate is not None and estimate >= self.exact_below:
+                return estimate
+            return queryset.count()
+        return queryset.order_by()[:self.count_limit].count()
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # Skips the second, unfiltered COUNT(*)
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Uses `search_condition` (indexed lookups) instead of
+        `search_fields` (`icontains` on every field) when the admin defines
+        one; otherwise Django's own search applies.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        condition = self.search_condition(search_term)
+        if condition is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(condition), False
+
+    def search_condition(self, term):
+        """Q object matching `term`, or None to search `search_fields` as usual."""
+        return None
+
+
+def users_with_prefix(term, fields=('username',)):
+    """
+    Users with a `fields` value starting with `term`, ignoring case, as one
+    range scan per field on its LOWER() index. Both sides are lowered by the
+    database, so the folding matches the index exactly.
+    """
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{
+            f'{field}_lower__gte': Lower(Value(term)),
+            f'{field}_lower__lt': Lower(Value(term + PREFIX_END)),
+        })
+    lowered = {f'{field}_lower': Lower(field) for field in fields}
+    return User.objects.alias(**lowered).filter(condition).values('pk')
+
+
+def newest_matches(queryset):
+    """
+    The newest MAX_SEARCH_MATCHES ids of a full-text search. The FTS rowid is
+    the row id, so ordering on it reads matches straight off the index
+    instead of sorting all of them.
+    """
+    ordering = '-search_document__pk' if uses_fts(queryset) else '-pk'
+    return queryset.order_by(ordering).values('pk')[:MAX_SEARCH_MATCHES]
+
+
+def matching_events(term):
+    return newest_matches(search_events(Event.objects.all(), term))
+
+
+def matching_reviews(term):
+    return newest_matches(search_reviews(Review.objects.all(), term))
+
 
 # ==============================
 # Admin registrations
 # ==============================
 
+# Users: every word of the search must start the username, email, first or
+# last name (case-insensitive); the username part also backs the user
+# autocomplete widgets
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class ScalableUserAdmin(ScalableModelAdmin, UserAdmin):
+    search_fields = USER_SEARCH_FIELDS  # Declared for autocomplete; the lookup is search_condition
+
+    def search_condition(self, term):
+        condition = Q()
+        for word in smart_split(term):
+            if word[0] in '"\'' and word[0] == word[-1]:
+                word = unescape_string_literal(word)
+            condition &= Q(pk__in=users_with_prefix(word, USER_SEARCH_FIELDS))
+        return condition
+
+
 # Display UserProfile with user and full name in admin panel
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'full_name', 'location')
+    list_select_related = ('user',)
     search_fields = ('full_name', 'location', 'user__username')
 
 
 # Display Event model with useful fields for easy management
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(ScalableModelAdmin):
     list_display = ('title', 'organizer', 'location', 'start_time', 'end_time', 'is_public')
     list_filter = ('is_public', 'start_time')
-    search_fields = ('title', 'description', 'organizer__username', 'location')
-    filter_horizontal = ('invited_users',)
+    list_select_related = ('organizer',)
+    search_fields = ('title', 'description', 'location', 'organizer__username')  # Via FTS / username prefix
+    autocomplete_fields = ('organizer', 'invited_users')  # Searched on demand, not rendered as one <option> per user
+
+    def search_condition(self, term):
+        return Q(pk__in=matching_events(term)) | Q(organizer__in=users_with_prefix(term))
 
 
 # Display RSVP model showing event, user, and status
 @admin.register(RSVP)
-class RSVPAdmin(admin.ModelAdmin):
+class RSVPAdmin(ScalableModelAdmin):
     list_display = ('event', 'user', 'status')
     list_filter = ('status',)
-    search_fields = ('event__title', 'user__username')
+    list_select_related = ('event', 'user')
+    search_fields = ('event__title', 'user__username')  # Via FTS / username prefix
+    autocomplete_fields = ('event', 'user')
+
+    def search_condition(self, term):
+        return Q(event__in=matching_events(term)) | Q(user__in=users_with_prefix(term))
 
 
 # Display Review model showing event, user, and rating
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(ScalableModelAdmin):
     list_display = ('event', 'user', 'rating', 'created_at')
     list_filter = ('rating',)
-    search_fields = ('event__title', 'user__username', 'comment')
+    list_select_related = ('event', 'user')
+    search_fields = ('event__title', 'user__username', 'comment')  # Via FTS / username prefix
+    autocomplete_fields = ('event', 'user')
+
+    def search_condition(self, term):
+        return (
+            Q(pk__in=matching_reviews(term))
+            | Q(event__in=matching_events(term))
+            | Q(user__in=users_with_prefix(term))
+        )
@@ -0,0 +1,107 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .models import Event, Review
+from .pagination import EventCursorPagination, ReviewCursorPagination
+from .serializers import EventListSerializer, EventSerializer, ReviewSerializer
+
+
+# ================================================
+# Async read endpoints
+# ================================================
+# Native `async def` versions of the hot read paths, mounted under /api/async/.
+# Under ASGI they run on the event loop: the queries go through Django's async
+# ORM (`aget`, `aiterator`, `acount`) and only the DB work itself is handed
+# to a thread, so a request waiting on the database or on a slow client does
+# not pin a worker thread for its whole lifetime the way a sync DRF view does.
+#
+# They return the same payloads as the DRF views (same serializers, same
+# visibility rules, same cursor pagination) but skip the response cache.
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, encoder=DjangoJSONEncoder, safe=False)
+
+
+def _error(exc):
+    return _json({'detail': str(exc.detail)}, status=exc.status_code)
+
+
+@sync_to_async
+def _authenticate(request):
+    """
+    Runs the configured DRF authentication classes (JWT) and returns the user.
+    Token decoding and the user lookup are synchronous, so they run off the loop.
+    """
+    drf_request = Request(request)
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = authentication_class().authenticate(drf_request)
+        if result is not None:
+            return result[0]
+    return AnonymousUser()
+
+
+def async_read_only(view):
+    """
+    Wraps an async view: GET only, authenticates the request and turns DRF
+    API exceptions (bad token, bad cursor, not found) into JSON errors.
+    """
+    async def wrapped(request, *args, **kwargs):
+        if request.method != 'GET':
+            return _json({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+        try:
+            request.user = await _authenticate(request)
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            return _error(exc)
+    wrapped.__name__ = view.__name__
+    wrapped.__doc__ = view.__doc__
+    return wrapped
+
+
+@async_read_only
+async def event_list(request):
+    """
+    GET /api/async/events/ — keyset-paginated feed of the events the user can see.
+    """
+    queryset = Event.objects.visible_to(request.user).select_related('organizer', 'stats')
+    paginator = EventCursorPagination()
+    page = await paginator.apaginate_queryset(queryset, Request(request))
+    data = EventListSerializer(page, many=True).data
+    return _json(paginator.get_paginated_data(data))
+
+
+@async_read_only
+async def event_detail(request, pk):
+    """
+    GET /api/async/events/{id}/ — full representation, 404 when not visible.
+    """
+    queryset = Event.objects.visible_to(request.user).select_related('organizer', 'stats')
+    try:
+        event = await queryset.aget(pk=pk)
+    except Event.DoesNotExist:
+        return _json({'detail': 'Not found.'}, status=404)
+
+    # Related managers can't be read lazily from async code, so the invitee
+    # ids are fetched here and the serializer skips the m2m field
+    invited = Event.invited_users.through.objects.filter(event_id=event.pk).order_by('user_id')
+    invited_ids = [user_id async for user_id in invited.values_list('user_id', flat=True).aiterator()]
+    serializer = EventSerializer(event)
+    serializer.fields.pop('invited_users')
+    return _json({**serializer.data, 'invited_users': invited_ids})
+
+
+@async_read_only
+async def review_list(request, event_id):
+    """
+    GET /api/async/events/{event_id}/reviews/ — newest reviews first, cursor-based.
+    """
+    queryset = Review.objects.filter(event_id=event_id).select_related('user')
+    paginator = ReviewCursorPagination()
+    page = await paginator.apaginate_queryset(queryset, Request(request))
+    data = ReviewSerializer(page, many=True).data
+    return _json(paginator.get_paginated_data(data))
@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import permissions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import cache as event_cache
+from .metrics import Counter
+
+
+# ================================================
+# Cached JWT authentication
+# ================================================
+# simplejwt's JWTAuthentication loads the user by primary key on every request.
+# CachedJWTAuthentication still verifies the token signature each time but
+# resolves the user from a small per-process LRU with a short TTL.
+#
+# Saving or deleting a user records a "changed at" timestamp in the shared
+# cache (EVENTS_CACHE_ALIAS) for one access-token lifetime. Cached users older
+# than that mark are ignored, so deactivation and password changes take
+# effect on the next request in every process sharing the cache.
+#
+# Views that set `lightweight_user = True` get a TokenUser built from the
+# token claims for safe methods, with no database access at all, as long as
+# the token was issued after the user's last change.
+#
+# Both shortcuts need the marks in a cache every process shares and that is
+# not backed by the database (events/cache.py decides which qualify). Without
+# one, every request loads its user, as plain JWTAuthentication does: a
+# per-process cache would hide changes made elsewhere, and a DatabaseCache
+# would cost the query the shortcuts are there to save.
+
+class UserCache:
+    """
+    Bounded LRU of user field values keyed by user id. Entries expire `ttl`
+    seconds after they were stored. Instances are rebuilt per request, so
+    callers never share a model object across threads.
+    """
+
+    def __init__(self, max_size=10000, ttl=30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = Counter()
+        self.misses = Counter()
+        self._entries = OrderedDict()  # user_id -> (stored_at, db, field_names, values)
+        self._lock = threading.Lock()
+
+    def get(self, model, user_id, not_before=None):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                stored_at = entry[0]
+                if now - stored_at > self.ttl or (not_before is not None and stored_at <= not_before):
+                    del self._entries[user_id]
+                    entry = None
+                else:
+                    self._entries.move_to_end(user_id)
+        if entry is None:
+            self.misses.inc()
+            return None
+        self.hits.inc()
+        _, db, field_names, values = entry
+        return model.from_db(db, field_names, values)
+
+    def set(self, user_id, user):
+        field_names = [field.attname for field in user._meta.concrete_fields]
+        values = [getattr(user, name) for name in field_names]
+        with self._lock:
+            self._entries[user_id] = (time.time(), user._state.db, field_names, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {'size': len(self._entries), 'hits': self.hits.value, 'misses': self.misses.value}
+
+
+_user_cache = None
+_user_cache_lock = threading.Lock()
+
+
+def get_user_cache():
+    global _user_cache
+    if _user_cache is None:
+        with _user_cache_lock:
+            if _user_cache is None:
+                _user_cache = UserCache(**getattr(settings, 'EVENTS_AUTH_USER_CACHE', {}))
+    return _user_cache
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    global _user_cache
+    if setting == 'EVENTS_AUTH_USER_CACHE':
+        _user_cache = None
+
+
+# ------------------------------------------------
+# Change markers (shared between processes)
+# ------------------------------------------------
+def _changed_key(user_id):
+    return f'events:auth:changed:{user_id}'
+
+
+def mark_user_changed(user_id):
+    """
+    Called when a user is saved or deleted: drops the local entry and tells
+    every process that tokens issued before now need a database check.
+    """
+    get_user_cache().invalidate(user_id)
+    shared = event_cache.get_cache()
+    if shared is not None:
+        lifetime = jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+        shared.set(_changed_key(user_id), time.time(), timeout=lifetime)
+
+
+def user_changed_at(user_id):
+    return event_cache.get_cache().get(_changed_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        self.request = request
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        """
+        Returns a TokenUser for lightweight reads, a cached user when one is
+        fresh, and otherwise loads (and caches) the user from the database.
+        """
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        if not event_cache.enabled():
+            return super().get_user(validated_token)  # No shared marks: nothing can be trusted without a load
+
+        changed_at = user_changed_at(user_id)
+        if self.lightweight_allowed():
+            issued_at = validated_token.get('iat')
+            if changed_at is None or (issued_at is not None and issued_at > changed_at):
+                return jwt_settings.TOKEN_USER_CLASS(validated_token)
+
+        user_cache = get_user_cache()
+        user = user_cache.get(self.user_model, user_id, not_before=changed_at)
+        if user is not None:
+            self.check_user(user, validated_token)
+            return user
+
+        user = super().get_user(validated_token)
+        user_cache.set(user_id, user)
+        return user
+
+    def lightweight_allowed(self):
+        if not getattr(settings, 'EVENTS_AUTH_LIGHTWEIGHT_READS', False):
+            return False
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return False
+        view = (getattr(request, 'parser_context', None) or {}).get('view')
+        return getattr(view, 'lightweight_user', False)
+
+    def check_user(self, user, validated_token):
+        """
+        The same checks JWTAuthentication runs after loading a user.
+        """
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
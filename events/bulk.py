@@ -0,0 +1,187 @@
+import csv
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from .models import Event, RSVP, Review
+from .scale import _batched
+
+
+# ================================================
+# Bulk export / import of events, RSVPs and reviews
+# ================================================
+# Exports walk the tables with .iterator(chunk_size=...) and stream rows out
+# as NDJSON or CSV, so memory stays flat however many rows there are. Imports
+# read the same formats back in batches of bulk_create, one transaction per
+# batch. Row ids are kept, so RSVPs and reviews still point at their events.
+
+EXPORT_FIELDS = {
+    'events': [
+        'id', 'title', 'description', 'organizer_id', 'location', 'start_time', 'end_time',
+        'is_public', 'created_at', 'updated_at', 'invited_user_ids',
+    ],
+    'rsvps': ['id', 'event_id', 'user_id', 'status'],
+    'reviews': ['id', 'event_id', 'user_id', 'rating', 'comment', 'created_at'],
+}
+
+EXPORT_MODELS = {'events': Event, 'rsvps': RSVP, 'reviews': Review}
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+ROWS_PER_WRITE = 500  # Rows joined into each chunk handed to the server
+
+
+def export_rows(kind, chunk_size=2000):
+    """
+    Yields one dict per row of `kind` ('events', 'rsvps' or 'reviews') in id
+    order. Events carry their invitee ids, read with one query per chunk.
+    """
+    fields = EXPORT_FIELDS[kind]
+    if kind != 'events':
+        queryset = EXPORT_MODELS[kind].objects.order_by('id').values_list(*fields)
+        for values in queryset.iterator(chunk_size=chunk_size):
+            yield dict(zip(fields, values))
+        return
+
+    columns = fields[:-1]
+    queryset = Event.objects.order_by('id').values_list(*columns)
+    for chunk in _batched(queryset.iterator(chunk_size=chunk_size), chunk_size):
+        invited = defaultdict(list)
+        invitations = Event.invited_users.through.objects.filter(
+            event_id__in=[values[0] for values in chunk]
+        ).values_list('event_id', 'user_id').order_by('event_id', 'user_id')
+        for event_id, user_id in invitations:
+            invited[event_id].append(user_id)
+        for values in chunk:
+            row = dict(zip(columns, values))
+            row['invited_user_ids'] = invited.get(row['id'], [])
+            yield row
+
+
+class _Echo:
+    """csv.writer target that hands back each line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+def _csv_lines(kind, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS[kind])
+    for row in rows:
+        if kind == 'events':
+            row['invited_user_ids'] = ' '.join(map(str, row['invited_user_ids']))
+        yield writer.writerow(
+            [value.isoformat() if hasattr(value, 'isoformat') else value for value in row.values()]
+        )
+
+
+def export_chunks(kind, file_format, chunk_size=2000):
+    """
+    Streams `kind` as `file_format` text, ROWS_PER_WRITE lines per chunk.
+    """
+    rows = export_rows(kind, chunk_size=chunk_size)
+    lines = _ndjson_lines(rows) if file_format == 'ndjson' else _csv_lines(kind, rows)
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= ROWS_PER_WRITE:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def read_rows(kind, lines, file_format):
+    """
+    Parses exported NDJSON or CSV lines back into dicts of column values.
+    Types are converted by the import, so CSV strings are fine here.
+    """
+    if file_format == 'ndjson':
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    for row in csv.DictReader(lines):
+        if kind == 'events':
+            row['invited_user_ids'] = [int(user_id) for user_id in row['invited_user_ids'].split()]
+        yield row
+
+
+@contextmanager
+def preserve_timestamps(model):
+    """
+    Turns off auto_now / auto_now_add on `model` for the block, so imported
+    created_at / updated_at values are written as they are. Only meant for
+    single-threaded management commands.
+    """
+    fields = [field for field in model._meta.concrete_fields if getattr(field, 'auto_now_add', False)
+              or getattr(field, 'auto_now', False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _build(model, row, fields):
+    values = {}
+    for name in fields:
+        field = model._meta.get_field(name[:-3] if name.endswith('_id') else name)
+        value = row.get(name)
+        values[field.attname] = None if value in (None, '') and field.null else field.to_python(value)
+    return model(**values)
+
+
+def import_batch(kind, rows):
+    """
+    Inserts one batch in a single transaction. Events go in first, then their
+    invitations as plain rows of the M2M table. Rows whose id (or unique key)
+    already exists are skipped, so an interrupted import can be re-run.
+    """
+    model = EXPORT_MODELS[kind]
+    fields = [field for field in EXPORT_FIELDS[kind] if field != 'invited_user_ids']
+    objects = [_build(model, row, fields) for row in rows]
+    with transaction.atomic():
+        model.objects.bulk_create(objects, ignore_conflicts=True)
+        if kind == 'events':
+            Invitation = Event.invited_users.through
+            Invitation.objects.bulk_create(
+                [
+                    Invitation(event_id=int(row['id']), user_id=user_id)
+                    for row in rows
+                    for user_id in row['invited_user_ids']
+                ],
+                ignore_conflicts=True,
+            )
+    return len(objects)
+
+
+def reset_sequences(kind):
+    """
+    Moves the id sequence past the imported ids on backends that need it
+    (SQLite tracks explicit ids by itself, so this is a no-op there).
+    """
+    models = [EXPORT_MODELS[kind]]
+    if kind == 'events':
+        models.append(Event.invited_users.through)
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
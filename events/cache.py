@@ -0,0 +1,133 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+
+# ================================================
+# Versioned response cache for event endpoints
+# ================================================
+# Cached payloads are stored under Django's cache `version` argument. Any
+# change to events or invitations bumps one global version number, so every
+# stale entry simply stops being looked up and ages out on its own.
+#
+# The cache is only used when EVENTS_CACHE_ALIAS names a backend that every
+# process shares and that lives outside the database (Redis, Memcached,
+# files). A per-process LocMemCache can't carry a version bump to the other
+# workers, and a DatabaseCache turns each read into more queries (plus a
+# write on a miss) than it saves. With those, or no alias, reads go
+# straight to the database.
+
+UNSHARED_BACKENDS = (LocMemCache, DummyCache, DatabaseCache)
+
+VERSION_KEY = 'events:cache-version'
+PAYLOAD_FORMAT = 2  # Bump whenever the stored payload changes shape, so old entries are never read back
+
+_counters = {'hits': 0, 'misses': 0}
+_counters_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    The shared cache named by EVENTS_CACHE_ALIAS, or None when there is no
+    usable one (see UNSHARED_BACKENDS).
+    """
+    alias = getattr(settings, 'EVENTS_CACHE_ALIAS', None)
+    if not alias:
+        return None
+    cache = caches[alias]
+    return None if isinstance(cache, UNSHARED_BACKENDS) else cache
+
+
+def enabled():
+    return get_cache() is not None
+
+
+def get_timeout():
+    return getattr(settings, 'EVENTS_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def current_version():
+    cache = get_cache()
+    if cache is None:
+        return None
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_version():
+    cache = get_cache()
+    if cache is None:
+        return
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Key was evicted: start a new series that can't collide with old entries
+        cache.set(VERSION_KEY, current_version() + 1, timeout=None)
+
+
+def invalidate():
+    """
+    Bumps the version now and again once the surrounding transaction commits,
+    so a reader that re-cached the old rows mid-transaction is discarded too.
+    """
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def visibility_scope(user):
+    """
+    Which visibility class a response belongs to. Anonymous users all share
+    one class (public events only). Authenticated users see their own and
+    invited events on top of that, so their class is per-user.
+    """
+    if not user.is_authenticated:
+        return 'anon'
+    return f'user:{user.pk}'
+
+
+def build_key(kind, request):
+    path = f'{request.get_host()}{request.get_full_path()}'
+    digest = hashlib.md5(path.encode('utf-8')).hexdigest()
+    return f'events:{kind}:f{PAYLOAD_FORMAT}:{visibility_scope(request.user)}:{digest}'
+
+
+def _record(outcome):
+    with _counters_lock:
+        _counters[outcome] += 1
+
+
+def get_response_data(kind, request, version):
+    """
+    Returns the cached payload for this request, or None on a miss.
+    """
+    data = get_cache().get(build_key(kind, request), version=version)
+    _record('hits' if data is not None else 'misses')
+    return data
+
+
+def set_response_data(kind, request, data, version):
+    """
+    Stores the payload under the version read *before* it was computed, so a
+    write that lands mid-request can never be masked by a stale entry.
+    """
+    get_cache().set(build_key(kind, request), data, timeout=get_timeout(), version=version)
+
+
+def stats():
+    with _counters_lock:
+        return dict(_counters, enabled=enabled(), version=current_version())
+
+
+def reset_stats():
+    with _counters_lock:
+        for name in _counters:
+            _counters[name] = 0
@@ -0,0 +1,289 @@
+import atexit
+import itertools
+import logging
+import queue
+import threading
+import time
+
+from celery import states
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.db.models import Count, DurationField, F, Q, Sum
+from django.dispatch import receiver
+
+from .metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+
+# ================================================
+# Pluggable task dispatch
+# ================================================
+# Code in the events app submits background work through `submit()` instead
+# of calling `.delay()` directly. EVENTS_TASK_BACKEND picks where it runs:
+#   'celery'     – publish to the configured Celery broker (default)
+#   'threadpool' – bounded in-process worker threads, no broker at all
+#   'inline'     – run immediately in the caller (tests, scripts)
+#
+# Priorities go from 0 (most urgent) to 9; 5 is the default.
+
+DEFAULT_PRIORITY = 5
+
+
+class DispatchError(Exception):
+    pass
+
+
+class QueueFull(DispatchError):
+    """
+    Raised when the in-process queue stays full for longer than the submit
+    timeout (backpressure reaching the caller).
+    """
+
+
+class TaskBackend:
+    name = None
+
+    def __init__(self):
+        self.submitted = Counter()
+        self.succeeded = Counter()
+        self.failed = Counter()
+        self.queue_wait = Histogram()  # seconds from submit to start
+        self.run_time = Histogram()  # seconds spent executing
+
+    def submit(self, task, args, kwargs, priority):
+        raise NotImplementedError
+
+    def queue_depth(self):
+        return None
+
+    def shutdown(self, wait=True):
+        pass
+
+    def _run(self, task, args, kwargs):
+        """
+        Runs the task locally with a full Celery request context (so bound
+        tasks can read `self.request` and `retry()` re-executes in place).
+        """
+        started = time.monotonic()
+        try:
+            result = task.apply(args=args, kwargs=kwargs)
+            if result.failed():
+                self.failed.inc()
+                logger.error("Task %s failed: %r", task.name, result.result)
+            else:
+                self.succeeded.inc()
+        finally:
+            self.run_time.observe(time.monotonic() - started)
+
+    def metrics(self):
+        return {
+            'backend': self.name,
+            'queue_depth': self.queue_depth(),
+            'submitted': self.submitted.value,
+            'succeeded': self.succeeded.value,
+            'failed': self.failed.value,
+            'queue_wait_seconds': self.queue_wait.snapshot(),
+            'run_time_seconds': self.run_time.snapshot(),
+        }
+
+
+# ------------------------------------------------
+# Celery backend
+# ------------------------------------------------
+class CeleryBackend(TaskBackend):
+    name = 'celery'
+
+    def submit(self, task, args, kwargs, priority):
+        task.apply_async(args=args, kwargs=kwargs, priority=priority)
+        self.submitted.inc()
+
+    def queue_depth(self):
+        """
+        Messages waiting in the default queue, asked of the broker on demand
+        (only when metrics are read, never on the submit path).
+        """
+        from event_management.celery import app
+
+        try:
+            with app.connection_for_read() as connection:
+                declared = connection.default_channel.queue_declare(
+                    queue=app.conf.task_default_queue, passive=True
+                )
+            return declared.message_count
+        except Exception:
+            return None
+
+    def metrics(self):
+        """
+        Tasks run in the worker processes, so their outcomes and run times are
+        read from the result backend (django_celery_results) rather than from
+        this process's counters. Results are purged after `result_expires`, so
+        these totals can go down. Queue wait isn't recorded there.
+        """
+        from django_celery_results.models import TaskResult
+
+        finished = Q(status__in=states.READY_STATES, date_started__isnull=False)
+        rows = TaskResult.objects.values('status').annotate(
+            tasks=Count('id'),
+            timed=Count('id', filter=finished),
+            run_time=Sum(F('date_done') - F('date_started'), filter=finished, output_field=DurationField()),
+        )
+        by_status = {row['status']: row for row in rows}
+        timed = sum(row['timed'] for row in by_status.values())
+        run_time = sum((row['run_time'].total_seconds() for row in by_status.values() if row['run_time']), 0.0)
+        return dict(
+            super().metrics(),
+            succeeded=by_status.get('SUCCESS', {}).get('tasks', 0),
+            failed=by_status.get('FAILURE', {}).get('tasks', 0),
+            queue_wait_seconds=None,
+            run_time_seconds={'buckets': [(float('inf'), timed)], 'sum': run_time, 'count': timed},
+        )
+
+
+# ------------------------------------------------
+# Inline backend
+# ------------------------------------------------
+class InlineBackend(TaskBackend):
+    name = 'inline'
+
+    def submit(self, task, args, kwargs, priority):
+        self.submitted.inc()
+        self.queue_wait.observe(0.0)
+        self._run(task, args, kwargs)
+
+
+# ------------------------------------------------
+# In-process thread-pool backend
+# ------------------------------------------------
+class ThreadPoolBackend(TaskBackend):
+    """
+    Runs tasks on a fixed set of daemon threads fed by a bounded priority
+    queue. A full queue blocks the submitter for up to `submit_timeout`
+    seconds and then raises QueueFull. On shutdown the queue is drained:
+    tasks already accepted still run before the workers exit.
+    """
+    name = 'threadpool'
+    _STOP = float('inf')  # sentinel priority, sorts after every real task
+
+    def __init__(self, workers=4, max_queue=1000, submit_timeout=5.0, shutdown_timeout=30.0):
+        super().__init__()
+        self.submit_timeout = submit_timeout
+        self.shutdown_timeout = shutdown_timeout
+        self.rejected = Counter()
+        self._queue = queue.PriorityQueue(maxsize=max_queue)
+        self._sequence = itertools.count()  # FIFO within one priority
+        self._accepting = True
+        self._threads = [
+            threading.Thread(target=self._work, name=f'events-task-{index}', daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.shutdown)
+
+    def submit(self, task, args, kwargs, priority):
+        if not self._accepting:
+            raise DispatchError("Task pool is shutting down")
+        item = (priority, next(self._sequence), time.monotonic(), task, args, kwargs)
+        try:
+            self._queue.put(item, timeout=self.submit_timeout)
+        except queue.Full:
+            self.rejected.inc()
+            raise QueueFull(f"Task queue is full ({self._queue.maxsize} pending)")
+        self.submitted.inc()
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def _work(self):
+        while True:
+            priority, _, enqueued_at, task, args, kwargs = self._queue.get()
+            try:
+                if priority == self._STOP:
+                    return
+                self.queue_wait.observe(time.monotonic() - enqueued_at)
+                close_old_connections()
+                self._run(task, args, kwargs)
+            except Exception:
+                logger.exception("Task %s crashed", getattr(task, 'name', task))
+            finally:
+                close_old_connections()
+                self._queue.task_done()
+
+    def shutdown(self, wait=True):
+        """
+        Stops accepting work and lets the workers finish everything queued.
+        """
+        if not self._accepting:
+            return
+        self._accepting = False
+        for _ in self._threads:
+            self._queue.put((self._STOP, next(self._sequence), 0.0, None, None, None))
+        if wait:
+            deadline = time.monotonic() + self.shutdown_timeout
+            for thread in self._threads:
+                thread.join(max(0.0, deadline - time.monotonic()))
+
+    def metrics(self):
+        data = super().metrics()
+        data['rejected'] = self.rejected.value
+        data['workers'] = len(self._threads)
+        return data
+
+
+# ------------------------------------------------
+# Backend selection
+# ------------------------------------------------
+BACKENDS = {
+    'celery': CeleryBackend,
+    'threadpool': ThreadPoolBackend,
+    'inline': InlineBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = getattr(settings, 'EVENTS_TASK_BACKEND', 'celery')
+                try:
+                    backend_class = BACKENDS[name]
+                except KeyError:
+                    raise DispatchError(f"Unknown EVENTS_TASK_BACKEND {name!r}")
+                options = getattr(settings, 'EVENTS_TASK_POOL', {}) if name == 'threadpool' else {}
+                _backend = backend_class(**options)
+    return _backend
+
+
+def reset_backend(wait=True):
+    """
+    Shuts the current backend down (draining the pool) and forgets it.
+    """
+    global _backend
+    with _backend_lock:
+        backend, _backend = _backend, None
+    if backend is not None:
+        backend.shutdown(wait=wait)
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting in ('EVENTS_TASK_BACKEND', 'EVENTS_TASK_POOL'):
+        reset_backend()
+
+
+def submit(task, *args, priority=DEFAULT_PRIORITY, **kwargs):
+    """
+    Queues `task(*args, **kwargs)` on the configured backend.
+    """
+    get_backend().submit(task, args, kwargs, priority)
+
+
+def metrics():
+    return get_backend().metrics()
@@ -0,0 +1,158 @@
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+from .models import Event, FacetCount
+
+
+# ================================================
+# Facet counts for the event feed
+# ================================================
+# Counts per location, visibility, organizer and start month (UTC) are kept
+# incrementally in FacetCount for public events only. Those rows are shared
+# by every visitor. A signed-in user's counts add the private events they can
+# see (their own and the ones they are invited to). That set is small, so it
+# is read in one query and merged in Python.
+#
+# Counts describe everything the user can see. They don't narrow when
+# filters are applied.
+
+FACETS = ('location', 'is_public', 'organizer', 'month')
+FACET_FIELDS = ('is_public', 'location', 'organizer_id', 'start_time')  # Columns the facets derive from
+
+
+def month_key(start_time):
+    return start_time.astimezone(dt_timezone.utc).strftime('%Y-%m')
+
+
+def facet_values(is_public, location, organizer_id, start_time):
+    return {
+        'location': location,
+        'is_public': 'true' if is_public else 'false',
+        'organizer': str(organizer_id),
+        'month': month_key(start_time),
+    }
+
+
+def event_row(event):
+    return tuple(getattr(event, field) for field in FACET_FIELDS)
+
+
+def apply_facet_changes(changes):
+    """
+    Moves the public counters for changed events. `changes` is an iterable
+    of `(old_row, new_row)` tuples of FACET_FIELDS values, with None for a
+    create (old) or a delete (new). Private rows don't count.
+    """
+    deltas = Counter()
+    for old_row, new_row in changes:
+        if old_row is not None and old_row[0]:
+            for facet, value in facet_values(*old_row).items():
+                deltas[(facet, value)] -= 1
+        if new_row is not None and new_row[0]:
+            for facet, value in facet_values(*new_row).items():
+                deltas[(facet, value)] += 1
+
+    for (facet, value), delta in deltas.items():
+        if delta:
+            _apply(facet, value, delta)
+
+
+def _apply(facet, value, delta):
+    count = F('count') + delta if delta > 0 else Greatest(F('count') + delta, 0)
+    rows = FacetCount.objects.filter(facet=facet, value=value)
+    if not rows.update(count=count):
+        FacetCount.objects.bulk_create([FacetCount(facet=facet, value=value)], ignore_conflicts=True)
+        rows.update(count=count)
+
+
+def rebuild_facet_counts(batch_size=1000):
+    """
+    Recomputes every public facet counter from the Event table (repairs drift
+    and covers bulk inserts, which bypass signals). Returns the number of rows.
+    """
+    counts = Counter()
+    rows = Event.objects.filter(is_public=True).values_list(*FACET_FIELDS)
+    for row in rows.iterator(chunk_size=batch_size):
+        for facet, value in facet_values(*row).items():
+            counts[(facet, value)] += 1
+
+    with transaction.atomic():
+        FacetCount.objects.all().delete()
+        FacetCount.objects.bulk_create(
+            [FacetCount(facet=facet, value=value, count=count) for (facet, value), count in counts.items()],
+            batch_size=batch_size,
+        )
+    return len(counts)
+
+
+def private_facet_counts(user):
+    """
+    Facet counts of the private events `user` can see, from one query.
+    """
+    counts = {facet: Counter() for facet in FACETS}
+    if not user.is_authenticated:
+        return counts
+    invited = Event.invited_users.through.objects.filter(user_id=user.pk).values('event_id')
+    rows = (
+        Event.objects.filter(is_public=False)
+        .filter(Q(organizer_id=user.pk) | Q(pk__in=invited))
+        .values_list(*FACET_FIELDS)
+    )
+    for row in rows:
+        for facet, value in facet_values(*row).items():
+            counts[facet][value] += 1
+    return counts
+
+
+def facet_counts(user, limit=20):
+    """
+    Top `limit` values of each facet for what `user` can see:
+    {'location': [{'value': 'Berlin', 'count': 12}, ...], 'organizer': [{'value': 3, 'label': 'dev', ...}], ...}
+    """
+    private = private_facet_counts(user)
+    result = {}
+    for facet in FACETS:
+        extra = private[facet]
+        # Enough public rows that no value can be pushed out by the private additions
+        rows = (
+            FacetCount.objects.filter(facet=facet, count__gt=0)
+            .order_by('-count', 'value')
+            .values_list('value', 'count')[:limit + len(extra)]
+        )
+        counts = Counter(dict(rows))
+        counts.update(extra)
+        top = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        result[facet] = [{'value': value, 'count': count} for value, count in top]
+
+    for item in result['is_public']:
+        item['value'] = item['value'] == 'true'
+    organizers = result['organizer']
+    organizer_ids = [int(item['value']) for item in organizers]
+    usernames = dict(User.objects.filter(pk__in=organizer_ids).values_list('id', 'username'))
+    for item in organizers:
+        item['value'] = int(item['value'])
+        item['label'] = usernames.get(item['value'])
+    return result
+
+
+def filter_events(queryset, filters):
+    """
+    Applies the validated facet filters (see EventFacetFilterSerializer).
+    """
+    if 'location' in filters:
+        queryset = queryset.filter(location=filters['location'])
+    if 'is_public' in filters:
+        queryset = queryset.filter(is_public=filters['is_public'])
+    if 'organizer' in filters:
+        queryset = queryset.filter(organizer_id=filters['organizer'])
+    if 'month' in filters:
+        year, month = (int(part) for part in filters['month'].split('-'))
+        start = datetime(year, month, 1, tzinfo=dt_timezone.utc)
+        end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=dt_timezone.utc)
+        queryset = queryset.filter(start_time__gte=start, start_time__lt=end)
+    return queryset
@@ -0,0 +1,99 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+
+# ================================================
+# Profile picture variants
+# ================================================
+# Avatars are shown at a few fixed sizes, so after an upload a background task
+# (tasks.process_profile_picture) builds square WebP and JPEG copies of each
+# size next to the original: profiles/me.jpg -> profiles/me_thumb.webp, ...
+# Copies are re-encoded from pixels only, so EXIF (GPS, camera serials) and
+# other metadata never reach them. UserProfile.picture_variants records which
+# original they were built from plus the stored file names:
+#   {'source': 'profiles/me.jpg', 'thumb': {'webp': '...', 'jpeg': '...'}, ...}
+
+DEFAULT_VARIANTS = {
+    'thumb': 64,  # lists, comments
+    'small': 160,  # cards
+    'medium': 320,  # profile page
+}
+
+FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+
+def variant_sizes():
+    return getattr(settings, 'EVENTS_PROFILE_PICTURE_VARIANTS', DEFAULT_VARIANTS)
+
+
+def render_variants(source):
+    """
+    Decodes the image in `source` (a file object) once and returns
+    {variant: {format: bytes}} for every configured size.
+    """
+    sizes = variant_sizes()
+    with Image.open(source) as image:
+        # JPEG can decode at 1/2, 1/4 or 1/8 scale, far cheaper than full size
+        image.draft('RGB', (max(sizes.values()) * 2,) * 2)
+        image = ImageOps.exif_transpose(image)  # Bake the rotation in before EXIF goes
+        if image.mode not in ('RGB', 'RGBA'):
+            # Palette and grayscale images would resize with NEAREST; CMYK can't go to WebP
+            has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        rendered = {}
+        for name, size in sizes.items():
+            square = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            rendered[name] = {
+                extension: _encode(square, options) for extension, options in FORMATS.items()
+            }
+        return rendered
+
+
+def _encode(image, options):
+    if options['format'] == 'JPEG' and image.mode == 'RGBA':
+        # No alpha in JPEG: flatten transparent pixels onto white
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    else:
+        image = image.copy()
+
+    image.info = {}  # Nothing from the original (EXIF, ICC, XMP, comments) is written back
+    buffer = BytesIO()
+    image.save(buffer, **options)
+    return buffer.getvalue()
+
+
+def variant_name(source_name, variant, extension):
+    stem = os.path.splitext(source_name)[0]
+    return f'{stem}_{variant}.{extension}'
+
+
+def store_variants(storage, source_name, rendered):
+    """
+    Saves rendered variants next to the original and returns their names
+    (the storage may add a suffix if a name is taken).
+    """
+    stored = {'source': source_name}
+    for variant, encoded in rendered.items():
+        stored[variant] = {
+            extension: storage.save(variant_name(source_name, variant, extension), ContentFile(data))
+            for extension, data in encoded.items()
+        }
+    return stored
+
+
+def delete_variants(storage, variants):
+    for variant, names in variants.items():
+        if variant == 'source':
+            continue
+        for name in names.values():
+            storage.delete(name)
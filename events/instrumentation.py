@@ -0,0 +1,308 @@
+import cProfile
+import os
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from . import dispatch
+from .metrics import Counter, Histogram
+
+
+# ================================================
+# Per-route request instrumentation
+# ================================================
+# MetricsMiddleware times every request and, through a DB execute wrapper,
+# counts the queries it runs and the time spent in them. Observations go into
+# per-route histograms (route = URL name, or the view path for unnamed
+# routes) exposed in the Prometheus text format on /metrics. Optionally a
+# random sample of requests runs under cProfile; profiles of the slow ones
+# are written to disk for `python -m pstats`.
+
+LATENCY_BUCKETS = Histogram.DEFAULT_BUCKETS
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+QUERY_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+RESPONSE_BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+DEFAULTS = {
+    'token': None,  # bearer token Prometheus scrapes /metrics with (staff sessions always work)
+    'profile_sample_rate': 0.0,  # share of requests run under cProfile, 0 disables
+    'profile_threshold': 1.0,  # seconds; sampled requests slower than this are saved
+    'profile_dir': 'profiles',  # where .prof files are written
+    'profile_keep': 50,  # newest profiles kept on disk
+}
+
+
+def metrics_settings():
+    return {**DEFAULTS, **getattr(settings, 'EVENTS_METRICS', {})}
+
+
+class RouteMetrics:
+    """
+    Histograms and counters for one (route, method) pair.
+    """
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.query_time = Histogram(QUERY_TIME_BUCKETS)
+        self.response_bytes = Histogram(RESPONSE_BYTES_BUCKETS)
+        self.statuses = {}  # status code -> Counter
+        self._lock = threading.Lock()
+
+    def count_status(self, status_code):
+        counter = self.statuses.get(status_code)
+        if counter is None:
+            with self._lock:
+                counter = self.statuses.setdefault(status_code, Counter())
+        counter.inc()
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes = {}  # (route, method) -> RouteMetrics
+        self.profiles_written = Counter()
+        self._lock = threading.Lock()
+
+    def route(self, route, method):
+        key = (route, method)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            with self._lock:
+                metrics = self.routes.setdefault(key, RouteMetrics())
+        return metrics
+
+    def render(self):
+        """
+        All metrics in the Prometheus text exposition format (version 0.0.4).
+        """
+        routes = sorted(self.routes.items())
+        lines = [
+            '# HELP events_http_requests_total Requests handled, by route, method and status.',
+            '# TYPE events_http_requests_total counter',
+        ]
+        for (route, method), metrics in routes:
+            for status_code, counter in sorted(metrics.statuses.items()):
+                labels = _labels(route=route, method=method, status=status_code)
+                lines.append(f'events_http_requests_total{{{labels}}} {counter.value}')
+
+        families = (
+            ('events_http_request_duration_seconds', 'latency', 'Time from request to response.'),
+            ('events_http_request_queries', 'queries', 'SQL queries run per request.'),
+            ('events_http_request_query_seconds', 'query_time', 'Time spent in SQL per request.'),
+            ('events_http_response_bytes', 'response_bytes', 'Response body size.'),
+        )
+        for name, attribute, help_text in families:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for (route, method), metrics in routes:
+                lines += _histogram(name, getattr(metrics, attribute).snapshot(), route=route, method=method)
+
+        lines += [
+            '# HELP events_profiles_written_total Slow sampled requests saved as cProfile dumps.',
+            '# TYPE events_profiles_written_total counter',
+            f'events_profiles_written_total {self.profiles_written.value}',
+        ]
+        lines += _task_lines(dispatch.metrics())
+        return '\n'.join(lines) + '\n'
+
+
+def _histogram(name, snapshot, **labels):
+    lines = []
+    for bound, total in snapshot['buckets']:
+        le = '+Inf' if bound == float('inf') else _number(bound)
+        lines.append(f'{name}_bucket{{{_labels(**labels, le=le)}}} {total}')
+    lines.append(f'{name}_sum{{{_labels(**labels)}}} {_number(snapshot["sum"])}')
+    lines.append(f'{name}_count{{{_labels(**labels)}}} {snapshot["count"]}')
+    return lines
+
+
+def _task_lines(task_metrics):
+    """
+    Background task metrics from events.dispatch. Anything the backend can't
+    tell (None) is left out rather than reported as zero.
+    """
+    backend = task_metrics['backend']
+    labels = _labels(backend=backend)
+    lines = []
+    if task_metrics['queue_depth'] is not None:
+        lines += [
+            '# HELP events_task_queue_depth Tasks waiting to run.',
+            '# TYPE events_task_queue_depth gauge',
+            f'events_task_queue_depth{{{labels}}} {task_metrics["queue_depth"]}',
+        ]
+    lines += [
+        '# HELP events_tasks_submitted_total Tasks submitted by this process.',
+        '# TYPE events_tasks_submitted_total counter',
+        f'events_tasks_submitted_total{{{labels}}} {task_metrics["submitted"]}',
+        '# HELP events_tasks_finished_total Finished tasks by outcome (Celery: results kept by the result backend).',
+        '# TYPE events_tasks_finished_total counter',
+    ]
+    for outcome in ('succeeded', 'failed'):
+        lines.append(f'events_tasks_finished_total{{{_labels(backend=backend, outcome=outcome)}}} {task_metrics[outcome]}')
+    if 'rejected' in task_metrics:
+        lines += [
+            '# HELP events_tasks_rejected_total Submissions refused because the queue stayed full.',
+            '# TYPE events_tasks_rejected_total counter',
+            f'events_tasks_rejected_total{{{labels}}} {task_metrics["rejected"]}',
+        ]
+    histograms = (
+        ('events_task_queue_wait_seconds', 'queue_wait_seconds', 'Time from submit to start.'),
+        ('events_task_run_seconds', 'run_time_seconds', 'Time spent running a task.'),
+    )
+    for name, key, help_text in histograms:
+        if task_metrics[key] is not None:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            lines += _histogram(name, task_metrics[key], backend=backend)
+    return lines
+
+
+def _labels(**labels):
+    escaped = (
+        str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        for value in labels.values()
+    )
+    return ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped))
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+def reset_registry():
+    global _registry
+    with _registry_lock:
+        _registry = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting == 'EVENTS_METRICS':
+        reset_registry()
+
+
+class QueryRecorder:
+    """
+    DB execute wrapper counting the queries of one request and their time.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+# cProfile can only profile one request at a time per process (Python 3.12+
+# refuses nested profilers), so sampled requests that find it busy run plain
+_profiler_lock = threading.Lock()
+
+
+class MetricsMiddleware:
+    """
+    Records latency, query count, query time and response size per route.
+    Goes first in MIDDLEWARE so the timing covers the whole stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = metrics_settings()
+        recorder = QueryRecorder()
+        profiler = None
+        if config['profile_sample_rate'] and random.random() < config['profile_sample_rate']:
+            if _profiler_lock.acquire(blocking=False):
+                profiler = cProfile.Profile()
+
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(recorder))
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+        finally:
+            if profiler is not None:
+                _profiler_lock.release()
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        route = match.view_name if match is not None else 'unmatched'
+        metrics = get_registry().route(route, request.method)
+        metrics.latency.observe(elapsed)
+        metrics.queries.observe(recorder.count)
+        metrics.query_time.observe(recorder.seconds)
+        metrics.count_status(response.status_code)
+        if response.streaming:
+            # Body size is only known once the server has sent it all
+            response.streaming_content = self._measure_stream(response.streaming_content, metrics)
+        else:
+            metrics.response_bytes.observe(len(response.content))
+
+        if profiler is not None and elapsed >= config['profile_threshold']:
+            self._save_profile(profiler, route, request.method, config)
+        return response
+
+    @staticmethod
+    def _measure_stream(chunks, metrics):
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+        metrics.response_bytes.observe(size)
+
+    @staticmethod
+    def _save_profile(profiler, route, method, config):
+        directory = config['profile_dir']
+        os.makedirs(directory, exist_ok=True)
+        name = f'{time.time():.6f}-{method}-{route}'.replace('/', '_').replace(':', '_')
+        profiler.dump_stats(os.path.join(directory, f'{name}.prof'))
+        get_registry().profiles_written.inc()
+
+        saved = sorted(entry for entry in os.listdir(directory) if entry.endswith('.prof'))
+        for old in saved[:-config['profile_keep']]:
+            os.remove(os.path.join(directory, old))
+
+
+def metrics_view(request):
+    """
+    GET /metrics — Prometheus text for the scraper (bearer token from
+    EVENTS_METRICS) or a signed-in staff user.
+    """
+    token = metrics_settings()['token']
+    authorization = request.headers.get('Authorization', '')
+    allowed = (token and constant_time_compare(authorization, f'Bearer {token}')) or request.user.is_staff
+    if not allowed:
+        return HttpResponse('Forbidden\n', status=403, content_type='text/plain')
+    return HttpResponse(get_registry().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,146 @@
+import codecs
+import csv
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from . import cache as event_cache
+from .models import Event
+from .scale import _batched
+
+
+# ================================================
+# Bulk invitation changes
+# ================================================
+# Adds or removes invitees of one event in batches, sending only the delta
+# instead of the whole `invited_users` list. Each batch resolves its user ids
+# and usernames with one query and writes the M2M table directly
+# (one bulk_create / one DELETE). Those writes bypass
+# m2m_changed, so the cache bump and the Event.updated_at touch the signal
+# handlers would do happen here, once per call.
+
+BATCH_SIZE = 1000  # Users resolved and written per query
+MAX_UNKNOWN_REPORTED = 100  # Unresolved values echoed back to the client
+
+Invitation = Event.invited_users.through
+
+ID_HEADERS = ('id', 'user_id', 'user')
+USERNAME_HEADERS = ('username',)
+
+
+def resolve_users(values):
+    """
+    Maps a batch of user ids (ints) and usernames (strings) to user ids in
+    one query. Returns `(user_ids, unknown_values)`.
+    """
+    ids = {value for value in values if isinstance(value, int)}
+    usernames = {value for value in values if isinstance(value, str)}
+    found = User.objects.filter(Q(id__in=ids) | Q(username__in=usernames)).values_list('id', 'username')
+
+    user_ids, known_ids, known_usernames = set(), set(), set()
+    for user_id, username in found:
+        if user_id in ids:
+            known_ids.add(user_id)
+            user_ids.add(user_id)
+        if username in usernames:
+            known_usernames.add(username)
+            user_ids.add(user_id)
+    unknown = [value for value in values if value not in known_ids and value not in known_usernames]
+    return user_ids, unknown
+
+
+def decoded_lines(upload, lines):
+    """
+    Decodes the upload as UTF-8 one physical line at a time (a leading BOM
+    is dropped), counting them in `lines[0]` so errors can name the line.
+    """
+    for number, raw in enumerate(upload, start=1):
+        lines[0] = number
+        if number == 1 and raw.startswith(codecs.BOM_UTF8):
+            raw = raw[len(codecs.BOM_UTF8):]
+        try:
+            yield raw.decode('utf-8')
+        except UnicodeDecodeError:
+            raise ValidationError({'file': [f"Line {number}: not valid UTF-8 text."]})
+
+
+def read_csv(upload):
+    """
+    Yields user ids / usernames from the first column of an uploaded CSV,
+    line by line from the (disk-spooled) upload. A header row of `id`,
+    `user_id` or `username` fixes how the column is read; without one,
+    all-digit values are ids and anything else a username. Undecodable or
+    malformed input raises a ValidationError naming the line.
+    """
+    lines = [0]
+    rows = csv.reader(decoded_lines(upload, lines), strict=True)
+    column = None
+    index = 0
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except csv.Error as error:
+            raise ValidationError({'file': [f"Line {lines[0]}: {error}."]})
+        value = row[0].strip() if row else ''
+        index += 1
+        if not value:
+            continue
+        if index == 1 and value.lower() in ID_HEADERS + USERNAME_HEADERS:
+            column = 'username' if value.lower() in USERNAME_HEADERS else 'id'
+            continue
+        if column == 'username':
+            yield value
+        elif column == 'id' or value.isdigit():
+            try:
+                yield int(value)
+            except ValueError:
+                yield value  # Reported back as unknown
+        else:
+            yield value
+
+
+def change_invitations(event_id, values, add=True, batch_size=None):
+    """
+    Adds (or removes) the users in `values` to (from) the event's invitees.
+    All batches commit together. Returns the counts for the response:
+    rows added / removed, values skipped (already in that state or
+    unresolved) and up to MAX_UNKNOWN_REPORTED unresolved values.
+    """
+    changed = skipped = 0
+    unknown = []
+    with transaction.atomic():
+        for batch in _batched(values, batch_size or BATCH_SIZE):
+            batch = list(dict.fromkeys(batch))  # Repeats inside one batch count once
+            user_ids, missing = resolve_users(batch)
+            unknown += missing[:MAX_UNKNOWN_REPORTED - len(unknown)]
+            skipped += len(batch) - len(user_ids)
+
+            existing = Invitation.objects.filter(event_id=event_id, user_id__in=user_ids)
+            if add:
+                while True:
+                    present = set(existing.values_list('user_id', flat=True))
+                    rows = [Invitation(event_id=event_id, user_id=user_id) for user_id in user_ids - present]
+                    try:
+                        with transaction.atomic():
+                            Invitation.objects.bulk_create(rows)
+                        break
+                    except IntegrityError:
+                        # A concurrent request added one of them meanwhile: read the
+                        # batch again, so `changed` only counts rows inserted here
+                        continue
+                changed += len(rows)
+                skipped += len(present)
+            else:
+                removed = existing.delete()[0]
+                changed += removed
+                skipped += len(user_ids) - removed
+
+        if changed:
+            Event.objects.filter(pk=event_id).update(updated_at=timezone.now())
+            event_cache.invalidate()
+    return {'added' if add else 'removed': changed, 'skipped': skipped, 'unknown': unknown}
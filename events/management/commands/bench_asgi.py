@@ -0,0 +1,212 @@
+import asyncio
+import json
+import statistics
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from events.scale import generate_events, generate_invitations, generate_users, isolated_database
+from events.stats import rebuild_event_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the sync DRF feed behind a WSGI worker pool with the async feed "
+        "served by the ASGI handler, under a simulated slow database and slow clients."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--events", type=int, default=5000)
+        parser.add_argument("--invitations", type=int, default=20000)
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+        parser.add_argument("--concurrency", type=int, default=200, help="Requests in flight")
+        parser.add_argument("--workers", type=int, default=8, help="WSGI worker threads")
+        parser.add_argument("--db-latency", type=float, default=20.0, help="Added ms per SQL query")
+        parser.add_argument("--client-delay", type=float, default=200.0, help="ms a client takes to read the response")
+        parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+
+    def handle(self, *args, **options):
+        # Both paths are measured uncached so every request reaches the database
+        with isolated_database(), override_settings(
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+            ALLOWED_HOSTS=["testserver"],
+        ):
+            user_ids = generate_users(options["users"])
+            event_ids = generate_events(user_ids, options["events"])
+            generate_invitations(event_ids, user_ids, options["invitations"])
+            rebuild_event_stats()
+            user = User.objects.get(pk=user_ids[0])
+            token = str(RefreshToken.for_user(user).access_token)
+
+            with self.slow_database(options["db_latency"] / 1000):
+                scenarios = (
+                    ("WSGI  sync  /api/events/", self.run_wsgi, "/api/events/"),
+                    ("ASGI  sync  /api/events/", self.run_asgi, "/api/events/"),
+                    ("ASGI  async /api/async/events/", self.run_asgi, "/api/async/events/"),
+                )
+                results = {}
+                for label, runner, path in scenarios:
+                    results[label] = runner(path, token, options)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{options['requests']} requests, {options['concurrency']} in flight, "
+            f"{options['workers']} WSGI workers, +{options['db_latency']} ms/query, "
+            f"{options['client_delay']} ms client read"
+        )
+        for label, result in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(
+                f"  {result['throughput']:.0f} req/s, p50 {result['p50_ms']:.1f} ms, "
+                f"p95 {result['p95_ms']:.1f} ms, server threads {result['server_threads']}, "
+                f"errors {result['errors']}"
+            )
+
+    def slow_database(self, latency):
+        """
+        Adds `latency` seconds to every query on every connection (existing
+        ones and those opened by worker threads while the benchmark runs).
+        """
+        def delay(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        def install(sender, connection, **kwargs):
+            connection.execute_wrappers.append(delay)
+
+        class SlowDatabase:
+            def __enter__(self):
+                install(None, connection)
+                connection_created.connect(install, dispatch_uid="bench_asgi_slow_db")
+
+            def __exit__(self, *exc_info):
+                connection_created.disconnect(dispatch_uid="bench_asgi_slow_db")
+                connection.execute_wrappers.remove(delay)
+
+        return SlowDatabase()
+
+    # ------------------------------------------------
+    # WSGI: a fixed pool of worker threads
+    # ------------------------------------------------
+    def run_wsgi(self, path, token, options):
+        """
+        Client threads send requests; each one needs one of `--workers` server
+        slots for the whole request, including the time the client takes to
+        read the response (a sync worker is stuck writing to the socket).
+        """
+        slots = threading.Semaphore(options["workers"])
+        remaining = iter(range(options["requests"]))
+        lock = threading.Lock()
+        latencies, errors = [], [0]
+
+        def client_thread():
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                started = time.perf_counter()
+                with slots:
+                    response = client.get(path)
+                    time.sleep(options["client_delay"] / 1000)
+                connection.close()
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+                    errors[0] += response.status_code != 200
+
+        threads = [threading.Thread(target=client_thread) for _ in range(options["concurrency"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.summarize(latencies, time.perf_counter() - started, options["workers"], errors[0])
+
+    # ------------------------------------------------
+    # ASGI: one event loop, Django's ASGI handler
+    # ------------------------------------------------
+    def run_asgi(self, path, token, options):
+        """
+        Drives Django's ASGI application directly with `--concurrency`
+        coroutines. The slow client is an `await` in `send`, so it costs no thread.
+        """
+        application = ASGIHandler()
+        latencies, errors = [], [0]
+        peak = PeakThreads()
+
+        async def request():
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+                "query_string": b"", "root_path": "",
+                "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+                "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+            }
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+            disconnected = asyncio.Event()
+            status = []
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                peak.sample()
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+                elif not message.get("more_body", False):
+                    await asyncio.sleep(options["client_delay"] / 1000)
+
+            started = time.perf_counter()
+            await application(scope, receive, send)
+            disconnected.set()
+            latencies.append(time.perf_counter() - started)
+            errors[0] += status != [200]
+
+        async def client(queue):
+            while queue:
+                queue.pop()
+                await request()
+
+        async def main():
+            queue = list(range(options["requests"]))
+            await asyncio.gather(*(client(queue) for _ in range(options["concurrency"])))
+
+        started = time.perf_counter()
+        asyncio.run(main())
+        return self.summarize(latencies, time.perf_counter() - started, peak.extra, errors[0])
+
+    @staticmethod
+    def summarize(latencies, elapsed, server_threads, errors):
+        latencies = sorted(latencies)
+        return {
+            "throughput": len(latencies) / elapsed,
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+            "server_threads": server_threads,
+            "errors": errors,
+        }
+
+
+class PeakThreads:
+    """
+    Highest number of threads alive on top of those running when it was created.
+    """
+    def __init__(self):
+        self.baseline = threading.active_count()
+        self.extra = 0
+
+    def sample(self):
+        self.extra = max(self.extra, threading.active_count() - self.baseline)
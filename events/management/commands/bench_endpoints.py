@@ -0,0 +1,295 @@
+import json
+import platform
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import timedelta
+from itertools import count
+
+import django
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from events import cache as event_cache
+from events.facets import rebuild_facet_counts
+from events.models import Event, RSVP
+from events.scale import (
+    generate_events, generate_invitations, generate_reviews, generate_rsvps, generate_users, isolated_database,
+)
+from events.stats import rebuild_event_stats
+
+PASSWORD = "bench-password"
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a synthetic dataset and drives every API endpoint through the test client, "
+        "reporting p50/p95 latency, queries per request and peak memory as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--events", type=int, default=50000)
+        parser.add_argument("--invitations", type=int, default=200000)
+        parser.add_argument("--rsvps", type=int, default=200000)
+        parser.add_argument("--reviews", type=int, default=100000)
+        parser.add_argument("--samples", type=int, default=30, help="Timed requests per endpoint")
+        parser.add_argument("--only", help="Run only endpoints whose name contains this text")
+        parser.add_argument("--cached", action="store_true", help="Keep the response cache on (off by default)")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="bench_endpoints.json", help="Where to write the JSON results")
+        parser.add_argument("--compare", help="Earlier results file to compare p50/p95 against")
+        parser.add_argument("--threshold", type=float, default=1.25,
+                            help="Slowdown ratio that counts as a regression with --compare")
+
+    def handle(self, *args, **options):
+        settings = {"ALLOWED_HOSTS": ["testserver"]}
+        if not options["cached"]:
+            # Measure the database path; with the cache on most reads are HITs
+            settings["CACHES"] = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        elif not event_cache.enabled():
+            # No shared cache configured (EVENTS_REDIS_URL): stand one in that runs no queries
+            cache_dir = tempfile.mkdtemp(prefix="bench-endpoints-cache-")
+            settings["CACHES"] = {
+                "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": cache_dir}
+            }
+
+        with isolated_database(), override_settings(**settings):
+            self.stdout.write("Generating dataset...")
+            started = time.perf_counter()
+            dataset = self.generate(options)
+            self.stdout.write(
+                "  " + ", ".join(f"{value} {name}" for name, value in dataset.items())
+                + f" in {time.perf_counter() - started:.1f}s"
+            )
+
+            results = []
+            for endpoint in self.endpoints():
+                if options["only"] and options["only"] not in endpoint["name"]:
+                    continue
+                result = self.measure(endpoint, options["samples"])
+                results.append(result)
+                self.stdout.write(
+                    f"  {result['name']:<28} {result['status']}  p50 {result['p50_ms']:8.2f} ms  "
+                    f"p95 {result['p95_ms']:8.2f} ms  {result['queries']:>3} queries  "
+                    f"{result['peak_kib']:>8.0f} KiB"
+                )
+
+        report = {
+            "meta": {
+                "generated_at": timezone.now().isoformat(),
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "database": connection.vendor,
+                "cached": options["cached"],
+                "samples": options["samples"],
+                "seed": options["seed"],
+                "dataset": dataset,
+            },
+            "endpoints": results,
+        }
+        with open(options["output"], "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        if options["compare"]:
+            self.compare(report, options["compare"], options["threshold"])
+
+    def generate(self, options):
+        seed = options["seed"]
+        user_ids = generate_users(options["users"])
+        event_ids = generate_events(user_ids, options["events"], seed=seed)
+        invitations = generate_invitations(event_ids, user_ids, options["invitations"], seed=seed)
+        rsvps = generate_rsvps(event_ids, user_ids, options["rsvps"], seed=seed)
+        reviews = generate_reviews(event_ids, user_ids, options["reviews"], seed=seed)
+
+        # The signed-in user organizes a few events, is invited to some private
+        # ones and is going to others (so conflict checks have work to do)
+        rng = random.Random(seed)
+        self.viewer = User.objects.create_user(username="bench_viewer", password=PASSWORD)
+        self.staff = User.objects.create_user(username="bench_staff", password=PASSWORD, is_staff=True)
+        sample = rng.sample(event_ids, min(len(event_ids), 400))
+        Event.invited_users.through.objects.bulk_create(
+            [Event.invited_users.through(event_id=event_id, user_id=self.viewer.id) for event_id in sample[:200]],
+            ignore_conflicts=True,
+        )
+        RSVP.objects.bulk_create(
+            [RSVP(event_id=event_id, user=self.viewer, status="Going") for event_id in sample[200:]],
+            ignore_conflicts=True,
+        )
+        rebuild_event_stats(batch_size=5000)
+        rebuild_facet_counts(batch_size=5000)
+
+        self.own_ids = [self.create_event(f"Viewer event {i}").id for i in range(20)]
+        # Conflict checks and RSVP updates need events the viewer can open
+        self.going_ids = list(Event.objects.filter(id__in=sample[200:], is_public=True).values_list("id", flat=True))
+        self.public_ids = list(
+            Event.objects.filter(id__in=rng.sample(event_ids, min(len(event_ids), 1000)), is_public=True)
+            .values_list("id", flat=True)
+        )
+        self.user_ids = user_ids
+        self.rng = rng
+        return {
+            "users": len(user_ids) + 2,
+            "events": len(event_ids) + len(self.own_ids),
+            "invitations": invitations + 200,
+            "rsvps": rsvps + 200,
+            "reviews": reviews,
+        }
+
+    def create_event(self, title):
+        start = timezone.now() + timedelta(days=7)
+        return Event.objects.create(
+            organizer=self.viewer, title=title, description="Benchmark event", location="Berlin",
+            start_time=start, end_time=start + timedelta(hours=2),
+        )
+
+    def endpoints(self):
+        """
+        One entry per route in events/urls.py and the token views. Each
+        `request` callable returns (method, path, body) for the next sample;
+        any setup it does (fresh tokens, events to delete) runs untimed.
+        """
+        rng, viewer, staff = self.rng, self.viewer, self.staff
+        sequence = count()
+
+        def public_event():
+            return rng.choice(self.public_ids)
+
+        def event_body():
+            start = timezone.now() + timedelta(days=rng.randint(1, 60))
+            return {
+                "title": f"Created {next(sequence)}", "description": "Benchmark", "location": "Berlin",
+                "start_time": start.isoformat(), "end_time": (start + timedelta(hours=2)).isoformat(),
+                "is_public": True,
+            }
+
+        def get(path):
+            return lambda: ("GET", path() if callable(path) else path, None)
+
+        return [
+            {"name": "home", "user": None, "request": get("/")},
+            {"name": "token obtain", "user": None, "request": lambda: (
+                "POST", "/api/token/", {"username": viewer.username, "password": PASSWORD})},
+            {"name": "token refresh", "user": None, "request": lambda: (
+                "POST", "/api/token/refresh/", {"refresh": str(RefreshToken.for_user(viewer))})},
+            {"name": "event list (anonymous)", "user": None, "request": get("/api/events/")},
+            {"name": "event list", "user": viewer, "request": get("/api/events/")},
+            {"name": "event list page 50", "user": viewer, "request": get("/api/events/?page=50")},
+            {"name": "event list + facets", "user": viewer,
+             "request": get("/api/events/?facets=true&location=Berlin")},
+            {"name": "event detail", "user": viewer, "request": get(lambda: f"/api/events/{public_event()}/")},
+            {"name": "event search", "user": viewer, "request": get("/api/events/search/?q=synthetic berlin")},
+            {"name": "event calendar", "user": viewer, "request": get("/api/events/calendar/")},
+            {"name": "event conflicts", "user": viewer,
+             "request": get(lambda: f"/api/events/{rng.choice(self.going_ids)}/conflicts/")},
+            {"name": "cache stats", "user": staff, "request": get("/api/events/cache-stats/")},
+            {"name": "event create", "user": viewer, "request": lambda: ("POST", "/api/events/", event_body())},
+            {"name": "event update", "user": viewer, "request": lambda: (
+                "PATCH", f"/api/events/{rng.choice(self.own_ids)}/", {"title": f"Renamed {next(sequence)}"})},
+            {"name": "event delete", "user": viewer, "request": lambda: (
+                "DELETE", f"/api/events/{self.create_event('To delete').id}/", None)},
+            {"name": "rsvp", "user": viewer, "request": lambda: (
+                "POST", f"/api/events/{public_event()}/rsvp/", {"status": "Maybe"})},
+            {"name": "rsvp update", "user": viewer, "request": lambda: (
+                "PATCH", f"/api/events/{rng.choice(self.going_ids)}/rsvp/{viewer.id}/",
+                {"status": rng.choice(["Going", "Maybe"])})},
+            {"name": "rsvp bulk (user)", "user": viewer, "request": lambda: (
+                "POST", "/api/rsvps/bulk/",
+                {"rsvps": [{"event": public_event(), "status": "Going"} for _ in range(50)]})},
+            {"name": "rsvp bulk (event)", "user": viewer, "request": lambda: (
+                "POST", f"/api/events/{rng.choice(self.own_ids)}/rsvp/bulk/",
+                {"rsvps": [{"user": rng.choice(self.user_ids), "status": "Maybe"} for _ in range(50)]})},
+            {"name": "review list", "user": viewer, "request": get(lambda: f"/api/events/{public_event()}/reviews/")},
+            {"name": "review create", "user": viewer, "request": lambda: (
+                "POST", f"/api/events/{public_event()}/reviews/", {"rating": 5, "comment": "Benchmark"})},
+            {"name": "review summary", "user": viewer,
+             "request": get(lambda: f"/api/events/{public_event()}/reviews/summary/")},
+            {"name": "export rsvps (ndjson)", "user": staff, "samples": 3, "request": get("/api/export/rsvps.ndjson")},
+            {"name": "async event list", "user": viewer, "request": get("/api/async/events/")},
+            {"name": "async event detail", "user": viewer,
+             "request": get(lambda: f"/api/async/events/{public_event()}/")},
+            {"name": "async review list", "user": viewer,
+             "request": get(lambda: f"/api/async/events/{public_event()}/reviews/")},
+        ]
+
+    def measure(self, endpoint, samples):
+        client = Client()
+        headers = {}
+        if endpoint["user"] is not None:
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {RefreshToken.for_user(endpoint['user']).access_token}"
+
+        def send():
+            method, path, body = endpoint["request"]()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.generic(
+                    method, path, json.dumps(body) if body is not None else "",
+                    content_type="application/json", **headers,
+                )
+                if response.streaming:
+                    for _ in response.streaming_content:
+                        pass
+                elapsed = (time.perf_counter() - started) * 1000
+            return response.status_code, elapsed, len(queries)
+
+        send()  # Warm-up (imports, prepared statements, user cache)
+        statuses, timings, query_counts = Counter(), [], []
+        for _ in range(endpoint.get("samples", samples)):
+            status_code, elapsed, queries = send()
+            statuses[status_code] += 1
+            timings.append(elapsed)
+            query_counts.append(queries)
+
+        # Peak memory from one extra request, traced separately since
+        # tracemalloc slows everything down
+        tracemalloc.start()
+        send()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        timings.sort()
+        return {
+            "name": endpoint["name"],
+            "status": statuses.most_common(1)[0][0],
+            "statuses": {str(code): total for code, total in sorted(statuses.items())},
+            "samples": len(timings),
+            "p50_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "queries": int(statistics.median(query_counts)),
+            "peak_kib": round(peak / 1024, 1),
+        }
+
+    def compare(self, report, path, threshold):
+        with open(path, encoding="utf-8") as handle:
+            previous = {item["name"]: item for item in json.load(handle)["endpoints"]}
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Compared with {path}"))
+        regressions = []
+        for result in report["endpoints"]:
+            before = previous.get(result["name"])
+            if before is None:
+                continue
+            ratios = {key: result[key] / before[key] for key in ("p50_ms", "p95_ms") if before[key]}
+            slower = [key for key, ratio in ratios.items() if ratio > threshold]
+            more_queries = result["queries"] > before["queries"]
+            line = (
+                f"  {result['name']:<28} p50 x{ratios.get('p50_ms', 0):.2f}  p95 x{ratios.get('p95_ms', 0):.2f}  "
+                f"queries {before['queries']} -> {result['queries']}"
+            )
+            if slower or more_queries:
+                regressions.append(result["name"])
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f"Regressions in: {', '.join(regressions)}")
@@ -0,0 +1,64 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from events.models import Event
+from events.scale import generate_events, generate_users, isolated_database
+from events.search import search_events, search_terms
+
+
+class Command(BaseCommand):
+    help = "Benchmarks event search: FTS5 + bm25 ranking vs LIKE '%q%' scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--events", type=int, default=1000000)
+        parser.add_argument("--samples", type=int, default=20, help="Timed runs per query")
+        parser.add_argument("--page-size", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        with isolated_database():
+            self.stdout.write("Generating dataset...")
+            started = time.perf_counter()
+            user_ids = generate_users(options["users"])
+            generate_events(user_ids, options["events"], seed=options["seed"])
+            self.stdout.write(f"  {options['events']} events indexed in {time.perf_counter() - started:.1f}s")
+
+            rng = random.Random(options["seed"])
+            user = User.objects.get(pk=rng.choice(user_ids))
+            queries = (
+                ("rare (one event)", f"Bench event {options['events'] // 2}"),
+                ("common word", "synthetic"),
+                ("location", "berlin"),
+                ("prefix", "benchmar"),
+            )
+            for label, query in queries:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"{label}: {query!r}"))
+                for viewer_label, viewer in (("anonymous", AnonymousUser()), ("signed in", user)):
+                    visible = Event.objects.visible_to(viewer)
+                    fts = self.time(lambda: list(search_events(visible, query)[:options["page_size"]]), options)
+                    like = self.time(lambda: list(self.like(visible, query)[:options["page_size"]]), options)
+                    self.stdout.write(f"  {viewer_label:<10} FTS5 {fts}   LIKE {like}")
+
+    @staticmethod
+    def like(queryset, query):
+        condition = Q()
+        for term in search_terms(query):
+            condition &= Q(title__icontains=term) | Q(description__icontains=term) | Q(location__icontains=term)
+        return queryset.filter(condition).order_by("-created_at", "-id")
+
+    @staticmethod
+    def time(run, options):
+        samples = []
+        for _ in range(options["samples"]):
+            started = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return f"p50 {statistics.median(samples):8.2f} ms, p95 {p95:8.2f} ms"
@@ -0,0 +1,131 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from events.sqlite import apply_pragmas
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures SQLite reader throughput while writers are active, with the "
+        "default rollback journal and with the production pragma profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50000, help="Events seeded before the run")
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run")
+
+    def handle(self, *args, **options):
+        profiles = (
+            ("default (rollback journal)", {"busy_timeout": 5000}),
+            ("production pragmas (WAL)", settings.SQLITE_PRODUCTION_PRAGMAS),
+        )
+        for label, pragmas in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "bench.sqlite3")
+                self.seed(path, options["rows"])
+                result = self.run(path, pragmas, options)
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(
+                f"  reads/s {result['reads'] / options['seconds']:.0f}, "
+                f"writes/s {result['writes'] / options['seconds']:.0f}, "
+                f"read p95 {result['read_p95_ms']:.2f} ms, "
+                f"lock errors {result['errors']}"
+            )
+
+    def seed(self, path, rows):
+        connection = sqlite3.connect(path)
+        connection.executescript(
+            """
+            CREATE TABLE event (
+                id INTEGER PRIMARY KEY, title TEXT, is_public INTEGER,
+                created_at REAL, going_count INTEGER DEFAULT 0
+            );
+            CREATE INDEX event_public_created ON event (is_public, created_at DESC, id DESC);
+            """
+        )
+        now = time.time()
+        connection.executemany(
+            "INSERT INTO event (title, is_public, created_at) VALUES (?, ?, ?)",
+            ((f"Event {i}", i % 3 != 0, now - i) for i in range(rows)),
+        )
+        connection.commit()
+        connection.close()
+
+    def run(self, path, pragmas, options):
+        stop = threading.Event()
+        lock = threading.Lock()
+        totals = {"reads": 0, "writes": 0, "errors": 0}
+        read_latencies = []
+
+        def connect():
+            connection = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+            apply_pragmas(connection.cursor(), pragmas)
+            return connection
+
+        def reader():
+            connection, reads, errors, latencies = connect(), 0, 0, []
+            rng = random.Random()
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    connection.execute(
+                        "SELECT id, title, going_count FROM event WHERE is_public = 1 "
+                        "AND created_at < ? ORDER BY created_at DESC, id DESC LIMIT 20",
+                        (time.time() - rng.randint(0, options["rows"]),),
+                    ).fetchall()
+                    reads += 1
+                    latencies.append(time.perf_counter() - started)
+                except sqlite3.OperationalError:
+                    errors += 1
+            connection.close()
+            with lock:
+                totals["reads"] += reads
+                totals["errors"] += errors
+                read_latencies.extend(latencies)
+
+        def writer():
+            connection, writes, errors = connect(), 0, 0
+            rng = random.Random()
+            while not stop.is_set():
+                try:
+                    connection.execute("BEGIN IMMEDIATE")
+                    connection.execute(
+                        "UPDATE event SET going_count = going_count + 1 WHERE id = ?",
+                        (rng.randint(1, options["rows"]),),
+                    )
+                    connection.execute(
+                        "INSERT INTO event (title, is_public, created_at) VALUES (?, 1, ?)",
+                        ("New event", time.time()),
+                    )
+                    connection.execute("COMMIT")
+                    writes += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+                    if connection.in_transaction:
+                        connection.execute("ROLLBACK")
+            connection.close()
+            with lock:
+                totals["writes"] += writes
+                totals["errors"] += errors
+
+        threads = [threading.Thread(target=reader) for _ in range(options["readers"])]
+        threads += [threading.Thread(target=writer) for _ in range(options["writers"])]
+        for thread in threads:
+            thread.start()
+        time.sleep(options["seconds"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        read_latencies.sort()
+        p95 = read_latencies[int(len(read_latencies) * 0.95)] * 1000 if read_latencies else 0.0
+        return dict(totals, read_p95_ms=p95)
@@ -0,0 +1,60 @@
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from events.models import RevokedToken
+from events.revocation import RevocationStore
+from events.scale import _batched, isolated_database
+
+
+class Command(BaseCommand):
+    help = "Measures refresh-token revocation checks with a large number of revoked tokens."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tokens", type=int, default=1000000, help="Revoked tokens seeded before the run")
+        parser.add_argument("--samples", type=int, default=20000, help="Checks timed per case")
+
+    def handle(self, *args, **options):
+        with isolated_database():
+            self.stdout.write("Seeding revoked tokens...")
+            expires_at = timezone.now() + timedelta(days=7)
+            revoked = []
+            rows = (RevokedToken(jti=uuid.uuid4().hex, expires_at=expires_at) for _ in range(options["tokens"]))
+            for batch in _batched(rows, 10000):
+                RevokedToken.objects.bulk_create(batch)
+                revoked.append(batch[0].jti)
+
+            # The shipped settings, sized for the seeded tokens
+            config = {**getattr(settings, "EVENTS_TOKEN_REVOCATION", {}), "capacity": options["tokens"]}
+            store = RevocationStore(**config)
+            started = time.perf_counter()
+            store.is_revoked("warm-up")
+            self.stdout.write(
+                f"  filter built in {time.perf_counter() - started:.1f}s, "
+                f"{store.stats()['filter_bytes'] / 1024 / 1024:.1f} MiB for {options['tokens']} tokens"
+            )
+
+            unknown = [uuid.uuid4().hex for _ in range(options["samples"])]
+            known = (revoked * (options["samples"] // len(revoked) + 1))[:options["samples"]]
+            self.report("filter, unrevoked token", store.is_revoked, unknown)
+            self.report("filter, revoked token", store.is_revoked, known)
+            self.report(
+                "table lookup only", lambda jti: RevokedToken.objects.filter(jti=jti).exists(), unknown
+            )
+            self.stdout.write(f"  {store.stats()} with {config}")
+
+    def report(self, label, check, jtis):
+        timings = []
+        for jti in jtis:
+            started = time.perf_counter()
+            check(jti)
+            timings.append((time.perf_counter() - started) * 1e6)
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        self.stdout.write(f"  p50 {statistics.median(timings):.1f} µs, p99 {p99:.1f} µs")
@@ -0,0 +1,75 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from events.models import Event
+from events.scale import generate_events, generate_invitations, generate_users, isolated_database
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the authenticated event feed query: OR + DISTINCT join vs EXISTS visibility."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--events", type=int, default=100000)
+        parser.add_argument("--invitations", type=int, default=1000000)
+        parser.add_argument("--samples", type=int, default=25, help="Number of users to time the feed for")
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        with isolated_database():
+            self.stdout.write("Generating dataset...")
+            started = time.perf_counter()
+            user_ids = generate_users(options["users"])
+            event_ids = generate_events(user_ids, options["events"], seed=options["seed"])
+            invitations = generate_invitations(event_ids, user_ids, options["invitations"], seed=options["seed"])
+            self.stdout.write(
+                f"  {len(user_ids)} users, {len(event_ids)} events, {invitations} invitations "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+
+            rng = random.Random(options["seed"])
+            users = list(User.objects.filter(id__in=rng.sample(user_ids, min(options["samples"], len(user_ids)))))
+            page_size = options["page_size"]
+
+            def legacy(user):
+                return Event.objects.filter(
+                    Q(is_public=True) | Q(organizer=user) | Q(invited_users=user)
+                ).distinct().order_by("-created_at", "-id")
+
+            def visible(user):
+                return Event.objects.visible_to(user).order_by("-created_at", "-id")
+
+            for label, build in (("OR + DISTINCT", legacy), ("EXISTS", visible)):
+                self.report(label, build, users, page_size)
+
+    def report(self, label, build, users, page_size):
+        first_page, counts = [], []
+        for user in users:
+            queryset = build(user)
+            started = time.perf_counter()
+            list(queryset[:page_size])
+            first_page.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            queryset.count()
+            counts.append((time.perf_counter() - started) * 1000)
+
+        plan = build(users[0])[:page_size].explain()
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        self.stdout.write(f"  first page: {self.summary(first_page)}")
+        self.stdout.write(f"  count(*):   {self.summary(counts)}")
+        self.stdout.write("  plan:")
+        for line in plan.splitlines():
+            self.stdout.write(f"    {line}")
+
+    @staticmethod
+    def summary(samples):
+        samples = sorted(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return f"p50 {statistics.median(samples):.2f} ms, p95 {p95:.2f} ms"
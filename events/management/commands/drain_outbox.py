@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Dispatches pending event outbox messages to the task queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--loop", action="store_true", help="Keep draining until interrupted")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds between drains with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            dispatched = drain_outbox(batch_size=options["batch_size"])
+            if dispatched or not options["loop"]:
+                self.stdout.write(f"Dispatched {dispatched} outbox messages.")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from events import bulk
+from events.facets import rebuild_facet_counts
+from events.scale import _batched
+from events.stats import rebuild_event_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads events, RSVPs or reviews from an NDJSON/CSV export (see /api/export/) in batched "
+        "bulk inserts, then rebuilds the counters that signals would have maintained."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File written by /api/export/, e.g. events.ndjson")
+        parser.add_argument("--kind", choices=sorted(bulk.EXPORT_FIELDS), help="Defaults to the file name")
+        parser.add_argument("--format", dest="file_format", choices=sorted(bulk.EXPORT_FORMATS),
+                            help="Defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--skip-rebuild", action="store_true",
+                            help="Leave EventStats and facet counters alone (e.g. more files follow)")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        name, _, extension = path.rsplit("/", 1)[-1].partition(".")
+        kind = options["kind"] or name
+        file_format = options["file_format"] or extension
+        if kind not in bulk.EXPORT_FIELDS:
+            raise CommandError(f"Can't tell what {path} holds; pass --kind.")
+        if file_format not in bulk.EXPORT_FORMATS:
+            raise CommandError(f"Can't tell the format of {path}; pass --format.")
+
+        started = time.perf_counter()
+        imported = 0
+        # Keep the exported created_at / updated_at instead of stamping the import time
+        timestamps = bulk.preserve_timestamps(bulk.EXPORT_MODELS[kind])
+        with open(path, newline="", encoding="utf-8") as lines, timestamps:
+            rows = bulk.read_rows(kind, lines, file_format)
+            for number, batch in enumerate(_batched(rows, options["batch_size"]), start=1):
+                try:
+                    imported += bulk.import_batch(kind, batch)
+                except IntegrityError as exc:
+                    raise CommandError(
+                        f"Batch {number} was rolled back ({exc}); the {imported} rows before it are kept. "
+                        "Import the users, or the events, the rows point at first, then re-run."
+                    ) from exc
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"  {imported} rows")
+        bulk.reset_sequences(kind)
+
+        if not options["skip_rebuild"]:
+            rebuild_event_stats()
+            if kind == "events":
+                rebuild_facet_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {imported} {kind} rows (ids already present are skipped) in {time.perf_counter() - started:.1f}s."
+        ))
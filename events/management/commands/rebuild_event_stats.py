@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from events.stats import rebuild_event_stats
+
+
+class Command(BaseCommand):
+    help = "Recomputes the denormalized per-event counters (EventStats) from scratch to repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_event_stats(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt RSVP counters and review aggregates for {rebuilt} events."))
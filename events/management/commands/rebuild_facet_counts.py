@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from events.facets import rebuild_facet_counts
+
+
+class Command(BaseCommand):
+    help = "Recomputes the public facet counters (FacetCount) from the Event table to repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rows = rebuild_facet_counts(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} facet counters."))
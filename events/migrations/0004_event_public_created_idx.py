@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_public', '-created_at', '-id'], name='event_public_created_idx'),
+        ),
+    ]
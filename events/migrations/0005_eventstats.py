@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+STATUS_FIELDS = {'Going': 'going_count', 'Maybe': 'maybe_count', 'Not Going': 'not_going_count'}
+
+
+def backfill_event_stats(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventStats = apps.get_model('events', 'EventStats')
+    RSVP = apps.get_model('events', 'RSVP')
+
+    stats = {event_id: EventStats(event_id=event_id) for event_id in Event.objects.values_list('id', flat=True)}
+    for row in RSVP.objects.values('event_id', 'status').annotate(total=models.Count('id')):
+        field = STATUS_FIELDS.get(row['status'])
+        if field:
+            setattr(stats[row['event_id']], field, row['total'])
+    EventStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_public_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventStats',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='events.event')),
+                ('going_count', models.PositiveIntegerField(default=0)),
+                ('maybe_count', models.PositiveIntegerField(default=0)),
+                ('not_going_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_event_stats, migrations.RunPython.noop),
+    ]
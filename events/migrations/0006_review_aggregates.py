@@ -0,0 +1,78 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:55
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def backfill_review_aggregates(apps, schema_editor):
+    EventStats = apps.get_model('events', 'EventStats')
+    Review = apps.get_model('events', 'Review')
+
+    stats = {row.event_id: row for row in EventStats.objects.all()}
+    rows = Review.objects.values('event_id', 'rating').annotate(total=models.Count('id')).order_by()
+    for row in rows:
+        entry = stats.get(row['event_id'])
+        if entry is None:
+            entry = stats[row['event_id']] = EventStats.objects.create(event_id=row['event_id'])
+        entry.review_count += row['total']
+        entry.rating_sum += row['rating'] * row['total']
+        if 1 <= row['rating'] <= 5:
+            field = f"rating_{row['rating']}_count"
+            setattr(entry, field, getattr(entry, field) + row['total'])
+    fields = ['review_count', 'rating_sum'] + [f'rating_{rating}_count' for rating in range(1, 6)]
+    EventStats.objects.bulk_update(stats.values(), fields, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_eventstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventstats',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='eventstats',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='eventstats',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='eventstats',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='eventstats',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='eventstats',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='eventstats',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='rating',
+            field=models.PositiveIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)]),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['event', '-created_at', '-id'], name='review_event_created_idx'),
+        ),
+        migrations.RunPython(backfill_review_aggregates, migrations.RunPython.noop),
+    ]
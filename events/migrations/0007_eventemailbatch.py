@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_review_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventEmailBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chunk_index', models.PositiveIntegerField()),
+                ('first_user_id', models.BigIntegerField()),
+                ('last_user_id', models.BigIntegerField()),
+                ('recipient_count', models.PositiveIntegerField(default=0)),
+                ('sent_count', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('retrying', 'Retrying'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='email_batches', to='events.event')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', 'chunk_index'], name='email_batch_event_chunk_idx')],
+            },
+        ),
+    ]
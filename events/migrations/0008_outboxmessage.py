@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_eventemailbatch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventemailbatch',
+            name='kind',
+            field=models.CharField(choices=[('created', 'Created'), ('updated', 'Updated')], default='created', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(choices=[('event.created', 'Event created'), ('event.updated', 'Event updated')], max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('dispatched_at', models.DateTimeField(blank=True, null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_messages', to='events.event')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('dispatched_at__isnull', True)), fields=['id'], name='outbox_pending_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='outboxmessage',
+            constraint=models.UniqueConstraint(condition=models.Q(('dispatched_at__isnull', True)), fields=('event',), name='outbox_one_pending_per_event'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+import events.models
+
+
+# External-content FTS5 index over events_event. Triggers mirror every insert,
+# update and delete (including bulk_create and queryset.update()), and the
+# 'rebuild' command indexes the rows that already exist.
+CREATE_SEARCH_INDEX = [
+    """
+    CREATE VIRTUAL TABLE events_event_fts USING fts5(
+        title, description, location,
+        content='events_event', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    # Title matches count most, then location, then description
+    "INSERT INTO events_event_fts(events_event_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 4.0)')",
+    """
+    CREATE TRIGGER events_event_fts_insert AFTER INSERT ON events_event BEGIN
+        INSERT INTO events_event_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    """
+    CREATE TRIGGER events_event_fts_delete AFTER DELETE ON events_event BEGIN
+        INSERT INTO events_event_fts(events_event_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END
+    """,
+    """
+    CREATE TRIGGER events_event_fts_update AFTER UPDATE OF title, description, location ON events_event BEGIN
+        INSERT INTO events_event_fts(events_event_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO events_event_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    "INSERT INTO events_event_fts(events_event_fts) VALUES ('rebuild')",
+]
+
+DROP_SEARCH_INDEX = [
+    "DROP TRIGGER IF EXISTS events_event_fts_update",
+    "DROP TRIGGER IF EXISTS events_event_fts_delete",
+    "DROP TRIGGER IF EXISTS events_event_fts_insert",
+    "DROP TABLE IF EXISTS events_event_fts",
+]
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        # Other backends fall back to a LIKE search (events/search.py)
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSearchDocument',
+            fields=[
+                ('event', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='events.event')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('location', models.TextField()),
+                ('document', events.models.FullTextMatchField(db_column='events_event_fts')),
+                ('rank', models.FloatField(db_column='rank')),
+            ],
+            options={
+                'db_table': 'events_event_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(run_on_sqlite(CREATE_SEARCH_INDEX), run_on_sqlite(DROP_SEARCH_INDEX)),
+    ]
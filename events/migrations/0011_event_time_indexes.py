@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_event_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_public', 'start_time'], name='event_public_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start_time', 'end_time'], name='event_start_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rsvp',
+            index=models.Index(fields=['user', 'status'], name='rsvp_user_status_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:32
+
+from collections import Counter
+from datetime import timezone
+
+from django.db import migrations, models
+
+
+def backfill_facet_counts(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    FacetCount = apps.get_model('events', 'FacetCount')
+
+    counts = Counter()
+    rows = Event.objects.filter(is_public=True).values_list('location', 'organizer_id', 'start_time')
+    for location, organizer_id, start_time in rows.iterator():
+        counts[('location', location)] += 1
+        counts[('is_public', 'true')] += 1
+        counts[('organizer', str(organizer_id))] += 1
+        counts[('month', start_time.astimezone(timezone.utc).strftime('%Y-%m'))] += 1
+    FacetCount.objects.bulk_create(
+        [FacetCount(facet=facet, value=value, count=count) for (facet, value), count in counts.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_event_time_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(choices=[('location', 'Location'), ('is_public', 'Visibility'), ('organizer', 'Organizer'), ('month', 'Start month')], max_length=20)),
+                ('value', models.CharField(max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['facet', '-count'], name='facet_count_top_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='facetcount',
+            constraint=models.UniqueConstraint(fields=('facet', 'value'), name='facet_count_unique_value'),
+        ),
+        migrations.RunPython(backfill_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+import events.models
+
+
+# External-content FTS5 index over review comments, mirrored by triggers the
+# same way as events_event_fts (0010). Backs the admin's comment search.
+CREATE_SEARCH_INDEX = [
+    """
+    CREATE VIRTUAL TABLE events_review_fts USING fts5(
+        comment,
+        content='events_review', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER events_review_fts_insert AFTER INSERT ON events_review BEGIN
+        INSERT INTO events_review_fts(rowid, comment) VALUES (new.id, new.comment);
+    END
+    """,
+    """
+    CREATE TRIGGER events_review_fts_delete AFTER DELETE ON events_review BEGIN
+        INSERT INTO events_review_fts(events_review_fts, rowid, comment) VALUES ('delete', old.id, old.comment);
+    END
+    """,
+    """
+    CREATE TRIGGER events_review_fts_update AFTER UPDATE OF comment ON events_review BEGIN
+        INSERT INTO events_review_fts(events_review_fts, rowid, comment) VALUES ('delete', old.id, old.comment);
+        INSERT INTO events_review_fts(rowid, comment) VALUES (new.id, new.comment);
+    END
+    """,
+    "INSERT INTO events_review_fts(events_review_fts) VALUES ('rebuild')",
+]
+
+DROP_SEARCH_INDEX = [
+    "DROP TRIGGER IF EXISTS events_review_fts_update",
+    "DROP TRIGGER IF EXISTS events_review_fts_delete",
+    "DROP TRIGGER IF EXISTS events_review_fts_insert",
+    "DROP TABLE IF EXISTS events_review_fts",
+]
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        # Other backends fall back to a LIKE search (events/search.py)
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_eventstats_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewSearchDocument',
+            fields=[
+                ('review', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='events.review')),
+                ('comment', models.TextField()),
+                ('document', events.models.FullTextMatchField(db_column='events_review_fts')),
+                ('rank', models.FloatField(db_column='rank')),
+            ],
+            options={
+                'db_table': 'events_review_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(run_on_sqlite(CREATE_SEARCH_INDEX), run_on_sqlite(DROP_SEARCH_INDEX)),
+    ]
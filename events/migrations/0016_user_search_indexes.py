@@ -0,0 +1,48 @@
+from django.db import migrations
+
+
+# Expression indexes on auth_user backing the admin's case-insensitive
+# prefix searches on username, email, first and last name (events/admin.py).
+# auth_user belongs to django.contrib.auth, so they are created here by name.
+USER_SEARCH_COLUMNS = ('username', 'email', 'first_name', 'last_name')
+
+
+def index_name(column):
+    return f'events_user_{column}_lower_idx'
+
+
+def create_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor not in ('sqlite', 'postgresql', 'mysql'):
+        return
+    for column in USER_SEARCH_COLUMNS:
+        expression = f'LOWER({connection.ops.quote_name(column)})'
+        if connection.vendor == 'mysql':
+            expression = f'({expression})'  # Functional key parts need their own parentheses
+        schema_editor.execute(
+            f'CREATE INDEX {connection.ops.quote_name(index_name(column))} ON auth_user ({expression})'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor not in ('sqlite', 'postgresql', 'mysql'):
+        return
+    for column in USER_SEARCH_COLUMNS:
+        name = connection.ops.quote_name(index_name(column))
+        if connection.vendor == 'mysql':
+            schema_editor.execute(f'DROP INDEX {name} ON auth_user')
+        else:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('events', '0015_reviewsearchdocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
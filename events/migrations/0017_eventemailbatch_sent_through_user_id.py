@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0016_user_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventemailbatch',
+            name='sent_through_user_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0017_eventemailbatch_sent_through_user_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventemailbatch',
+            name='outbox_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='email_batches', to='events.outboxmessage'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventemailbatch',
+            constraint=models.UniqueConstraint(fields=('outbox_message', 'chunk_index'), name='email_batch_one_fan_out_per_message'),
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import IntegrityError, models, transaction
+from django.db.models import Exists, Lookup, OuterRef, Q
 from django.contrib.auth.models import User
 
 # ==============================
@@ -12,11 +14,43 @@ class UserProfile(models.Model):
     bio = models.TextField(blank=True)  # Short description about the user
     location = models.CharField(max_length=100, blank=True)  # User’s location
     profile_picture = models.ImageField(upload_to='profiles/', blank=True)  # Profile picture upload path
+    picture_variants = models.JSONField(default=dict, blank=True)  # Resized copies built in the background (events/images.py)
 
     def __str__(self):
         return self.full_name
 
 
+# ==============================
+#  Event QuerySet
+# ==============================
+class EventQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        Events the given user may see: public ones, their own, and ones they
+        are invited to. The invitation test is a correlated EXISTS probe on the
+        (event_id, user_id) unique index, so no join fan-out and no DISTINCT.
+        """
+        if not user.is_authenticated:
+            return self.filter(is_public=True)
+
+        invited = self.model.invited_users.through.objects.filter(
+            event_id=OuterRef('pk'), user_id=user.pk
+        )
+        return self.filter(Q(is_public=True) | Q(organizer_id=user.pk) | Exists(invited))
+
+    def overlapping(self, start, end):
+        """
+        Events whose [start_time, end_time) interval intersects [start, end).
+        """
+        return self.filter(start_time__lt=end, end_time__gt=start)
+
+    def upcoming(self, now):
+        return self.filter(start_time__gte=now)
+
+    def ongoing(self, now):
+        return self.filter(start_time__lte=now, end_time__gt=now)
+
+
 # ==============================
 #  Event Model
 # ==============================
@@ -37,10 +71,189 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)  # Auto timestamp on creation
     updated_at = models.DateTimeField(auto_now=True)  # Auto timestamp on update
 
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination key for the newest-first event feed
+            models.Index(fields=['-created_at', '-id'], name='event_created_id_idx'),
+            # Anonymous feed: public events only, newest first
+            models.Index(fields=['is_public', '-created_at', '-id'], name='event_public_created_idx'),
+            # Calendar queries on public events (upcoming / date ranges)
+            models.Index(fields=['is_public', 'start_time'], name='event_public_start_idx'),
+            # Overlap tests: start_time bounds the scan, end_time is read from the index
+            models.Index(fields=['start_time', 'end_time'], name='event_start_end_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
+# ==============================
+#  EventSearchDocument Model
+# ==============================
+# Read-only view of the `events_event_fts` SQLite FTS5 index over an event's
+# title, description and location. The index is created by migration 0010 and
+# kept in sync by triggers on events_event; Django never writes to it.
+class FullTextMatchField(models.TextField):
+    """
+    The FTS5 hidden column named after the table: `fts MATCH 'query'` searches
+    every indexed column.
+    """
+
+
+@FullTextMatchField.register_lookup
+class FullTextMatch(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class EventSearchDocument(models.Model):
+    event = models.OneToOneField(
+        Event, primary_key=True, on_delete=models.DO_NOTHING,
+        db_column='rowid', related_name='search_document',
+    )  # FTS rowid is the event id
+    title = models.TextField()
+    description = models.TextField()
+    location = models.TextField()
+    document = FullTextMatchField(db_column='events_event_fts')  # MATCH target (whole row)
+    rank = models.FloatField(db_column='rank')  # bm25 score, lower is better; only set under MATCH
+
+    class Meta:
+        managed = False
+        db_table = 'events_event_fts'
+
+    def __str__(self):
+        return f"Search document for event {self.event_id}"
+
+
+# ==============================
+#  EventStats Model
+# ==============================
+# Denormalized per-event counters, kept in a side table so that event edits
+# (which save the whole Event row) can never overwrite a concurrent increment
+class EventStats(models.Model):
+    event = models.OneToOneField(
+        Event, on_delete=models.CASCADE, primary_key=True, related_name='stats'
+    )  # Event the counters belong to
+    going_count = models.PositiveIntegerField(default=0)  # RSVPs with status "Going"
+    maybe_count = models.PositiveIntegerField(default=0)  # RSVPs with status "Maybe"
+    not_going_count = models.PositiveIntegerField(default=0)  # RSVPs with status "Not Going"
+    review_count = models.PositiveIntegerField(default=0)  # Number of reviews
+    rating_sum = models.PositiveIntegerField(default=0)  # Sum of all review ratings
+    rating_1_count = models.PositiveIntegerField(default=0)  # Rating histogram buckets (1–5)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)  # Last counter change (part of the event ETags)
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @property
+    def rating_histogram(self):
+        return {str(rating): getattr(self, f'rating_{rating}_count') for rating in range(1, 6)}
+
+    def __str__(self):
+        return f"Stats for event {self.event_id}"
+
+
+# ==============================
+#  FacetCount Model
+# ==============================
+# Precomputed facet counters over the public events (the universe every
+# visitor shares), one row per facet value, maintained by events.facets
+class FacetCount(models.Model):
+    FACET_CHOICES = [
+        ('location', 'Location'),
+        ('is_public', 'Visibility'),
+        ('organizer', 'Organizer'),
+        ('month', 'Start month'),
+    ]
+    facet = models.CharField(max_length=20, choices=FACET_CHOICES)  # Facet name
+    value = models.CharField(max_length=100)  # Facet value as text (location, "true", user id, "YYYY-MM")
+    count = models.PositiveIntegerField(default=0)  # Public events with this value
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'], name='facet_count_unique_value'),
+        ]
+        indexes = [
+            # Top values of one facet
+            models.Index(fields=['facet', '-count'], name='facet_count_top_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.facet}={self.value}: {self.count}"
+
+
+# ==============================
+#  RSVP QuerySet
+# ==============================
+class RSVPQuerySet(models.QuerySet):
+    def upsert(self, rsvps, update_status=True):
+        """
+        Inserts the given RSVP instances in one statement, resolving clashes on
+        the (event, user) unique key inside the database (INSERT ... ON CONFLICT)
+        instead of read-then-write, so concurrent clicks can't race into an
+        IntegrityError. With `update_status=False` existing rows are left as is.
+        """
+        if update_status:
+            return self.bulk_create(
+                rsvps, update_conflicts=True,
+                unique_fields=['event', 'user'], update_fields=['status'],
+            )
+        return self.bulk_create(rsvps, ignore_conflicts=True)
+
+    def upsert_locked(self, rsvps, update_status=True):
+        """
+        Upserts like `upsert()` and returns each row's previous status as
+        `{(event_id, user_id): status}` (None for a new RSVP), read under a row
+        lock so two concurrent batches can't both count the same transition.
+        Existing rows are locked and read first, then the missing ones are
+        inserted with their real status; if a concurrent transaction inserted
+        one of them in between, the insert fails on the unique key and is
+        retried with that row locked as an existing one. With
+        `update_status=False` existing rows are only read, never written.
+        Each instance gets its row's id, and its stored status when that is
+        kept. Call inside a transaction.
+
+        select_for_update() is a no-op on SQLite: there the only protection is
+        SQLite's database-wide write lock, which a transaction takes at its
+        first write and holds until it commits.
+        """
+        by_key = {(rsvp.event_id, rsvp.user_id): rsvp for rsvp in rsvps}
+        while True:
+            locked = self.select_for_update().filter(
+                event_id__in={event_id for event_id, _ in by_key}, user_id__in={user_id for _, user_id in by_key},
+            ).values_list('event_id', 'user_id', 'id', 'status')
+            existing = {(event_id, user_id): (pk, status) for event_id, user_id, pk, status in locked
+                        if (event_id, user_id) in by_key}
+            missing = [rsvp for key, rsvp in by_key.items() if key not in existing]
+            try:
+                with transaction.atomic():
+                    self.bulk_create(missing)
+                break
+            except IntegrityError:
+                continue  # Lost a race for one of the missing rows: lock it as an existing one
+
+        for key, (pk, status) in existing.items():
+            by_key[key].pk = pk
+            if not update_status:
+                by_key[key].status = status
+        if update_status and existing:
+            self.bulk_update([by_key[key] for key in existing], ['status'])
+        return {key: existing[key][1] if key in existing else None for key in by_key}
+
+
 # ==============================
 #  RSVP Model
 # ==============================
@@ -59,8 +272,14 @@ class RSVP(models.Model):
         max_length=20, choices=STATUS_CHOICES, default='Maybe'
     )  # RSVP status
 
+    objects = RSVPQuerySet.as_manager()
+
     class Meta:
         unique_together = ('event', 'user')  # Prevent duplicate RSVPs for same user & event
+        indexes = [
+            # A user's RSVPs by status, e.g. everything they're going to (conflict checks)
+            models.Index(fields=['user', 'status'], name='rsvp_user_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.event.title}"
@@ -75,9 +294,137 @@ class Review(models.Model):
         Event, on_delete=models.CASCADE, related_name='reviews'
     )  # Event being reviewed
     user = models.ForeignKey(User, on_delete=models.CASCADE)  # Reviewer (User)
-    rating = models.PositiveIntegerField(default=1)  # Rating value (e.g., 1–5)
+    rating = models.PositiveIntegerField(
+        default=1, validators=[MinValueValidator(1), MaxValueValidator(5)]
+    )  # Rating value (1–5)
     comment = models.TextField(blank=True)  # Optional review comment
     created_at = models.DateTimeField(auto_now_add=True)  # Timestamp on creation
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of an event's reviews, newest first
+            models.Index(fields=['event', '-created_at', '-id'], name='review_event_created_idx'),
+        ]
+
     def __str__(self):
         return f"Review by {self.user.username} for {self.event.title}"
+
+
+class ReviewSearchDocument(models.Model):
+    """
+    FTS5 index over review comments (migration 0015), kept in sync by
+    triggers like the event index. Used by the admin search.
+    """
+    review = models.OneToOneField(
+        Review, primary_key=True, on_delete=models.DO_NOTHING,
+        db_column='rowid', related_name='search_document',
+    )  # FTS rowid is the review id
+    comment = models.TextField()
+    document = FullTextMatchField(db_column='events_review_fts')  # MATCH target (whole row)
+    rank = models.FloatField(db_column='rank')  # bm25 score, lower is better; only set under MATCH
+
+    class Meta:
+        managed = False
+        db_table = 'events_review_fts'
+
+    def __str__(self):
+        return f"Search document for review {self.review_id}"
+
+
+# ==============================
+#  EventEmailBatch Model
+# ==============================
+# One chunk of an event notification fan-out: a contiguous range of invitee
+# ids sent over a single mail connection, with its progress and retry state
+class EventEmailBatch(models.Model):
+    KIND_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('retrying', 'Retrying'),
+        ('failed', 'Failed'),
+    ]
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name='email_batches'
+    )  # Event being announced
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='created')  # What is announced
+    chunk_index = models.PositiveIntegerField()  # Position of this chunk in the fan-out
+    first_user_id = models.BigIntegerField()  # Lowest invitee id in the chunk (inclusive)
+    last_user_id = models.BigIntegerField()  # Highest invitee id in the chunk (inclusive)
+    recipient_count = models.PositiveIntegerField(default=0)  # Invitees in the chunk
+    sent_count = models.PositiveIntegerField(default=0)  # Messages accepted by the mail backend
+    sent_through_user_id = models.BigIntegerField(null=True, blank=True)  # Highest recipient already handed to the backend; retries resume after it
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)  # Delivery attempts so far
+    last_error = models.TextField(blank=True)  # Error of the last failed attempt
+    outbox_message = models.ForeignKey(
+        'OutboxMessage', null=True, blank=True, on_delete=models.SET_NULL, related_name='email_batches'
+    )  # Notification this fan-out was planned for; a redelivered one plans nothing again
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # One fan-out per outbox message, even if its task runs twice
+            models.UniqueConstraint(
+                fields=['outbox_message', 'chunk_index'], name='email_batch_one_fan_out_per_message',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['event', 'chunk_index'], name='email_batch_event_chunk_idx'),
+        ]
+
+    def __str__(self):
+        return f"Email chunk {self.chunk_index} for event {self.event_id} ({self.status})"
+
+
+# ==============================
+#  OutboxMessage Model
+# ==============================
+# Transactional outbox: written in the same transaction as the event change
+# and turned into background tasks after commit by events.outbox.drain_outbox
+class OutboxMessage(models.Model):
+    TOPIC_CHOICES = [
+        ('event.created', 'Event created'),
+        ('event.updated', 'Event updated'),
+    ]
+    topic = models.CharField(max_length=50, choices=TOPIC_CHOICES)  # What happened
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name='outbox_messages'
+    )  # Event the message is about
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)  # Set once handed to the task queue
+
+    class Meta:
+        constraints = [
+            # At most one undispatched message per event: rapid repeated
+            # edits coalesce into whichever notification is still pending
+            models.UniqueConstraint(
+                fields=['event'], condition=Q(dispatched_at__isnull=True),
+                name='outbox_one_pending_per_event',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['id'], condition=Q(dispatched_at__isnull=True), name='outbox_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} for event {self.event_id}"
+
+
+# ==============================
+#  RevokedToken Model
+# ==============================
+# Refresh tokens retired by rotation, loaded into the in-memory revocation
+# filter by events.revocation. Rows are useless after `expires_at` and purged.
+class RevokedToken(models.Model):
+    jti = models.CharField(max_length=255, unique=True)  # Token id claim
+    expires_at = models.DateTimeField(db_index=True)  # The token's own expiry
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.jti
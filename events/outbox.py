@@ -0,0 +1,93 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .dispatch import submit
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+# ================================================
+# Transactional outbox
+# ================================================
+# Request handlers only insert an OutboxMessage row next to the event change.
+# Broker I/O happens later, off the request path, when the outbox is drained.
+
+def enqueue(topic, event_id):
+    """
+    Records that `topic` should be announced for the event. Must run inside
+    the transaction that changed the event. If a message for the event is
+    still pending, nothing is added: the pending one will pick up the latest
+    state when it is sent.
+    """
+    OutboxMessage.objects.bulk_create(
+        [OutboxMessage(topic=topic, event_id=event_id)], ignore_conflicts=True
+    )
+    if getattr(settings, 'EVENTS_OUTBOX_AUTODRAIN', True):
+        transaction.on_commit(schedule_drain)
+
+
+def _dispatch(message):
+    # Imported lazily: tasks import models, and handlers are only needed here
+    from .tasks import send_event_email
+
+    kind = 'created' if message.topic == 'event.created' else 'updated'
+    submit(send_event_email, message.event_id, kind=kind, outbox_message_id=message.id)
+
+
+def drain_outbox(batch_size=None):
+    """
+    Hands pending messages to the task backend in batches, oldest first, and
+    marks them dispatched. Delivery is at-least-once: if publishing fails,
+    the batch stays pending and is retried on the next drain.
+    Returns the number of messages dispatched.
+    """
+    batch_size = batch_size or getattr(settings, 'EVENTS_OUTBOX_BATCH_SIZE', 100)
+    dispatched = 0
+    while True:
+        with transaction.atomic():
+            messages = list(
+                OutboxMessage.objects.select_for_update(skip_locked=True)
+                .filter(dispatched_at__isnull=True)
+                .order_by('id')[:batch_size]
+            )
+            if not messages:
+                return dispatched
+            for message in messages:
+                _dispatch(message)
+            OutboxMessage.objects.filter(id__in=[m.id for m in messages]).update(dispatched_at=timezone.now())
+        dispatched += len(messages)
+
+
+# ------------------------------------------------
+# Debounced in-process drain
+# ------------------------------------------------
+# The first commit starts a short timer; commits that land before it fires
+# ride along, so a burst of edits is drained (and coalesced) in one pass.
+
+_drain_timer = None
+_drain_lock = threading.Lock()
+
+
+def schedule_drain():
+    global _drain_timer
+    with _drain_lock:
+        if _drain_timer is not None and _drain_timer.is_alive():
+            return
+        delay = getattr(settings, 'EVENTS_OUTBOX_COALESCE_SECONDS', 2.0)
+        _drain_timer = threading.Timer(delay, _drain_in_background)
+        _drain_timer.daemon = True
+        _drain_timer.start()
+
+
+def _drain_in_background():
+    try:
+        drain_outbox()
+    except Exception:
+        logger.exception("Draining the event outbox failed; messages stay pending")
+    finally:
+        connection.close()  # This thread's connection would otherwise leak
@@ -0,0 +1,340 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# ================================================
+# Keyset (cursor) Pagination
+# ================================================
+# Seeks straight to the next page using the last row's ordering key instead
+# of OFFSET, and never issues a COUNT(*) unless the client asks for it.
+class KeysetCursorPagination(BasePagination):
+    ordering = ('-created_at', '-id')  # Unique, all-descending ordering key
+    page_size = 5
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'  # `?count=true` opts into a total count
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = queryset.count() if self.wants_count(request) else None
+        self.fetched = list(self.page_queryset(queryset, request))
+        return self.finish_page(self.fetched)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of `paginate_queryset` for the async views: the same
+        single seek query, evaluated with the async ORM.
+        """
+        self.count = await queryset.acount() if self.wants_count(request) else None
+        page = self.page_queryset(queryset, request)
+        self.fetched = [obj async for obj in page.aiterator()]
+        return self.finish_page(self.fetched)
+
+    def page_rows(self, queryset, request, fields):
+        """
+        `(count, rows)`: the `fields` values of the rows this page would hold
+        (plus the look-ahead row) and the count if requested. Lets views build
+        validators without loading or serializing instances.
+        """
+        count = queryset.count() if self.wants_count(request) else None
+        return count, list(self.page_queryset(queryset, request).values_list(*fields))
+
+    def loaded_rows(self, row):
+        """
+        `page_rows` for the page `paginate_queryset` already loaded, with
+        `row(instance)` producing the same tuples as the `values_list` query.
+        """
+        return self.count, [row(instance) for instance in self.fetched]
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def page_queryset(self, queryset, request):
+        """
+        Returns the (unevaluated) query for one page plus one look-ahead row.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+        self.descending = self.ordering[0].startswith('-')
+
+        self.cursor = self.decode_cursor(request, queryset.model)
+        self.reverse = self.cursor is not None and self.cursor[0] == 'p'
+        if self.cursor is not None:
+            queryset = queryset.filter(self.seek_filter(self.cursor[1], before=self.reverse))
+
+        # Walking backwards means reading the opposite ordering, then flipping the page
+        ordering = self.ordering if not self.reverse else self.reversed_ordering()
+        return queryset.order_by(*ordering)[:self.page_size + 1]
+
+    def finish_page(self, results):
+        cursor = self.cursor
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        if self.reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        # An empty page still links back to where the client came from
+        cursor_position = cursor[1] if cursor is not None else None
+        self.first_position = self.get_position(results[0]) if results else cursor_position
+        self.last_position = self.get_position(results[-1]) if results else cursor_position
+        return results
+
+    def reversed_ordering(self):
+        return tuple(field[1:] if field.startswith('-') else '-' + field for field in self.ordering)
+
+    def seek_filter(self, position, before=False):
+        """
+        Builds the row-value comparison `(f1, f2, ...) < (v1, v2, ...)` as a Q
+        object so it can use the composite index on the ordering fields.
+        """
+        # Rows after the cursor in a descending feed are the "smaller" ones
+        lookup = 'lt' if self.descending != before else 'gt'
+        condition = Q()
+        for index, field in enumerate(self.fields):
+            clause = Q(**{f'{field}__{lookup}': position[index]})
+            for prefix, value in zip(self.fields[:index], position[:index]):
+                clause &= Q(**{prefix: value})
+            condition |= clause
+        return condition
+
+    def get_position(self, instance):
+        return [getattr(instance, field) for field in self.fields]
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def decode_cursor(self, request, model):
+        """
+        Returns `(direction, position)` for the cursor in the request, or None.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            direction, raw_position = json.loads(urlsafe_b64decode(padded.encode('ascii')))
+            if direction not in ('n', 'p') or len(raw_position) != len(self.fields):
+                raise ValueError
+            position = [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, raw_position)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return direction, position
+
+    def encode_cursor(self, direction, position):
+        raw_position = [value.isoformat() if hasattr(value, 'isoformat') else value for value in position]
+        payload = json.dumps([direction, raw_position], separators=(',', ':'))
+        encoded = urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor('n', self.last_position)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.encode_cursor('p', self.first_position)
+
+    def get_paginated_data(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return payload
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class EventCursorPagination(KeysetCursorPagination):
+    ordering = ('-created_at', '-id')
+
+
+class EventStartCursorPagination(KeysetCursorPagination):
+    ordering = ('start_time', 'id')  # Calendar order: soonest first
+    page_size = 20
+
+
+class ReviewCursorPagination(KeysetCursorPagination):
+    ordering = ('-created_at', '-id')
+    page_size = 10
+
+
+# ================================================
+# Page-number Pagination for Events
+# ================================================
+# Kept for clients that need `?page=N` and a total `count`
+class EventPageNumberPagination(PageNumberPagination):
+    page_size = 5  # Default number of events per page
+    page_size_query_param = 'page_size'  # Allows client to customize page size using a query parameter
+    max_page_size = 50  # Maximum limit for page size to prevent heavy responses
+
+    def page_rows(self, queryset, request, fields):
+        """
+        Same contract as `KeysetCursorPagination.page_rows`; None for a page
+        that doesn't exist (the regular path then answers 404).
+        """
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        try:
+            page = paginator.page(request.query_params.get(self.page_query_param, 1))
+        except InvalidPage:
+            return None
+        return paginator.count, list(page.object_list.values_list(*fields))
+
+    def loaded_rows(self, row):
+        return self.page.paginator.count, [row(instance) for instance in self.page.object_list]
+
+
+# ================================================
+# Custom Pagination for Events
+# ================================================
+# Uses keyset pagination by default and falls back to page numbers when the
+# client sends `?page=N`
+class EventPagination(BasePagination):
+    cursor_class = EventCursorPagination
+    page_number_class = EventPageNumberPagination
+
+    def __init__(self):
+        self.paginator = self.cursor_class()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.select_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def page_rows(self, queryset, request, fields):
+        return self.select_paginator(request).page_rows(queryset, request, fields)
+
+    def loaded_rows(self, row):
+        return self.paginator.loaded_rows(row)
+
+    def select_paginator(self, request):
+        if self.page_number_class.page_query_param in request.query_params:
+            return self.page_number_class()
+        return self.cursor_class()
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return self.paginator.get_results(data)
+
+
+# ================================================
+# Pagination for ranked search results
+# ================================================
+# Relevance order has no stable seek key, so search pages use OFFSET. There is
+# no COUNT(*): one extra row is read to know whether a next page exists.
+class SearchPagination(BasePagination):
+    page_size = 10
+    page_query_param = 'page'
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    max_page = 20  # Relevance past the top few hundred hits isn't worth deep OFFSETs
+    invalid_page_message = 'Invalid page.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        try:
+            self.page = _positive_int(request.query_params.get(self.page_query_param, 1), strict=True)
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+        if self.page > self.max_page:
+            raise NotFound(self.invalid_page_message)
+
+        offset = (self.page - 1) * self.page_size
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.has_next = len(results) > self.page_size and self.page < self.max_page
+        return results[:self.page_size]
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param], strict=True, cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page + 1)
+
+    def get_previous_link(self):
+        if self.page <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page - 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
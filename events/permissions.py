@@ -1,6 +1,31 @@
 # permissions.py
 from rest_framework import permissions
 
+from .models import Event
+
+
+def is_invited(request, event):
+    """
+    Returns whether the requesting user is invited to `event`.
+    Runs a single indexed EXISTS on the invitation table and memoizes the
+    answer on the request, so repeated permission checks for the same object
+    cost one query at most.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return False
+
+    memo = getattr(request, '_invited_memo', None)
+    if memo is None:
+        memo = request._invited_memo = {}
+    key = (event.pk, user.pk)
+    if key not in memo:
+        memo[key] = Event.invited_users.through.objects.filter(
+            event_id=event.pk, user_id=user.pk
+        ).exists()
+    return memo[key]
+
+
 class IsOrganizerOrInvitedOrReadOnly(permissions.BasePermission):
     """
     Allow safe (GET) access to public events for everyone.
@@ -13,13 +38,13 @@ class IsOrganizerOrInvitedOrReadOnly(permissions.BasePermission):
         if obj.is_public and request.method in permissions.SAFE_METHODS:
             return True
 
-        # Organizer can always modify their event
-        if obj.organizer == request.user:
+        # Organizer can always modify their event (compare ids, no organizer fetch)
+        if request.user.is_authenticated and obj.organizer_id == request.user.pk:
             return True
 
         # Invited users can view private events
         if not obj.is_public and request.method in permissions.SAFE_METHODS:
-            if request.user.is_authenticated and request.user in obj.invited_users.all():
+            if is_invited(request, obj):
                 return True
 
         return False
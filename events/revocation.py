@@ -0,0 +1,223 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import IntegrityError, connection, transaction
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .metrics import Counter
+from .models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# ================================================
+# Refresh token revocation
+# ================================================
+# With ROTATE_REFRESH_TOKENS + BLACKLIST_AFTER_ROTATION every refresh retires
+# the token it was given. Retired jtis are stored in the RevokedToken table
+# (unique index on jti) and mirrored into a per-process Bloom filter:
+#   - a token that was never revoked misses the filter: no lookup at all
+#   - a filter hit is confirmed with one indexed lookup on jti (the filter
+#     can't say "yes" for sure)
+# Rows revoked by other processes are picked up with an incremental
+# `id > last seen` read at most every `sync_interval` seconds, so another
+# process's revocation can go unnoticed here for that long. A rotated token
+# replayed in that window still fails: retiring it again hits the unique jti.
+# Bloom filters can't forget, so every `rebuild_interval` seconds a
+# background thread loads the unexpired jtis into a new filter and swaps it
+# in; checks keep using the old one meanwhile. Only the very first build
+# runs in the request. Expired rows are deleted by the
+# `purge_revoked_tokens` Celery beat task, not here.
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter sized for `capacity` keys at `error_rate` false
+    positives. Positions come from one blake2b digest (double hashing).
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(64, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + index * second) % self.size for index in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationStore:
+    def __init__(self, capacity=1000000, error_rate=0.001, sync_interval=1.0, rebuild_interval=3600.0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.checks = Counter()
+        self.filter_hits = Counter()
+        self.false_positives = Counter()
+        self._filter = None
+        self._last_id = 0
+        self._built_at = float('-inf')
+        self._synced_at = float('-inf')
+        self._rebuilding = False
+        self._lock = threading.Lock()
+
+    def is_revoked(self, jti):
+        self.checks.inc()
+        with self._lock:
+            self._refresh()
+            maybe_revoked = jti in self._filter
+        if not maybe_revoked:
+            return False
+
+        self.filter_hits.inc()
+        revoked = RevokedToken.objects.filter(jti=jti, expires_at__gt=timezone.now()).exists()
+        if not revoked:
+            self.false_positives.inc()
+        return revoked
+
+    def revoke(self, jti, expires_at):
+        """
+        Records `jti` as revoked. Returns False when it already was, which
+        means the same refresh token was presented twice.
+        """
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            return False
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+        return True
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._filter is None:
+            self._install(*self._load())
+        elif now - self._synced_at >= self.sync_interval:
+            self._sync()
+        if now - self._built_at >= self.rebuild_interval and not self._rebuilding:
+            self._rebuilding = True
+            worker = threading.Thread(target=self._rebuild_in_background, name='revocation-rebuild', daemon=True)
+            worker.start()
+
+    def _load(self):
+        """
+        Loads the unexpired jtis into a new filter, sized with headroom for
+        what is already there. Reads only; runs without the lock.
+        """
+        live = RevokedToken.objects.filter(expires_at__gt=timezone.now())
+        bloom = BloomFilter(max(self.capacity, live.count() * 2), self.error_rate)
+        last_id = 0
+        for row_id, jti in live.order_by('id').values_list('id', 'jti').iterator(chunk_size=10000):
+            bloom.add(jti)
+            last_id = row_id
+        return bloom, last_id
+
+    def _install(self, bloom, last_id):
+        self._filter, self._last_id = bloom, last_id
+        self._built_at = time.monotonic()
+        self._sync()  # Rows revoked while the filter was loading
+
+    def _rebuild_in_background(self):
+        try:
+            loaded = self._load()
+            with self._lock:
+                self._install(*loaded)
+        except Exception:
+            logger.exception("Rebuilding the revocation filter failed; the current one stays in use")
+            with self._lock:
+                self._built_at = time.monotonic()  # Retried after the next interval
+        finally:
+            self._rebuilding = False
+            connection.close()  # This thread's connection would otherwise leak
+
+    def _sync(self):
+        rows = RevokedToken.objects.filter(id__gt=self._last_id).order_by('id').values_list('id', 'jti')
+        for row_id, jti in rows.iterator(chunk_size=10000):
+            self._filter.add(jti)
+            self._last_id = row_id
+        self._synced_at = time.monotonic()
+        if self._filter.count > self._filter.capacity:
+            self._built_at = float('-inf')  # Over capacity: rebuild bigger in the background
+
+    def stats(self):
+        bloom = self._filter
+        return {
+            'checks': self.checks.value,
+            'filter_hits': self.filter_hits.value,
+            'false_positives': self.false_positives.value,
+            'filter_entries': bloom.count if bloom else 0,
+            'filter_bytes': len(bloom.bits) if bloom else 0,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RevocationStore(**getattr(settings, 'EVENTS_TOKEN_REVOCATION', {}))
+    return _store
+
+
+def purge_expired():
+    """Deletes revoked tokens that have expired anyway. Returns the count."""
+    return RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()[0]
+
+
+def reset_store():
+    global _store
+    with _store_lock:
+        _store = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting == 'EVENTS_TOKEN_REVOCATION':
+        reset_store()
+
+
+class RevocableRefreshToken(RefreshToken):
+    """
+    Refresh token checked against the revocation store on every use and
+    revoked there when the refresh endpoint rotates it.
+    """
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        if get_store().is_revoked(self.payload[jwt_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        expires_at = datetime_from_epoch(self.payload['exp'])
+        if not get_store().revoke(self.payload[jwt_settings.JTI_CLAIM], expires_at):
+            # Lost a race with a concurrent refresh of the same token
+            raise TokenError(_('Token is blacklisted'))
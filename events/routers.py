@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db import connections
+
+
+# ================================================
+# Read replica router
+# ================================================
+# Sends reads of the event feed and review models to EVENTS_DB_READ_ALIAS
+# (a read-only connection, see events/sqlite.py) and every write to the primary.
+class ReadReplicaRouter:
+    primary_alias = 'default'
+    replica_models = {'event', 'eventstats', 'review'}
+
+    def read_alias(self):
+        alias = getattr(settings, 'EVENTS_DB_READ_ALIAS', None)
+        if alias and alias in connections.databases:
+            return alias
+        return None
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != 'events' or model._meta.model_name not in self.replica_models:
+            return None
+        replica = self.read_alias()
+        if replica is None:
+            return None
+
+        # Related lookups stay on whichever database the instance came from
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+
+        # Inside a transaction on the primary, read your own uncommitted writes
+        if connections[self.primary_alias].in_atomic_block:
+            return self.primary_alias
+        return replica
+
+    def db_for_write(self, model, **hints):
+        return self.primary_alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary and replica hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == self.read_alias():
+            return False
+        return None
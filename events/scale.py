@@ -0,0 +1,157 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Event, RSVP, Review
+
+
+# ================================================
+# Synthetic datasets for benchmarks
+# ================================================
+# Builds large, reproducible datasets with bulk inserts so benchmarks can run
+# at production-like volumes without going through the API.
+
+@contextmanager
+def isolated_database(verbosity=0):
+    """
+    Runs the block against a freshly migrated throwaway database (the same
+    one `manage.py test` would create), so benchmarks never touch real data.
+    """
+    old_name = connection.creation.create_test_db(
+        verbosity=verbosity, autoclobber=True, serialize=False
+    )
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+
+
+def _batched(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_users(count, batch_size=5000):
+    """
+    Creates `count` users with an unusable password (hashing is far too slow
+    at this scale) and returns their ids.
+    """
+    rows = (
+        User(username=f"bench_user_{i}", email=f"bench_user_{i}@example.com", password="!")
+        for i in range(count)
+    )
+    for batch in _batched(rows, batch_size):
+        User.objects.bulk_create(batch)
+    return list(User.objects.filter(username__startswith="bench_user_").values_list("id", flat=True))
+
+
+def generate_events(user_ids, count, private_ratio=0.3, seed=0, batch_size=5000):
+    """
+    Creates `count` events spread over the past and next year, with roughly
+    `private_ratio` of them private. Returns the event ids.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    locations = ["Online", "Ahmedabad", "Mumbai", "Berlin", "London", "New York", "Tokyo", "Remote"]
+
+    def rows():
+        for i in range(count):
+            start = now + timedelta(minutes=rng.randint(-525600, 525600))
+            yield Event(
+                title=f"Bench event {i}",
+                description=f"Synthetic event number {i} used for benchmarking.",
+                organizer_id=rng.choice(user_ids),
+                location=rng.choice(locations),
+                start_time=start,
+                end_time=start + timedelta(minutes=rng.randint(30, 600)),
+                is_public=rng.random() >= private_ratio,
+            )
+
+    with transaction.atomic():
+        for batch in _batched(rows(), batch_size):
+            Event.objects.bulk_create(batch)
+        # auto_now_add stamps every row with "now"; spread creation times out
+        # so the feed ordering looks like real traffic
+        Event.objects.update(created_at=F("start_time") - timedelta(days=30))
+    return list(Event.objects.values_list("id", flat=True))
+
+
+def generate_invitations(event_ids, user_ids, count, seed=0, batch_size=10000):
+    """
+    Creates about `count` unique (event, user) invitations spread evenly
+    across the given events.
+    """
+    rng = random.Random(seed)
+    Invitation = Event.invited_users.through
+    per_event, remainder = divmod(count, len(event_ids))
+
+    def rows():
+        for index, event_id in enumerate(event_ids):
+            size = min(per_event + (1 if index < remainder else 0), len(user_ids))
+            for user_id in rng.sample(user_ids, size):
+                yield Invitation(event_id=event_id, user_id=user_id)
+
+    created = 0
+    with transaction.atomic():
+        for batch in _batched(rows(), batch_size):
+            Invitation.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+    return created
+
+
+def generate_rsvps(event_ids, user_ids, count, seed=0, batch_size=10000):
+    """
+    Creates about `count` unique (event, user) RSVPs with a random status,
+    spread evenly across the given events. Counters aren't touched; run
+    `rebuild_event_stats` afterwards.
+    """
+    rng = random.Random(seed)
+    statuses = [status for status, _ in RSVP.STATUS_CHOICES]
+    per_event, remainder = divmod(count, len(event_ids))
+
+    def rows():
+        for index, event_id in enumerate(event_ids):
+            size = min(per_event + (1 if index < remainder else 0), len(user_ids))
+            for user_id in rng.sample(user_ids, size):
+                yield RSVP(event_id=event_id, user_id=user_id, status=rng.choice(statuses))
+
+    created = 0
+    with transaction.atomic():
+        for batch in _batched(rows(), batch_size):
+            RSVP.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+    return created
+
+
+def generate_reviews(event_ids, user_ids, count, seed=0, batch_size=10000):
+    """
+    Creates `count` reviews on random events with ratings skewed towards 4-5.
+    Counters aren't touched; run `rebuild_event_stats` afterwards.
+    """
+    rng = random.Random(seed)
+    ratings = [1, 2, 3, 4, 4, 5, 5, 5]
+
+    def rows():
+        for i in range(count):
+            yield Review(
+                event_id=rng.choice(event_ids),
+                user_id=rng.choice(user_ids),
+                rating=rng.choice(ratings),
+                comment=f"Synthetic review number {i}.",
+            )
+
+    with transaction.atomic():
+        for batch in _batched(rows(), batch_size):
+            Review.objects.bulk_create(batch)
+    return count
@@ -0,0 +1,76 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+
+# ================================================
+# Event full-text search
+# ================================================
+# On SQLite, queries go through the FTS5 index `events_event_fts` (see
+# migration 0010) joined back to events_event, ranked by weighted bm25.
+# Other backends fall back to an unranked LIKE search, same filters.
+# Review comments have their own index (`events_review_fts`, migration 0015).
+
+MAX_TERMS = 8
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_terms(query):
+    return _TERM_RE.findall(query)[:MAX_TERMS]
+
+
+def match_expression(terms):
+    """
+    Builds an FTS5 query from plain words: every term must match, each one
+    quoted so user input can't use FTS operators, and the last one as a
+    prefix so results show up while the user is still typing.
+    """
+    quoted = ['"{}"'.format(term.replace('"', '""')) for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def uses_fts(queryset):
+    return connections[queryset.db].vendor == 'sqlite'
+
+
+def search_events(queryset, query):
+    """
+    Narrows an Event queryset (already restricted by `visible_to`) to events
+    matching `query`, best matches first. Returns an empty queryset when the
+    query has no searchable words.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    if uses_fts(queryset):
+        return queryset.filter(
+            search_document__document__match=match_expression(terms)
+        ).order_by('search_document__rank', '-created_at', '-id')
+
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(title__icontains=term) | Q(description__icontains=term) | Q(location__icontains=term)
+        )
+    return queryset.filter(condition).order_by('-created_at', '-id')
+
+
+def search_reviews(queryset, query):
+    """
+    Narrows a Review queryset to reviews whose comment matches `query`
+    (every word, the last one as a prefix). Unordered.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    if uses_fts(queryset):
+        return queryset.filter(search_document__document__match=match_expression(terms))
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(comment__icontains=term)
+    return queryset.filter(condition)
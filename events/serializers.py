@@ -1,21 +1,105 @@
+from datetime import timedelta
+
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 
 from .models import Event, RSVP, Review, UserProfile
+from .revocation import RevocableRefreshToken
 
 class UserProfileSerializer(serializers.ModelSerializer):
+    # {"thumb": {"webp": url, "jpeg": url}, ...}; empty until the background
+    # task has resized the latest upload, so clients fall back to the original
+    picture_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = UserProfile
         fields = '__all__'
 
+    def get_picture_variants(self, profile):
+        picture = profile.profile_picture
+        variants = profile.picture_variants or {}
+        if not picture or variants.get('source') != picture.name:
+            return {}
+        request = self.context.get('request')
+        urls = {}
+        for variant, names in variants.items():
+            if variant == 'source':
+                continue
+            urls[variant] = {}
+            for extension, name in names.items():
+                url = picture.storage.url(name)
+                urls[variant][extension] = request.build_absolute_uri(url) if request else url
+        return urls
+
 
 class EventSerializer(serializers.ModelSerializer):
     organizer = serializers.ReadOnlyField(source='organizer.username')
+    going_count = serializers.ReadOnlyField(source='stats.going_count')
+    maybe_count = serializers.ReadOnlyField(source='stats.maybe_count')
+    not_going_count = serializers.ReadOnlyField(source='stats.not_going_count')
 
     class Meta:
         model = Event
         fields = '__all__'
 
 
+class EventListSerializer(serializers.ModelSerializer):
+    """
+    Compact representation for list pages: no invitee list and no long
+    description, so a page is one query regardless of its size.
+    """
+    organizer = serializers.ReadOnlyField(source='organizer.username')
+    going_count = serializers.ReadOnlyField(source='stats.going_count')
+    maybe_count = serializers.ReadOnlyField(source='stats.maybe_count')
+    not_going_count = serializers.ReadOnlyField(source='stats.not_going_count')
+
+    class Meta:
+        model = Event
+        fields = [
+            'id', 'organizer', 'title', 'location', 'start_time', 'end_time',
+            'is_public', 'created_at', 'updated_at',
+            'going_count', 'maybe_count', 'not_going_count',
+        ]
+        read_only_fields = fields
+
+
+class EventCalendarQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of `/api/events/calendar/`:
+    - `when=upcoming` (default): events starting from now on
+    - `when=ongoing`: events in progress right now
+    - `when=overlap&start=...&end=...`: events intersecting that window
+    """
+    MAX_WINDOW = timedelta(days=366)
+
+    when = serializers.ChoiceField(choices=['upcoming', 'ongoing', 'overlap'], default='upcoming')
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if attrs['when'] == 'overlap':
+            start, end = attrs.get('start'), attrs.get('end')
+            if start is None or end is None:
+                raise serializers.ValidationError('`start` and `end` are required for overlap queries.')
+            if end <= start:
+                raise serializers.ValidationError('`end` must be after `start`.')
+            if end - start > self.MAX_WINDOW:
+                raise serializers.ValidationError('The window can span at most 366 days.')
+        return attrs
+
+
+class EventFacetFilterSerializer(serializers.Serializer):
+    """
+    Facet filters of `/api/events/` (`location`, `is_public`, `organizer`,
+    `month=YYYY-MM`) and the `facets=true` flag adding counts per value.
+    """
+    location = serializers.CharField(max_length=100, required=False)
+    is_public = serializers.BooleanField(required=False)
+    organizer = serializers.IntegerField(min_value=1, required=False)
+    month = serializers.RegexField(r'^\d{4}-(0[1-9]|1[0-2])$', required=False)
+    facets = serializers.BooleanField(required=False, default=False)
+
+
 class RSVPSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username')
 
@@ -25,6 +109,56 @@ class RSVPSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'event']
 
 
+class RSVPBulkItemSerializer(serializers.Serializer):
+    event = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=RSVP.STATUS_CHOICES)
+
+
+class EventRSVPBulkItemSerializer(serializers.Serializer):
+    user = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=RSVP.STATUS_CHOICES)
+
+
+class RSVPBulkSerializer(serializers.Serializer):
+    MAX_BATCH_SIZE = 1000
+
+    rsvps = RSVPBulkItemSerializer(many=True, allow_empty=False)
+
+    def validate_rsvps(self, value):
+        if len(value) > self.MAX_BATCH_SIZE:
+            raise serializers.ValidationError(f"At most {self.MAX_BATCH_SIZE} RSVPs per request.")
+        return value
+
+
+class EventRSVPBulkSerializer(RSVPBulkSerializer):
+    rsvps = EventRSVPBulkItemSerializer(many=True, allow_empty=False)
+
+
+class InvitationBulkSerializer(serializers.Serializer):
+    """
+    One batch of invitees to add or remove: user ids and/or usernames in
+    JSON, or a CSV upload (`file`, one id or username per line) for lists
+    past MAX_BATCH_SIZE.
+    """
+    MAX_BATCH_SIZE = 1000
+
+    users = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    usernames = serializers.ListField(child=serializers.CharField(max_length=150), required=False)
+    file = serializers.FileField(required=False)
+
+    def validate(self, attrs):
+        values = attrs.get('users', []) + attrs.get('usernames', [])
+        if 'file' in attrs and values:
+            raise serializers.ValidationError("Send either a CSV file or users/usernames, not both.")
+        if 'file' not in attrs and not values:
+            raise serializers.ValidationError("Send users, usernames or a CSV file.")
+        if len(values) > self.MAX_BATCH_SIZE:
+            raise serializers.ValidationError(
+                f"At most {self.MAX_BATCH_SIZE} users per request; upload a CSV file for more."
+            )
+        return attrs
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username')
 
@@ -34,3 +168,11 @@ class ReviewSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'event': {'required': False}  
         }
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    `/api/token/refresh/`: rejects revoked refresh tokens and revokes each
+    one as it is rotated (see events/revocation.py).
+    """
+    token_class = RevocableRefreshToken
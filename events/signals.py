@@ -0,0 +1,199 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import cache as event_cache
+from .authentication import mark_user_changed
+from .dispatch import submit
+from .facets import FACET_FIELDS, apply_facet_changes, event_row
+from .images import delete_variants
+from .models import Event, EventStats, RSVP, Review, UserProfile
+from .stats import apply_review_changes, record_rsvp_change
+from .tasks import process_profile_picture
+
+
+# ================================================
+# Response cache invalidation
+# ================================================
+# Any change to an event or its invitations can alter list and detail
+# payloads (and who may see them), so each one bumps the cache version. So
+# does renaming a user, whose username appears as `organizer`.
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_cache(sender, **kwargs):
+    event_cache.invalidate()
+
+
+@receiver(m2m_changed, sender=Event.invited_users.through)
+def invalidate_event_cache_on_invites(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        event_cache.invalidate()
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Event payloads embed the organizer's username; saves that can't touch
+    # it (last_login on every login) skip the lookup
+    instance._previous_username = None
+    if instance.pk and not raw and (update_fields is None or 'username' in update_fields):
+        instance._previous_username = User.objects.filter(pk=instance.pk).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def invalidate_event_cache_on_rename(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_previous_username', None)
+    if previous is not None and previous != instance.username:
+        event_cache.invalidate()
+
+
+@receiver(m2m_changed, sender=Event.invited_users.through)
+def touch_events_on_invites(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Invitee lists are part of the event, so changing them moves
+    Event.updated_at (and with it the event's ETag) like any other edit.
+    """
+    if not reverse:
+        event_ids = [instance.pk]
+    elif action == 'pre_clear':
+        # user.invited_events.clear() doesn't say which events it touched
+        instance._cleared_event_ids = list(instance.invited_events.values_list('id', flat=True))
+        return
+    elif action == 'post_clear':
+        event_ids = getattr(instance, '_cleared_event_ids', [])
+    else:
+        event_ids = pk_set or []
+    if action in ('post_add', 'post_remove', 'post_clear') and event_ids:
+        Event.objects.filter(pk__in=event_ids).update(updated_at=timezone.now())
+
+
+# ================================================
+# Denormalized counters
+# ================================================
+
+@receiver(post_save, sender=Event)
+def create_event_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        EventStats.objects.get_or_create(event=instance)
+
+
+def started_at(origin, *models):
+    """
+    Whether a delete began at an instance or queryset of one of `models`
+    (Django passes that as the signal's `origin`).
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+@receiver(post_delete, sender=RSVP)
+def release_rsvp_counter(sender, instance, origin=None, **kwargs):
+    # Deletes come from the admin and cascades, not from a view, so they are
+    # tracked here; creates and status changes are applied by the RSVP views.
+    # An event's cascade takes the stats row along, so there is nothing to
+    # adjust (a user has one RSVP per event, so their cascade is already one
+    # UPDATE per event)
+    if started_at(origin, Event):
+        return
+    record_rsvp_change(instance.event_id, instance.status, None)
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_review(sender, instance, raw=False, **kwargs):
+    # Updates need the stored rating to move the aggregates, creates don't
+    instance._previous = None
+    if instance.pk and not raw:
+        instance._previous = Review.objects.filter(pk=instance.pk).values_list('event_id', 'rating').first()
+
+
+@receiver(post_save, sender=Review)
+def update_review_aggregates(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous', None)
+    if previous is None:
+        apply_review_changes([(instance.event_id, None, instance.rating)])
+    elif previous[0] == instance.event_id:
+        apply_review_changes([(instance.event_id, previous[1], instance.rating)])
+    else:
+        apply_review_changes([(previous[0], previous[1], None), (instance.event_id, None, instance.rating)])
+
+
+@receiver(pre_delete, sender=User)
+def release_user_reviews(sender, instance, **kwargs):
+    # The user's reviews go in this delete's cascade, possibly several per
+    # event: one aggregate UPDATE per event here instead of one per review
+    reviews = Review.objects.filter(user=instance).values_list('event_id', 'rating')
+    apply_review_changes((event_id, rating, None) for event_id, rating in reviews)
+
+
+@receiver(post_delete, sender=Review)
+def release_review_aggregates(sender, instance, origin=None, **kwargs):
+    # An event's cascade takes the stats row along, and a user's cascade was
+    # applied up front by release_user_reviews
+    if started_at(origin, Event, User):
+        return
+    apply_review_changes([(instance.event_id, instance.rating, None)])
+
+
+# ================================================
+# Authenticated user cache
+# ================================================
+# Deactivation, password changes and deletes must reach CachedJWTAuthentication;
+# the mark is repeated after commit so a concurrent request can't re-cache
+# the old row in between.
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    mark_user_changed(user_id)
+    transaction.on_commit(lambda: mark_user_changed(user_id))
+
+
+# ================================================
+# Facet counters
+# ================================================
+# Public events feed the shared FacetCount rows (see events/facets.py);
+# bulk inserts bypass these, `rebuild_facet_counts` covers them.
+
+@receiver(pre_save, sender=Event)
+def remember_previous_facets(sender, instance, raw=False, **kwargs):
+    instance._previous_facets = None
+    if instance.pk and not raw:
+        instance._previous_facets = Event.objects.filter(pk=instance.pk).values_list(*FACET_FIELDS).first()
+
+
+@receiver(post_save, sender=Event)
+def update_facet_counts(sender, instance, raw=False, **kwargs):
+    if not raw:
+        apply_facet_changes([(getattr(instance, '_previous_facets', None), event_row(instance))])
+
+
+@receiver(post_delete, sender=Event)
+def release_facet_counts(sender, instance, **kwargs):
+    apply_facet_changes([(event_row(instance), None)])
+
+
+# ================================================
+# Profile picture variants
+# ================================================
+# Decoding and resizing happen in a background task after the commit, so the
+# upload request returns as soon as the original is stored.
+
+@receiver(post_save, sender=UserProfile)
+def queue_profile_picture_variants(sender, instance, raw=False, **kwargs):
+    picture = instance.profile_picture
+    if raw or not picture or (instance.picture_variants or {}).get('source') == picture.name:
+        return
+    transaction.on_commit(lambda: submit(process_profile_picture, instance.pk))
+
+
+@receiver(post_delete, sender=UserProfile)
+def delete_profile_picture_variants(sender, instance, **kwargs):
+    if instance.picture_variants and instance.profile_picture:
+        storage = instance.profile_picture.storage
+        transaction.on_commit(lambda: delete_variants(storage, instance.picture_variants))
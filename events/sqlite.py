@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+# ================================================
+# SQLite connection tuning
+# ================================================
+# Applies SQLITE_PRAGMAS to every new SQLite connection. With the production
+# profile this switches the file to WAL (readers no longer block on writers),
+# relaxes fsync to NORMAL, waits on locks instead of failing, and enlarges the
+# page cache / mmap window. Aliases listed in SQLITE_READ_ONLY_ALIASES are also
+# opened with query_only so a misrouted write fails loudly.
+
+def pragma_statements(pragmas, read_only=False):
+    statements = [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+    if read_only:
+        statements.append('PRAGMA query_only = ON')
+    return statements
+
+
+def apply_pragmas(cursor, pragmas, read_only=False):
+    for statement in pragma_statements(pragmas, read_only=read_only):
+        cursor.execute(statement)
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    read_only = connection.alias in getattr(settings, 'SQLITE_READ_ONLY_ALIASES', ())
+    if not pragmas and not read_only:
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, pragmas, read_only=read_only)
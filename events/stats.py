@@ -0,0 +1,151 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest, Now
+
+from . import cache as event_cache
+from .models import Event, EventStats, RSVP, Review
+
+
+# ================================================
+# Denormalized per-event counters
+# ================================================
+# Counters live in EventStats and are adjusted with F() expressions, so each
+# change is a single atomic UPDATE and never a read-modify-write in Python.
+
+RSVP_STATUS_FIELDS = {
+    'Going': 'going_count',
+    'Maybe': 'maybe_count',
+    'Not Going': 'not_going_count',
+}
+
+RATING_FIELDS = {rating: f'rating_{rating}_count' for rating in range(1, 6)}
+
+REVIEW_FIELDS = ['review_count', 'rating_sum', *RATING_FIELDS.values()]
+
+
+def _apply(event_id, field_deltas):
+    """
+    Adds each delta to its counter for one event. Decrements are clamped at
+    zero so drift can't trip the positive-integer check constraint.
+    """
+    updates = {}
+    for field, delta in field_deltas.items():
+        if delta > 0:
+            updates[field] = F(field) + delta
+        elif delta < 0:
+            updates[field] = Greatest(F(field) + delta, 0)
+    if not updates:
+        return False
+    updates['updated_at'] = Now()  # .update() skips auto_now; the ETags depend on it
+
+    if EventStats.objects.filter(event_id=event_id).update(**updates):
+        return True
+    if not any(delta > 0 for delta in field_deltas.values()):
+        # Only decrements: nothing to take away from. This is also the cascade
+        # of an event delete (its stats row goes first), which must not
+        # recreate the row
+        return False
+    # Events created through bulk_create have no stats row yet
+    EventStats.objects.bulk_create([EventStats(event_id=event_id)], ignore_conflicts=True)
+    EventStats.objects.filter(event_id=event_id).update(**updates)
+    return True
+
+
+def apply_rsvp_changes(changes):
+    """
+    Applies RSVP status transitions to the counters.
+    `changes` is an iterable of `(event_id, old_status, new_status)`, where
+    `old_status` is None for a new RSVP and `new_status` is None for a delete.
+    """
+    deltas = defaultdict(Counter)
+    for event_id, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        if old_status in RSVP_STATUS_FIELDS:
+            deltas[event_id][RSVP_STATUS_FIELDS[old_status]] -= 1
+        if new_status in RSVP_STATUS_FIELDS:
+            deltas[event_id][RSVP_STATUS_FIELDS[new_status]] += 1
+
+    changed = False
+    for event_id, field_deltas in deltas.items():
+        changed |= _apply(event_id, field_deltas)
+    if changed:
+        event_cache.invalidate()
+
+
+def record_rsvp_change(event_id, old_status, new_status):
+    apply_rsvp_changes([(event_id, old_status, new_status)])
+
+
+def apply_review_changes(changes):
+    """
+    Applies review changes to the running aggregates (count, rating sum and
+    histogram). `changes` is an iterable of `(event_id, old_rating, new_rating)`,
+    where `old_rating` is None for a new review and `new_rating` is None for
+    a delete.
+    """
+    deltas = defaultdict(Counter)
+    for event_id, old_rating, new_rating in changes:
+        if old_rating == new_rating:
+            continue
+        if old_rating is not None:
+            deltas[event_id]['review_count'] -= 1
+            deltas[event_id]['rating_sum'] -= old_rating
+            if old_rating in RATING_FIELDS:
+                deltas[event_id][RATING_FIELDS[old_rating]] -= 1
+        if new_rating is not None:
+            deltas[event_id]['review_count'] += 1
+            deltas[event_id]['rating_sum'] += new_rating
+            if new_rating in RATING_FIELDS:
+                deltas[event_id][RATING_FIELDS[new_rating]] += 1
+
+    changed = False
+    for event_id, field_deltas in deltas.items():
+        changed |= _apply(event_id, field_deltas)
+    if changed:
+        event_cache.invalidate()
+
+
+def rebuild_event_stats(batch_size=1000):
+    """
+    Recomputes every event's RSVP counters and review aggregates from the
+    RSVP and Review tables, creating any missing stats rows. Used to repair
+    drift; returns the number of events rebuilt.
+    """
+    totals = defaultdict(Counter)
+    for row in RSVP.objects.values('event_id', 'status').annotate(total=Count('id')).order_by():
+        field = RSVP_STATUS_FIELDS.get(row['status'])
+        if field:
+            totals[row['event_id']][field] += row['total']
+    for row in Review.objects.values('event_id', 'rating').annotate(total=Count('id')).order_by():
+        counts = totals[row['event_id']]
+        counts['review_count'] += row['total']
+        counts['rating_sum'] += row['rating'] * row['total']
+        if row['rating'] in RATING_FIELDS:
+            counts[RATING_FIELDS[row['rating']]] += row['total']
+
+    fields = [*RSVP_STATUS_FIELDS.values(), *REVIEW_FIELDS]
+    rebuilt = 0
+    batch = []
+    event_ids = Event.objects.order_by('id').values_list('id', flat=True)
+    for event_id in event_ids.iterator(chunk_size=batch_size):
+        counts = totals.get(event_id, {})
+        batch.append(EventStats(event_id=event_id, **{field: counts.get(field, 0) for field in fields}))
+        if len(batch) >= batch_size:
+            rebuilt += _save_stats(batch, fields)
+            batch = []
+    if batch:
+        rebuilt += _save_stats(batch, fields)
+
+    event_cache.invalidate()
+    return rebuilt
+
+
+def _save_stats(rows, fields):
+    with transaction.atomic():
+        EventStats.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=['event'], update_fields=[*fields, 'updated_at'],
+        )
+    return len(rows)
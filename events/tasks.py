@@ -1,16 +1,166 @@
 from celery import shared_task
-from django.core.mail import send_mail
-from .models import Event
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from .dispatch import submit
+from .images import delete_variants, render_variants, store_variants
+from .models import Event, EventEmailBatch, UserProfile
+from .revocation import purge_expired
 
-# Define a shared Celery task to send event notification emails asynchronously
+
+def _chunk_size(chunk_size=None):
+    return chunk_size or getattr(settings, 'EVENT_EMAIL_CHUNK_SIZE', 500)
+
+
+# Define a shared Celery task that fans an event notification out to every
+# invited user, one sub-task per chunk of recipients. The outbox delivers at
+# least once, so a fan-out planned for an outbox message is recorded under it
+# and a second run for the same message sends nothing.
 @shared_task
-def send_event_email(event_id):
-    # Retrieve the event instance using its ID
-    event = Event.objects.get(id=event_id)
-    
+def send_event_email(event_id, chunk_size=None, kind='created', outbox_message_id=None):
+    # Make sure the event still exists before planning any work
+    Event.objects.only('id').get(id=event_id)
+    chunk_size = _chunk_size(chunk_size)
+    planned = EventEmailBatch.objects.filter(event_id=event_id, kind=kind, outbox_message_id=outbox_message_id)
+    if outbox_message_id is not None and planned.exists():
+        return planned.count()  # Redelivered message: its chunks are already queued
+
+    # Stream invitee ids in order without loading them all, cutting a chunk
+    # (recorded as an id range) every `chunk_size` recipients
+    invitee_ids = (
+        User.objects.filter(invited_events__id=event_id)
+        .order_by('id')
+        .values_list('id', flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+    batch_ids, chunk = [], []
+    try:
+        # All chunks or none, so a concurrent run for the same message
+        # fails on the unique (outbox_message, chunk_index) key
+        with transaction.atomic():
+            for user_id in invitee_ids:
+                chunk.append(user_id)
+                if len(chunk) == chunk_size:
+                    batch_ids.append(_record_chunk(event_id, kind, outbox_message_id, len(batch_ids), chunk))
+                    chunk = []
+            if chunk:
+                batch_ids.append(_record_chunk(event_id, kind, outbox_message_id, len(batch_ids), chunk))
+    except IntegrityError:
+        return planned.count()
+
+    for batch_id in batch_ids:
+        submit(send_event_email_chunk, batch_id)
+    return len(batch_ids)
+
+
+def _record_chunk(event_id, kind, outbox_message_id, index, user_ids):
+    batch = EventEmailBatch.objects.create(
+        event_id=event_id,
+        kind=kind,
+        outbox_message_id=outbox_message_id,
+        chunk_index=index,
+        first_user_id=user_ids[0],
+        last_user_id=user_ids[-1],
+        recipient_count=len(user_ids),
+    )
+    return batch.id
+
+
+# Send one chunk of the fan-out over a single reused mail connection.
+# Messages go out in recipient id order and the highest id handed to the
+# backend is saved on the batch (every PROGRESS_EVERY messages and before a
+# retry), so a retry resumes after it instead of resending the whole chunk.
+PROGRESS_EVERY = 50
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def send_event_email_chunk(self, batch_id):
+    batch = EventEmailBatch.objects.select_related('event').get(id=batch_id)
+    if batch.status == 'sent':
+        return batch.sent_count  # Already delivered (duplicate delivery of the task)
+    event = batch.event
+
     # Prepare the email subject and message content
-    subject = f"New Event Created: {event.title}"
+    if batch.kind == 'updated':
+        subject = f"Event Updated: {event.title}"
+    else:
+        subject = f"New Event Created: {event.title}"
     message = f"Event '{event.title}' is scheduled at {event.start_time}"
-    
-    # Send an email notification (dummy email address for example)
-    send_mail(subject, message, 'noreply@example.com', ['recipient@example.com'])
+
+    recipients = User.objects.filter(
+        invited_events__id=event.id,
+        id__gte=batch.first_user_id,
+        id__lte=batch.last_user_id,
+    ).exclude(email='')
+    if batch.sent_through_user_id is not None:
+        recipients = recipients.filter(id__gt=batch.sent_through_user_id)  # Delivered by an earlier attempt
+    messages = [
+        (user_id, EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [email]))
+        for user_id, email in recipients.order_by('id').values_list('id', 'email').iterator()
+    ]
+
+    EventEmailBatch.objects.filter(id=batch.id).update(status='sending', attempts=F('attempts') + 1)
+    sent, sent_through = batch.sent_count, batch.sent_through_user_id
+    try:
+        # One connection for the whole chunk instead of one per message
+        with get_connection() as connection:
+            for index, (user_id, email_message) in enumerate(messages, start=1):
+                sent += connection.send_messages([email_message]) or 0
+                sent_through = user_id
+                if index % PROGRESS_EVERY == 0:
+                    EventEmailBatch.objects.filter(id=batch.id).update(
+                        sent_count=sent, sent_through_user_id=sent_through
+                    )
+    except Exception as exc:
+        final = self.request.retries >= self.max_retries
+        EventEmailBatch.objects.filter(id=batch.id).update(
+            status='failed' if final else 'retrying', last_error=repr(exc),
+            sent_count=sent, sent_through_user_id=sent_through,
+        )
+        if final:
+            raise
+        raise self.retry(exc=exc)
+
+    EventEmailBatch.objects.filter(id=batch.id).update(
+        status='sent', sent_count=sent, sent_through_user_id=sent_through, last_error=''
+    )
+    return sent
+
+
+# Build the resized, metadata-free copies of a freshly uploaded profile
+# picture. Safe to run twice: a profile whose variants already match its
+# current picture is left alone.
+@shared_task
+def process_profile_picture(profile_id):
+    profile = UserProfile.objects.filter(id=profile_id).only('profile_picture', 'picture_variants').first()
+    if profile is None or not profile.profile_picture:
+        return None
+    picture = profile.profile_picture
+    previous = profile.picture_variants or {}
+    if previous.get('source') == picture.name:
+        return previous
+
+    with picture.storage.open(picture.name, 'rb') as source:
+        rendered = render_variants(source)
+    variants = store_variants(picture.storage, picture.name, rendered)
+
+    # Only record them if the picture hasn't been replaced meanwhile; the
+    # newer upload has its own task queued
+    updated = UserProfile.objects.filter(id=profile_id, profile_picture=picture.name).update(
+        picture_variants=variants
+    )
+    if updated:
+        delete_variants(picture.storage, previous)
+    else:
+        delete_variants(picture.storage, variants)
+    return variants
+
+
+# Delete revoked refresh tokens past their expiry; they would be rejected
+# anyway. Runs hourly from Celery beat (CELERY_BEAT_SCHEDULE) so the
+# request path never has to.
+@shared_task
+def purge_revoked_tokens():
+    return purge_expired()
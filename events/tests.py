@@ -1,11 +1,57 @@
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework.request import Request
+from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.utils import timezone
+from django.utils.http import http_date
 from datetime import timedelta
+from io import BytesIO, StringIO
+import hashlib
+import json
+import os
+import pstats
+import sqlite3
+import tempfile
+from django.db import connection, connections, transaction
 from django.db.models import Q
-from events.models import Event, RSVP, Review
+from django.contrib import admin
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+import threading
+import time
+from celery import shared_task
+from django_celery_results.models import TaskResult
+from PIL import Image
+from events import cache as event_cache, dispatch, revocation
+from events.admin import EstimatedCountPaginator, ScalableModelAdmin
+from events.authentication import get_user_cache
+from events.models import (
+    Event, EventEmailBatch, EventStats, FacetCount, OutboxMessage, RevokedToken, RSVP, Review, UserProfile,
+)
+from events.outbox import drain_outbox
+from events.permissions import IsOrganizerOrInvitedOrReadOnly
+from events.routers import ReadReplicaRouter
+from events.serializers import UserProfileSerializer
+from events.sqlite import apply_pragmas
+from events.tasks import purge_revoked_tokens, send_event_email, send_event_email_chunk
+
+# The shipped settings have no shared cache (the response cache is off).
+# Tests of the cache itself use a file-based one, which every process shares
+# and which runs no queries, like Redis would
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(tempfile.gettempdir(), "events-test-cache"),
+    }
+}
 
 
 class EventAPITestCase(APITestCase):
@@ -53,6 +99,45 @@ class EventAPITestCase(APITestCase):
         titles = [e["title"] for e in response.data["results"]]
         self.assertIn("Private Event", titles)
 
+    def test_invited_event_listed_once(self):
+        """✅ An event matching several visibility rules is listed only once."""
+        self.public_event.invited_users.add(self.user1, self.user2)
+        self.authenticate(self.user1)
+        response = self.client.get("/api/events/")
+        ids = [e["id"] for e in response.data["results"]]
+        self.assertEqual(sorted(ids), sorted([self.public_event.id, self.private_event.id]))
+
+    def test_private_event_hidden_from_uninvited(self):
+        """❌ Private events stay hidden from users who are not invited."""
+        outsider = User.objects.create_user(username="outsider", password="test123")
+        self.assertFalse(Event.objects.visible_to(outsider).filter(id=self.private_event.id).exists())
+
+    def test_private_event_detail_for_invited(self):
+        """✅ Invited users can open a private event; the invite is checked with one EXISTS query."""
+        self.authenticate(self.user2)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/events/{self.private_event.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        invite_checks = [q for q in queries if q["sql"].startswith("SELECT 1 AS")]
+        self.assertEqual(len(invite_checks), 1)
+
+    def test_invite_check_memoized_per_request(self):
+        """✅ Checking the permission twice in one request runs the invitation EXISTS once."""
+        permission = IsOrganizerOrInvitedOrReadOnly()
+        request = Request(RequestFactory().get(f"/api/events/{self.private_event.id}/"))
+        request.user = self.user2
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(permission.has_object_permission(request, None, self.private_event))
+            self.assertTrue(permission.has_object_permission(request, None, self.private_event))
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"events_event_invited_users"', queries[0]["sql"])
+
+        # The memo lives on the request: the next one asks the database again
+        request = Request(RequestFactory().get(f"/api/events/{self.private_event.id}/"))
+        request.user = self.user2
+        with self.assertNumQueries(1):
+            permission.has_object_permission(request, None, self.private_event)
+
     def test_create_event_authenticated(self):
         """✅ Authenticated user can create an event."""
         self.authenticate(self.user2)
@@ -76,6 +161,153 @@ class EventAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+class EventPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="dev", password="test123")
+        self.events = [
+            Event.objects.create(
+                organizer=self.user,
+                title=f"Event {i}",
+                description="Pagination testing",
+                location="Online",
+                start_time=timezone.now(),
+                end_time=timezone.now() + timedelta(hours=2),
+                is_public=True
+            )
+            for i in range(12)
+        ]
+
+    def test_cursor_pages_walk_whole_feed(self):
+        """✅ Following `next` cursors visits every event exactly once, newest first."""
+        url, titles = "/api/events/", []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            titles += [e["title"] for e in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(titles, [f"Event {i}" for i in reversed(range(12))])
+
+    def test_previous_cursor_returns_prior_page(self):
+        """✅ The `previous` cursor of page two leads back to page one."""
+        first = self.client.get("/api/events/")
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(first.data["previous"])
+
+    def test_page_number_mode_still_available(self):
+        """✅ `?page=N` keeps the page-number response with a total count."""
+        response = self.client.get("/api/events/?page=3")
+        self.assertEqual(response.data["count"], 12)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_list_query_count_independent_of_page_size(self):
+        """✅ A list page costs the same number of queries whatever its size."""
+        other = User.objects.create_user(username="guest", password="test123")
+        for event in self.events:
+            event.invited_users.add(other)
+        self.client.force_authenticate(user=self.user)
+        for page_size in (2, 10):
+            with self.assertNumQueries(1):
+                response = self.client.get(f"/api/events/?page_size={page_size}")
+            self.assertEqual(len(response.data["results"]), page_size)
+
+    def test_list_is_compact_and_detail_is_full(self):
+        """✅ List pages omit invitees and description; detail includes them."""
+        listed = self.client.get("/api/events/").data["results"][0]
+        self.assertNotIn("invited_users", listed)
+        self.assertNotIn("description", listed)
+        detail = self.client.get(f"/api/events/{listed['id']}/").data
+        self.assertEqual(detail["invited_users"], [])
+        self.assertEqual(detail["description"], "Pagination testing")
+
+    def test_invalid_cursor(self):
+        """❌ A tampered cursor is rejected."""
+        response = self.client.get("/api/events/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class EventCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        event_cache.reset_stats()
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username="dev", password="test123")
+        self.guest = User.objects.create_user(username="tmp", password="test123")
+        self.event = Event.objects.create(
+            organizer=self.organizer,
+            title="Cached Event",
+            description="Cache testing",
+            location="Online",
+            start_time=timezone.now(),
+            end_time=timezone.now() + timedelta(hours=2),
+            is_public=True
+        )
+
+    def test_anonymous_reads_served_from_cache(self):
+        """✅ Repeated anonymous list/detail reads hit the cache without touching the database."""
+        for url in ("/api/events/", f"/api/events/{self.event.id}/"):
+            self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+            with self.assertNumQueries(0):
+                response = self.client.get(url)
+            self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(event_cache.stats()["hits"], 2)
+        self.assertEqual(event_cache.stats()["misses"], 2)
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "events_cache"}})
+    def test_database_cache_is_not_used(self):
+        """❌ A DatabaseCache would cost more queries than it saves, so reads bypass it."""
+        self.assertFalse(event_cache.enabled())
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/events/")
+        self.assertFalse(response.has_header("X-Cache"))
+
+    def test_event_change_invalidates(self):
+        """✅ Saving an event bumps the version so the next read is fresh."""
+        self.client.get("/api/events/")
+        self.event.title = "Renamed"
+        self.event.save()
+        response = self.client.get("/api/events/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["title"], "Renamed")
+
+    def test_username_change_invalidates(self):
+        """✅ Renaming the organizer bumps the version; ❌ other user saves don't."""
+        self.client.get("/api/events/")
+        version = event_cache.current_version()
+        self.organizer.last_login = timezone.now()
+        self.organizer.save(update_fields=["last_login"])
+        self.organizer.first_name = "Dev"
+        self.organizer.save()
+        self.assertEqual(event_cache.current_version(), version)
+
+        self.organizer.username = "renamed"
+        self.organizer.save()
+        response = self.client.get("/api/events/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["organizer"], "renamed")
+
+    def test_invite_change_invalidates_private_detail(self):
+        """❌ Removing an invitation revokes a cached private detail."""
+        self.event.is_public = False
+        self.event.save()
+        self.event.invited_users.add(self.guest)
+        self.client.force_authenticate(user=self.guest)
+        url = f"/api/events/{self.event.id}/"
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.event.invited_users.remove(self.guest)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_scopes_are_separate(self):
+        """✅ Anonymous and authenticated readers never share cached lists."""
+        self.client.get("/api/events/")
+        self.client.force_authenticate(user=self.guest)
+        self.assertEqual(self.client.get("/api/events/")["X-Cache"], "MISS")
+
+
 class RSVPTestCase(APITestCase):
     def setUp(self):
         self.client = APIClient()
@@ -109,6 +341,177 @@ class RSVPTestCase(APITestCase):
         self.assertEqual(RSVP.objects.first().status, "Not Going")
 
 
+    def test_rsvp_without_status_keeps_existing(self):
+        """✅ Re-posting without a status leaves the stored status untouched."""
+        RSVP.objects.create(user=self.user, event=self.event, status="Going")
+        response = self.client.post(f"/api/events/{self.event.id}/rsvp/", {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], "Going")
+        self.assertIsNotNone(response.data["id"])
+
+    def test_bulk_rsvp_for_own_user(self):
+        """✅ A user can RSVP to many events in one request."""
+        other = Event.objects.create(
+            organizer=self.user, title="Second", description="", location="Test",
+            start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1),
+        )
+        RSVP.objects.create(user=self.user, event=self.event, status="Maybe")
+        payload = {"rsvps": [
+            {"event": self.event.id, "status": "Going"},
+            {"event": other.id, "status": "Not Going"},
+        ]}
+        response = self.client.post("/api/rsvps/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["upserted"], 2)
+        self.assertEqual(
+            dict(RSVP.objects.values_list("event_id", "status")),
+            {self.event.id: "Going", other.id: "Not Going"},
+        )
+        self.assertEqual(
+            EventStats.objects.filter(event=self.event).values_list("going_count", "maybe_count").get(), (1, 0)
+        )
+        self.assertEqual(EventStats.objects.get(event=other).not_going_count, 1)
+
+        # Repeating the batch changes no counter
+        self.client.post("/api/rsvps/bulk/", payload, format="json")
+        self.assertEqual(EventStats.objects.get(event=self.event).going_count, 1)
+        self.assertEqual(EventStats.objects.get(event=other).not_going_count, 1)
+
+    def test_bulk_rsvp_hidden_event_rejected(self):
+        """❌ A private event the user isn't invited to is reported as unknown and gets no RSVP."""
+        organizer = User.objects.create_user(username="host", password="test123")
+        hidden = Event.objects.create(
+            organizer=organizer, title="Private", description="", location="Test",
+            start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1), is_public=False,
+        )
+        payload = {"rsvps": [{"event": hidden.id, "status": "Going"}]}
+        response = self.client.post("/api/rsvps/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(hidden.id), response.data["rsvps"][0])
+        self.assertFalse(RSVP.objects.filter(event=hidden).exists())
+
+        hidden.invited_users.add(self.user)
+        response = self.client.post("/api/rsvps/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_rsvp_unknown_event_rejected(self):
+        """❌ A batch naming a missing event is rejected as a whole."""
+        payload = {"rsvps": [
+            {"event": self.event.id, "status": "Going"},
+            {"event": 999999, "status": "Going"},
+        ]}
+        response = self.client.post("/api/rsvps/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(RSVP.objects.count(), 0)
+
+    def test_upsert_locked_reports_previous_statuses(self):
+        """✅ New rows are inserted with their real status; update_status=False keeps stored ones."""
+        guest = User.objects.create_user(username="guest", password="test123")
+        existing = RSVP.objects.create(user=self.user, event=self.event, status="Going")
+        rows = [RSVP(event=self.event, user=self.user, status="Maybe"), RSVP(event=self.event, user=guest, status="Maybe")]
+        with CaptureQueriesContext(connection) as queries, transaction.atomic():
+            previous = RSVP.objects.upsert_locked(rows, update_status=False)
+        self.assertEqual(previous, {(self.event.id, self.user.id): "Going", (self.event.id, guest.id): None})
+        self.assertEqual((rows[0].pk, rows[0].status), (existing.pk, "Going"))
+        self.assertIsNotNone(rows[1].pk)
+        self.assertFalse([q for q in queries.captured_queries if q["sql"].startswith("UPDATE")])
+        self.assertEqual(
+            dict(RSVP.objects.values_list("user_id", "status")), {self.user.id: "Going", guest.id: "Maybe"}
+        )
+
+        with transaction.atomic():
+            previous = RSVP.objects.upsert_locked([RSVP(event=self.event, user=guest, status="Not Going")])
+        self.assertEqual(previous, {(self.event.id, guest.id): "Maybe"})
+        self.assertEqual(RSVP.objects.get(user=guest).status, "Not Going")
+
+    def test_event_bulk_import_requires_organizer(self):
+        """✅ Organizers import many users' RSVPs; ❌ other users cannot."""
+        guests = [User.objects.create_user(username=f"guest{i}", password="test123") for i in range(3)]
+        url = f"/api/events/{self.event.id}/rsvp/bulk/"
+        payload = {"rsvps": [{"user": g.id, "status": "Going"} for g in guests]}
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(RSVP.objects.filter(event=self.event, status="Going").count(), 3)
+
+        self.client.force_authenticate(user=guests[0])
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+    def counters(self):
+        stats = EventStats.objects.get(event=self.event)
+        return stats.going_count, stats.maybe_count, stats.not_going_count
+
+    def test_rsvp_counters_follow_status_changes(self):
+        """✅ Counters move with RSVP create, status change and delete."""
+        url = f"/api/events/{self.event.id}/rsvp/"
+        self.client.post(url, {"status": "Going"}, format="json")
+        self.assertEqual(self.counters(), (1, 0, 0))
+        self.client.post(url, {"status": "Maybe"}, format="json")
+        self.assertEqual(self.counters(), (0, 1, 0))
+        self.client.patch(f"{url}{self.user.id}/", {"status": "Not Going"}, format="json")
+        self.assertEqual(self.counters(), (0, 0, 1))
+        RSVP.objects.get(event=self.event, user=self.user).delete()
+        self.assertEqual(self.counters(), (0, 0, 0))
+
+    def test_counters_exposed_on_event(self):
+        """✅ Event payloads carry the going/maybe/not going counts."""
+        self.client.post(f"/api/events/{self.event.id}/rsvp/", {"status": "Going"}, format="json")
+        detail = self.client.get(f"/api/events/{self.event.id}/").data
+        listed = self.client.get("/api/events/").data["results"][0]
+        for payload in (detail, listed):
+            self.assertEqual((payload["going_count"], payload["maybe_count"], payload["not_going_count"]), (1, 0, 0))
+
+    def test_rebuild_command_repairs_drift(self):
+        """✅ rebuild_event_stats recomputes counters from the RSVP table."""
+        RSVP.objects.create(user=self.user, event=self.event, status="Going")
+        EventStats.objects.filter(event=self.event).update(going_count=7, maybe_count=3)
+        call_command("rebuild_event_stats", stdout=StringIO())
+        self.assertEqual(self.counters(), (1, 0, 0))
+
+    def test_delete_event_with_rsvps(self):
+        """✅ Deleting an event cascades to its RSVPs without recreating its stats row."""
+        other = User.objects.create_user(username="guest", password="test123")
+        RSVP.objects.create(user=self.user, event=self.event, status="Going")
+        RSVP.objects.create(user=other, event=self.event, status="Maybe")
+        response = self.client.delete(f"/api/events/{self.event.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(RSVP.objects.exists())
+        self.assertFalse(EventStats.objects.filter(event_id=self.event.id).exists())
+
+    def test_event_delete_queries_do_not_grow_with_rsvps(self):
+        """✅ The cascade adjusts no counters row by row: more RSVPs cost no extra UPDATEs."""
+        def delete_queries(rsvp_count):
+            event = Event.objects.create(
+                organizer=self.user, title="Doomed", description="", location="Test",
+                start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1),
+            )
+            guests = User.objects.bulk_create([User(username=f"g{event.id}-{i}") for i in range(rsvp_count)])
+            RSVP.objects.bulk_create([RSVP(event=event, user=guest, status="Going") for guest in guests])
+            with CaptureQueriesContext(connection) as queries:
+                event.delete()
+            return [q["sql"] for q in queries.captured_queries if q["sql"].startswith("UPDATE")]
+
+        self.assertEqual(delete_queries(20), delete_queries(2))
+
+    def test_user_delete_releases_rsvps_per_event(self):
+        """✅ Deleting a user still takes their RSVPs off the counters, one UPDATE per event."""
+        other = Event.objects.create(
+            organizer=self.user, title="Other", description="", location="Test",
+            start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1),
+        )
+        guest = User.objects.create_user(username="guest", password="test123")
+        for event, rsvp_status in ((self.event, "Going"), (other, "Maybe")):
+            self.client.force_authenticate(user=guest)
+            self.client.post(f"/api/events/{event.id}/rsvp/", {"status": rsvp_status}, format="json")
+        with CaptureQueriesContext(connection) as queries:
+            guest.delete()
+        updates = [q for q in queries.captured_queries if 'UPDATE "events_eventstats"' in q["sql"]]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(EventStats.objects.get(event=self.event).going_count, 0)
+        self.assertEqual(EventStats.objects.get(event=other).maybe_count, 0)
+
+
 class ReviewAPITestCase(APITestCase):
     def setUp(self):
         self.client = APIClient()
@@ -132,10 +535,1163 @@ class ReviewAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Review.objects.count(), 1)
 
+    def test_delete_event_with_reviews(self):
+        """✅ Deleting an event cascades to its reviews without recreating its stats row."""
+        Review.objects.create(user=self.user, event=self.event, rating=4, comment="Good")
+        response = self.client.delete(f"/api/events/{self.event.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Review.objects.exists())
+        self.assertFalse(EventStats.objects.filter(event_id=self.event.id).exists())
+
+    def test_delete_cascades_adjust_aggregates_once_per_event(self):
+        """✅ Event deletes leave the aggregates alone; user deletes update them once per event, not per review."""
+        doomed = Event.objects.create(
+            organizer=self.user, title="Doomed", description="", location="Test",
+            start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1),
+        )
+        for _ in range(5):
+            Review.objects.create(user=self.user, event=doomed, rating=5)
+        with CaptureQueriesContext(connection) as queries:
+            doomed.delete()
+        self.assertFalse([q for q in queries.captured_queries if 'UPDATE "events_eventstats"' in q["sql"]])
+
+        guest = User.objects.create_user(username="guest", password="test123")
+        for rating in (2, 3, 5):
+            Review.objects.create(user=guest, event=self.event, rating=rating)
+        with CaptureQueriesContext(connection) as queries:
+            guest.delete()
+        updates = [q for q in queries.captured_queries if 'UPDATE "events_eventstats"' in q["sql"]]
+        self.assertEqual(len(updates), 1)
+        stats = EventStats.objects.get(event=self.event)
+        self.assertEqual((stats.review_count, stats.rating_sum, stats.rating_5_count), (0, 0, 0))
+
     def test_list_reviews(self):
         """✅ List reviews for event."""
         Review.objects.create(user=self.user, event=self.event, rating=4, comment="Good")
         url = f"/api/events/{self.event.id}/reviews/"
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_reviews_paginated_by_cursor(self):
+        """✅ Review lists are cursor-paginated, newest first."""
+        for rating in range(1, 6):
+            for _ in range(3):
+                Review.objects.create(user=self.user, event=self.event, rating=rating)
+        url, seen = f"/api/events/{self.event.id}/reviews/", []
+        while url:
+            response = self.client.get(url)
+            self.assertLessEqual(len(response.data["results"]), 10)
+            seen += [r["id"] for r in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(seen), 15)
+
+    def test_review_summary_from_aggregates(self):
+        """✅ Summary reflects creates, updates and deletes without scanning reviews."""
+        url = f"/api/events/{self.event.id}/reviews/"
+        self.client.post(url, {"rating": 5, "comment": "Great"}, format="json")
+        self.client.post(url, {"rating": 3}, format="json")
+        review = Review.objects.create(user=self.user, event=self.event, rating=1)
+        review.rating = 4
+        review.save()
+        Review.objects.filter(rating=3).first().delete()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{url}summary/")
+        self.assertEqual(response.data["review_count"], 2)
+        self.assertEqual(response.data["average_rating"], 4.5)
+        self.assertEqual(response.data["rating_histogram"], {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1})
+
+    def test_review_summary_hidden_event(self):
+        """❌ The summary of a private event is a 404 unless the user may see it."""
+        organizer = User.objects.create_user(username="host", password="test123")
+        hidden = Event.objects.create(
+            organizer=organizer, title="Private", description="", location="Test",
+            start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1), is_public=False,
+        )
+        Review.objects.create(user=organizer, event=hidden, rating=5)
+        url = f"/api/events/{hidden.id}/reviews/summary/"
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        hidden.invited_users.add(self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["review_count"], 1)
+
+    def test_rating_out_of_range_rejected(self):
+        """❌ Ratings outside 1–5 are rejected."""
+        url = f"/api/events/{self.event.id}/reviews/"
+        response = self.client.post(url, {"rating": 9}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(EVENTS_TASK_BACKEND="inline")
+class EventEmailFanOutTestCase(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="dev", password="test123")
+        self.event = Event.objects.create(
+            organizer=self.organizer,
+            title="Launch",
+            description="Email testing",
+            location="Online",
+            start_time=timezone.now(),
+            end_time=timezone.now() + timedelta(hours=2),
+            is_public=False
+        )
+        guests = [
+            User.objects.create_user(username=f"guest{i}", email=f"guest{i}@example.com", password="x")
+            for i in range(7)
+        ]
+        self.event.invited_users.add(*guests)
+
+    def test_invitees_notified_in_chunks(self):
+        """✅ Every invitee gets one email; each chunk reuses one connection and records progress."""
+        with mock.patch("events.tasks.get_connection", wraps=get_connection) as connections:
+            chunks = send_event_email(self.event.id, chunk_size=3)
+        self.assertEqual(chunks, 3)
+        self.assertEqual(connections.call_count, 3)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), sorted(f"guest{i}@example.com" for i in range(7)))
+
+        batches = EventEmailBatch.objects.filter(event=self.event).order_by("chunk_index")
+        self.assertEqual([b.recipient_count for b in batches], [3, 3, 1])
+        self.assertTrue(all(b.status == "sent" and b.attempts == 1 for b in batches))
+        self.assertEqual(sum(b.sent_count for b in batches), 7)
+
+
+    def test_redelivered_outbox_message_sends_once(self):
+        """✅ Running the fan-out twice for one outbox message plans and sends it once."""
+        message = OutboxMessage.objects.create(topic="event.created", event=self.event)
+        self.assertEqual(send_event_email(self.event.id, chunk_size=3, outbox_message_id=message.id), 3)
+        self.assertEqual(send_event_email(self.event.id, chunk_size=3, outbox_message_id=message.id), 3)
+        self.assertEqual(EventEmailBatch.objects.filter(event=self.event).count(), 3)
+        self.assertEqual(len(mail.outbox), 7)
+
+    def test_retry_resumes_after_delivered_recipients(self):
+        """✅ A failed send is retried from the first undelivered recipient; ❌ nobody gets the email twice."""
+        with mock.patch("events.tasks.submit"):
+            send_event_email(self.event.id, chunk_size=10)
+        batch = EventEmailBatch.objects.get(event=self.event)
+        failures = ["guest3@example.com"]
+
+        def flaky_send(messages):
+            # Like SMTP: messages before the failing one are already delivered
+            for message in messages:
+                if message.to[0] in failures:
+                    failures.remove(message.to[0])
+                    raise ConnectionError("SMTP connection dropped")
+                mail.outbox.append(message)
+            return len(messages)
+
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=flaky_send):
+            send_event_email_chunk.apply(args=[batch.id])
+
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), sorted(f"guest{i}@example.com" for i in range(7)))
+        batch.refresh_from_db()
+        self.assertEqual((batch.status, batch.attempts, batch.sent_count), ("sent", 2, 7))
+        self.assertEqual(batch.sent_through_user_id, batch.last_user_id)
+
+
+class EventOutboxTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="dev", password="test123")
+        self.client.force_authenticate(user=self.user)
+        self.payload = {
+            "title": "Outbox Event",
+            "description": "Outbox testing",
+            "location": "Remote",
+            "start_time": (timezone.now() + timedelta(days=1)).isoformat(),
+            "end_time": (timezone.now() + timedelta(days=1, hours=2)).isoformat(),
+            "is_public": True
+        }
+
+    def test_create_writes_outbox_without_broker_io(self):
+        """✅ Creating an event records an outbox row and publishes nothing in the request."""
+        with mock.patch("events.outbox.submit") as submit:
+            response = self.client.post("/api/events/", self.payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        submit.assert_not_called()
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.topic, message.event_id), ("event.created", response.data["id"]))
+
+    def test_rapid_edits_coalesce_into_one_notification(self):
+        """✅ Edits made before the drain share the pending notification."""
+        event_id = self.client.post("/api/events/", self.payload, format="json").data["id"]
+        for title in ("One", "Two", "Three"):
+            self.client.patch(f"/api/events/{event_id}/", {"title": title}, format="json")
+        self.assertEqual(OutboxMessage.objects.filter(dispatched_at__isnull=True).count(), 1)
+
+        with mock.patch("events.outbox.submit") as submit:
+            self.assertEqual(drain_outbox(), 1)
+        message = OutboxMessage.objects.get(event_id=event_id)
+        submit.assert_called_once_with(send_event_email, event_id, kind="created", outbox_message_id=message.id)
+
+        for title in ("Four", "Five"):
+            self.client.patch(f"/api/events/{event_id}/", {"title": title}, format="json")
+        with mock.patch("events.outbox.submit") as submit:
+            self.assertEqual(drain_outbox(), 1)
+        message = OutboxMessage.objects.filter(event_id=event_id).latest("id")
+        submit.assert_called_once_with(send_event_email, event_id, kind="updated", outbox_message_id=message.id)
+
+
+class TaskDispatchTestCase(TestCase):
+    def tearDown(self):
+        dispatch.reset_backend()
+
+    def test_thread_pool_runs_by_priority_and_drains_on_shutdown(self):
+        """✅ The in-process pool runs urgent tasks first and finishes queued work at shutdown."""
+        ran = []
+        gate = threading.Event()
+
+        @shared_task
+        def record(label):
+            gate.wait(5)
+            ran.append(label)
+
+        pool = dispatch.ThreadPoolBackend(workers=1, max_queue=10)
+        pool.submit(record, ("blocker",), {}, 5)
+        while pool.queue_depth():
+            time.sleep(0.01)  # wait until the single worker is busy
+        for label, priority in (("low", 9), ("high", 0), ("mid", 5)):
+            pool.submit(record, (label,), {}, priority)
+        self.assertGreaterEqual(pool.queue_depth(), 3)
+        gate.set()
+        pool.shutdown(wait=True)
+        self.assertEqual(ran, ["blocker", "high", "mid", "low"])
+        metrics = pool.metrics()
+        self.assertEqual((metrics["submitted"], metrics["succeeded"]), (4, 4))
+        self.assertEqual(metrics["run_time_seconds"]["count"], 4)
+
+    def test_full_queue_applies_backpressure(self):
+        """❌ Submitting to a full pool raises QueueFull after the timeout."""
+        gate = threading.Event()
+
+        @shared_task
+        def wait():
+            gate.wait(5)
+
+        pool = dispatch.ThreadPoolBackend(workers=1, max_queue=1, submit_timeout=0.05)
+        pool.submit(wait, (), {}, 5)
+        while pool.queue_depth():
+            time.sleep(0.01)  # wait until the single worker is busy
+        pool.submit(wait, (), {}, 5)
+        with self.assertRaises(dispatch.QueueFull):
+            pool.submit(wait, (), {}, 5)
+        gate.set()
+        pool.shutdown(wait=True)
+        self.assertEqual(pool.metrics()["rejected"], 1)
+
+
+class DatabaseProfileTestCase(SimpleTestCase):
+    def test_pragmas_applied_to_connection(self):
+        """✅ Profile pragmas are applied on connect; read-only connections reject writes."""
+        raw = sqlite3.connect(":memory:")
+        apply_pragmas(raw.cursor(), {"synchronous": "NORMAL", "busy_timeout": 1234}, read_only=True)
+        self.assertEqual(raw.execute("PRAGMA busy_timeout").fetchone()[0], 1234)
+        self.assertEqual(raw.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+        with self.assertRaises(sqlite3.OperationalError):
+            raw.execute("CREATE TABLE t (id INTEGER)")
+        raw.close()
+
+    @override_settings(EVENTS_DB_READ_ALIAS="replica")
+    def test_router_sends_event_reads_to_replica(self):
+        """✅ Event/review reads go to the replica, writes and other models to the primary."""
+        router = ReadReplicaRouter()
+        with mock.patch.dict(connections.databases, {"replica": connections.databases["default"]}):
+            self.assertEqual(router.db_for_read(Event), "replica")
+            self.assertEqual(router.db_for_read(Review), "replica")
+            self.assertIsNone(router.db_for_read(User))
+            self.assertEqual(router.db_for_write(Event), "default")
+            self.assertFalse(router.allow_migrate("replica", "events"))
+
+    @override_settings(EVENTS_DB_READ_ALIAS="replica")
+    def test_router_reads_primary_inside_transaction(self):
+        """✅ Reads inside an atomic block stay on the primary to see their own writes."""
+        router = ReadReplicaRouter()
+        with mock.patch.dict(connections.databases, {"replica": connections.databases["default"]}):
+            with mock.patch.object(connection, "in_atomic_block", True):
+                self.assertEqual(router.db_for_read(Event), "default")
+
+
+class AsyncReadEndpointsTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username="dev", password="test123")
+        self.guest = User.objects.create_user(username="tmp", password="test123")
+        self.public_event = Event.objects.create(
+            organizer=self.organizer, title="Public Event", description="Open to all",
+            location="Online", start_time=timezone.now(),
+            end_time=timezone.now() + timedelta(hours=2), is_public=True,
+        )
+        self.private_event = Event.objects.create(
+            organizer=self.organizer, title="Private Event", description="Invite only",
+            location="Offline", start_time=timezone.now(),
+            end_time=timezone.now() + timedelta(hours=2), is_public=False,
+        )
+        self.private_event.invited_users.add(self.guest)
+        Review.objects.create(event=self.public_event, user=self.guest, rating=4, comment="Nice")
+
+    def authenticate(self, user):
+        """Helper: async views read a real JWT, not force_authenticate."""
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_async_list_matches_sync_list(self):
+        """✅ The async feed returns the same page as the DRF endpoint."""
+        self.authenticate(self.guest)
+        sync_data = self.client.get("/api/events/").json()
+        async_data = self.client.get("/api/async/events/").json()
+        self.assertEqual(async_data["results"], sync_data["results"])
+        self.assertEqual(len(async_data["results"]), 2)
+
+    def test_async_detail_respects_visibility(self):
+        """✅ Invitees get the full event; ❌ anonymous users get 404 for private ones."""
+        self.authenticate(self.guest)
+        response = self.client.get(f"/api/async/events/{self.private_event.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), self.client.get(f"/api/events/{self.private_event.id}/").json())
+        self.assertEqual(response.json()["invited_users"], [self.guest.id])
+
+        self.client.credentials()
+        response = self.client.get(f"/api/async/events/{self.private_event.id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_async_review_list(self):
+        """✅ Reviews come back cursor-paginated, like the DRF list."""
+        response = self.client.get(f"/api/async/events/{self.public_event.id}/reviews/?count=true")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 1)
+        self.assertEqual(response.json()["results"][0]["user"], "tmp")
+
+    def test_async_rejects_bad_token_and_writes(self):
+        """❌ Invalid tokens get 401 and non-GET methods 405."""
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        self.assertEqual(self.client.get("/api/async/events/").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        self.assertEqual(
+            self.client.post("/api/async/events/", {}, format="json").status_code,
+            status.HTTP_405_METHOD_NOT_ALLOWED,
+        )
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class CachedJWTAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="dev", password="test123", is_staff=True)
+        Event.objects.create(
+            organizer=self.user, title="Public Event", description="Open to all",
+            location="Online", start_time=timezone.now(),
+            end_time=timezone.now() + timedelta(hours=2), is_public=True,
+        )
+        # Change marks from creating the user predate the tokens issued below
+        cache.clear()
+        get_user_cache().clear()
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def user_queries(self, path):
+        """Response, every query it ran, and those loading the user."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        captured = [q["sql"] for q in queries.captured_queries]
+        return response, captured, [sql for sql in captured if 'FROM "auth_user"' in sql]
+
+    def test_user_cached_between_requests(self):
+        """✅ Only the first request loads the user from the database."""
+        response, queries, user_queries = self.user_queries("/api/events/cache-stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((len(queries), len(user_queries)), (1, 1))
+        response, queries, _ = self.user_queries("/api/events/cache-stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+        self.assertGreaterEqual(response.data["user_cache"]["hits"], 1)
+
+    def test_deactivation_invalidates_cached_user(self):
+        """❌ A deactivated user is rejected on the next request, cached or not."""
+        self.assertEqual(self.client.get("/api/events/cache-stats/").status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/events/cache-stats/").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.get("/api/events/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_lightweight_reads_skip_user_query(self):
+        """✅ Event reads authenticate from token claims: the page query is the only one."""
+        response, queries, _ = self.user_queries("/api/events/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('FROM "events_event"', queries[0])
+        self.assertEqual(len(response.data["results"]), 1)
+
+    @override_settings(EVENTS_AUTH_LIGHTWEIGHT_READS=False)
+    def test_lightweight_reads_can_be_disabled(self):
+        """✅ With lightweight reads off, reads load the real user once."""
+        response, queries, user_queries = self.user_queries("/api/events/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((len(queries), len(user_queries)), (2, 1))
+
+    def test_no_shortcuts_without_a_shared_cache(self):
+        """❌ With a per-process or database cache, every read loads the user and nothing touches the cache table."""
+        for backend in ("locmem.LocMemCache", "db.DatabaseCache"):
+            caches = {"default": {"BACKEND": f"django.core.cache.backends.{backend}", "LOCATION": "events_cache"}}
+            with self.subTest(backend=backend), override_settings(CACHES=caches):
+                for _ in range(2):
+                    response, queries, user_queries = self.user_queries("/api/events/")
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    self.assertEqual((len(queries), len(user_queries)), (2, 1))
+                    self.assertFalse([sql for sql in queries if "events_cache" in sql])
+
+
+class TokenRevocationTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="dev", password="test123")
+        revocation.reset_store()
+
+    def obtain(self):
+        response = self.client.post("/api/token/", {"username": "dev", "password": "test123"}, format="json")
+        return response.data["refresh"]
+
+    def test_rotated_refresh_token_is_revoked(self):
+        """✅ Refresh rotates the token; ❌ presenting the old one again fails."""
+        refresh = self.obtain()
+        response = self.client.post("/api/token/refresh/", {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+        rotated = response.data["refresh"]
+        self.assertNotEqual(rotated, refresh)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+        replay = self.client.post("/api/token/refresh/", {"refresh": refresh}, format="json")
+        self.assertEqual(replay.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post("/api/token/refresh/", {"refresh": rotated}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unrevoked_tokens_skip_the_table(self):
+        """✅ A token that was never revoked is cleared by the filter without a lookup."""
+        store = revocation.get_store()
+        store.is_revoked("warm-up")  # builds the filter
+        with CaptureQueriesContext(connection) as queries:
+            self.assertFalse(store.is_revoked("never-revoked"))
+        self.assertFalse([q for q in queries.captured_queries if '"jti" =' in q["sql"]])
+
+    def test_store_syncs_other_processes(self):
+        """✅ Rows written elsewhere are seen once the sync interval has passed."""
+        store = revocation.get_store()
+        self.assertFalse(store.is_revoked("elsewhere"))
+        RevokedToken.objects.create(jti="elsewhere", expires_at=timezone.now() + timedelta(days=1))
+        store._synced_at = float("-inf")  # the sync interval has passed
+        self.assertTrue(store.is_revoked("elsewhere"))
+
+    def test_rebuild_runs_off_the_request_path(self):
+        """✅ A due rebuild is handed to a background thread; ❌ checks don't load the table themselves."""
+        store = revocation.get_store()
+        store.is_revoked("warm-up")
+        store._built_at = float("-inf")  # the rebuild is due
+        with mock.patch.object(revocation.threading, "Thread") as thread:
+            with CaptureQueriesContext(connection) as queries:
+                self.assertFalse(store.is_revoked("never-revoked"))
+        thread.return_value.start.assert_called_once()
+        self.assertFalse([q for q in queries.captured_queries if "COUNT" in q["sql"]])
+
+        RevokedToken.objects.create(jti="stale", expires_at=timezone.now() - timedelta(seconds=1))
+        RevokedToken.objects.create(jti="live", expires_at=timezone.now() + timedelta(days=1))
+        with mock.patch.object(revocation, "connection"):  # keep the test connection open
+            store._rebuild_in_background()
+        self.assertFalse(store._rebuilding)
+        self.assertIn("live", store._filter)
+        self.assertNotIn("stale", store._filter)
+
+    def test_purge_task_deletes_expired_tokens(self):
+        """✅ The beat task drops expired rows and keeps live ones."""
+        RevokedToken.objects.create(jti="stale", expires_at=timezone.now() - timedelta(seconds=1))
+        RevokedToken.objects.create(jti="live", expires_at=timezone.now() + timedelta(days=1))
+        self.assertEqual(purge_revoked_tokens(), 1)
+        self.assertEqual(list(RevokedToken.objects.values_list("jti", flat=True)), ["live"])
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """✅ Every added key is found; unknown keys rarely are."""
+        bloom = revocation.BloomFilter(capacity=2000, error_rate=0.01)
+        keys = [f"jti-{i}" for i in range(2000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f"other-{i}" in bloom for i in range(2000))
+        self.assertLess(false_positives, 100)
+
+
+class EventSearchTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username="dev", password="test123")
+        self.guest = User.objects.create_user(username="tmp", password="test123")
+
+        def event(title, description, location, is_public=True):
+            return Event.objects.create(
+                organizer=self.organizer, title=title, description=description, location=location,
+                start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=2), is_public=is_public,
+            )
+
+        self.conference = event("Python Conference", "Talks and sprints", "Berlin")
+        self.meetup = event("Monthly Meetup", "Lightning talks about Python", "Online")
+        self.workshop = event("Python Workshop", "Hands-on session", "Mumbai", is_public=False)
+        self.workshop.invited_users.add(self.guest)
+        event("Cooking Class", "Italian dishes", "Rome")
+
+    def titles(self, response):
+        return [item["title"] for item in response.data["results"]]
+
+    def test_search_ranks_and_respects_visibility(self):
+        """✅ Title matches rank first; ❌ private events stay hidden from anonymous users."""
+        response = self.client.get("/api/events/search/?q=python")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.titles(response), ["Python Conference", "Monthly Meetup"])
+
+        self.client.force_authenticate(user=self.guest)
+        response = self.client.get("/api/events/search/?q=python")
+        self.assertEqual(set(self.titles(response)[:2]), {"Python Conference", "Python Workshop"})
+        self.assertEqual(self.titles(response)[2], "Monthly Meetup")
+
+    def test_search_prefix_and_multiple_terms(self):
+        """✅ The last word matches as a prefix and every word must match."""
+        self.assertEqual(self.titles(self.client.get("/api/events/search/?q=conf")), ["Python Conference"])
+        self.assertEqual(self.titles(self.client.get("/api/events/search/?q=python berlin")), ["Python Conference"])
+        self.assertEqual(self.titles(self.client.get('/api/events/search/?q=python OR "cook')), [])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """✅ Edits and deletes are reflected in the index immediately."""
+        self.conference.title = "Rust Conference"
+        self.conference.save()
+        self.assertEqual(self.titles(self.client.get("/api/events/search/?q=rust")), ["Rust Conference"])
+        self.conference.delete()
+        self.assertEqual(self.titles(self.client.get("/api/events/search/?q=rust")), [])
+
+    def test_search_requires_query(self):
+        """❌ A missing or blank `q` is a validation error."""
+        response = self.client.get("/api/events/search/?q=%20")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EventCalendarTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="dev", password="test123")
+        self.now = timezone.now()
+
+        def event(title, start_hours, duration_hours, is_public=True):
+            start = self.now + timedelta(hours=start_hours)
+            return Event.objects.create(
+                organizer=self.user, title=title, description="", location="Online",
+                start_time=start, end_time=start + timedelta(hours=duration_hours), is_public=is_public,
+            )
+
+        self.past = event("Past", -48, 2)
+        self.ongoing = event("Ongoing", -1, 3)
+        self.soon = event("Soon", 2, 2)
+        self.later = event("Later", 24, 2)
+        self.overlaps_soon = event("Overlaps Soon", 3, 2)
+        self.private = event("Private Soon", 1, 1, is_public=False)
+
+    def titles(self, response):
+        return [item["title"] for item in response.data["results"]]
+
+    def test_upcoming_and_ongoing(self):
+        """✅ Upcoming is soonest first; ongoing only has events in progress."""
+        response = self.client.get("/api/events/calendar/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.titles(response), ["Soon", "Overlaps Soon", "Later"])
+        response = self.client.get("/api/events/calendar/?when=ongoing")
+        self.assertEqual(self.titles(response), ["Ongoing"])
+
+    def test_overlap_window_respects_visibility(self):
+        """✅ Events intersecting the window are returned; private ones only to those who may see them."""
+        params = {
+            "when": "overlap",
+            "start": (self.now + timedelta(minutes=30)).isoformat(),
+            "end": (self.now + timedelta(hours=3, minutes=30)).isoformat(),
+        }
+        response = self.client.get("/api/events/calendar/", params)
+        self.assertEqual(self.titles(response), ["Ongoing", "Soon", "Overlaps Soon"])
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/events/calendar/", params)
+        self.assertEqual(self.titles(response), ["Ongoing", "Private Soon", "Soon", "Overlaps Soon"])
+
+    def test_overlap_requires_valid_window(self):
+        """❌ Overlap queries need `start` < `end`."""
+        response = self.client.get("/api/events/calendar/?when=overlap")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        params = {"when": "overlap", "start": self.now.isoformat(), "end": self.now.isoformat()}
+        self.assertEqual(self.client.get("/api/events/calendar/", params).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_conflicts_with_going_rsvps(self):
+        """✅ Only the caller's "Going" RSVPs that overlap the event are reported."""
+        guest = User.objects.create_user(username="tmp", password="test123")
+        RSVP.objects.create(event=self.overlaps_soon, user=guest, status="Going")
+        RSVP.objects.create(event=self.ongoing, user=guest, status="Maybe")
+        RSVP.objects.create(event=self.later, user=guest, status="Going")
+        RSVP.objects.create(event=self.soon, user=guest, status="Going")
+
+        self.client.force_authenticate(user=guest)
+        response = self.client.get(f"/api/events/{self.soon.id}/conflicts/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["title"] for item in response.data["conflicts"]], ["Overlaps Soon"])
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get(f"/api/events/{self.soon.id}/conflicts/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class EventFacetTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username="dev", password="test123")
+        self.guest = User.objects.create_user(username="guest", password="test123")
+        self.start = timezone.datetime(2025, 11, 3, 10, tzinfo=timezone.utc)
+
+        def event(title, location, is_public=True, start=None):
+            start = start or self.start
+            return Event.objects.create(
+                organizer=self.organizer, title=title, description="", location=location,
+                start_time=start, end_time=start + timedelta(hours=2), is_public=is_public,
+            )
+
+        self.berlin = event("Berlin Meetup", "Berlin")
+        self.online = event("Online Talk", "Online")
+        self.december = event("December Online", "Online", start=self.start + timedelta(days=40))
+        self.private = event("Private Berlin", "Berlin", is_public=False)
+        self.private.invited_users.add(self.guest)
+
+    def facet(self, response, name):
+        return {item["value"]: item["count"] for item in response.data["facets"][name]}
+
+    def test_public_counts_for_anonymous_users(self):
+        """✅ Anonymous facet counts only cover public events."""
+        response = self.client.get("/api/events/?facets=true")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.facet(response, "location"), {"Online": 2, "Berlin": 1})
+        self.assertEqual(self.facet(response, "is_public"), {True: 3})
+        self.assertEqual(self.facet(response, "month"), {"2025-11": 2, "2025-12": 1})
+        self.assertEqual(response.data["facets"]["organizer"][0]["label"], "dev")
+
+    def test_private_counts_merged_for_invitees(self):
+        """✅ Invited users see their private events counted on top of the public counters."""
+        self.client.force_authenticate(user=self.guest)
+        response = self.client.get("/api/events/?facets=true")
+        self.assertEqual(self.facet(response, "location"), {"Online": 2, "Berlin": 2})
+        self.assertEqual(self.facet(response, "is_public"), {True: 3, False: 1})
+        self.assertNotIn("facets", self.client.get("/api/events/").data)
+
+    def test_filters_narrow_results(self):
+        """✅ Location, visibility, organizer and month filters narrow the list."""
+        self.client.force_authenticate(user=self.guest)
+        response = self.client.get("/api/events/?location=Berlin&is_public=false")
+        self.assertEqual([item["title"] for item in response.data["results"]], ["Private Berlin"])
+        response = self.client.get(f"/api/events/?month=2025-12&organizer={self.organizer.id}")
+        self.assertEqual([item["title"] for item in response.data["results"]], ["December Online"])
+        response = self.client.get("/api/events/?location=Online")
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_invalid_month_rejected(self):
+        """❌ Malformed month filters return 400."""
+        response = self.client.get("/api/events/?month=2025-13")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_counters_follow_updates_and_deletes(self):
+        """✅ Saving or deleting an event moves its counts; rebuild gives the same numbers."""
+        self.online.location = "Berlin"
+        self.online.save()
+        self.berlin.is_public = False
+        self.berlin.save()
+        self.december.delete()
+
+        counts = dict(FacetCount.objects.filter(facet="location").values_list("value", "count"))
+        self.assertEqual(counts, {"Berlin": 1, "Online": 0})
+        call_command("rebuild_facet_counts", stdout=StringIO())
+        counts = dict(FacetCount.objects.filter(facet="location").values_list("value", "count"))
+        self.assertEqual(counts, {"Berlin": 1})
+
+
+class BulkExportImportTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user(username="admin", password="test123", is_staff=True)
+        self.user = User.objects.create_user(username="dev", password="test123")
+        start = timezone.now() + timedelta(days=1)
+        self.event = Event.objects.create(
+            organizer=self.user, title="Export Me", description="Line one,\nline two", location="Berlin",
+            start_time=start, end_time=start + timedelta(hours=2), is_public=False,
+        )
+        self.event.invited_users.add(self.staff)
+        RSVP.objects.create(event=self.event, user=self.staff, status="Going")
+        Review.objects.create(event=self.event, user=self.staff, rating=4, comment="Good")
+
+    def export(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_is_staff_only(self):
+        """❌ Non-staff users can't dump tables."""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/export/events.ndjson")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_streaming_ndjson_and_csv(self):
+        """✅ Events stream as NDJSON with invitees; reviews stream as CSV with a header."""
+        self.client.force_authenticate(user=self.staff)
+        rows = [json.loads(line) for line in self.export("/api/export/events.ndjson").splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["invited_user_ids"], [self.staff.id])
+        self.assertEqual(rows[0]["description"], "Line one,\nline two")
+
+        lines = self.export("/api/export/reviews.csv").splitlines()
+        self.assertEqual(lines[0], "id,event_id,user_id,rating,comment,created_at")
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(self.client.get("/api/export/tickets.csv").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_import_round_trip(self):
+        """✅ Exported files import back with ids, invitations, timestamps and counters intact."""
+        self.client.force_authenticate(user=self.staff)
+        created_at = self.event.created_at
+        with tempfile.TemporaryDirectory() as directory:
+            paths = {}
+            for name in ("events.csv", "rsvps.ndjson", "reviews.ndjson"):
+                paths[name] = f"{directory}/{name}"
+                with open(paths[name], "w", encoding="utf-8", newline="") as handle:
+                    handle.write(self.export(f"/api/export/{name}"))
+            Event.objects.all().delete()
+
+            for name in ("events.csv", "rsvps.ndjson", "reviews.ndjson"):
+                call_command("import_events", paths[name], batch_size=1, stdout=StringIO())
+
+        event = Event.objects.get(pk=self.event.pk)
+        self.assertEqual(event.description, "Line one,\nline two")
+        self.assertEqual(event.created_at, created_at)
+        self.assertFalse(event.is_public)
+        self.assertEqual(list(event.invited_users.all()), [self.staff])
+        self.assertEqual(event.stats.going_count, 1)
+        self.assertEqual(event.stats.review_count, 1)
+
+
+class MetricsInstrumentationTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user(username="admin", password="test123", is_staff=True)
+        self.user = User.objects.create_user(username="dev", password="test123")
+        start = timezone.now() + timedelta(days=1)
+        self.event = Event.objects.create(
+            organizer=self.user, title="Measured", description="", location="Online",
+            start_time=start, end_time=start + timedelta(hours=1),
+        )
+
+    def scrape(self, **headers):
+        return self.client.get("/metrics", **headers)
+
+    @override_settings(EVENTS_METRICS={"token": "scrape-secret"})
+    def test_route_histograms_exposed(self):
+        """✅ Requests show up per route with latency, query count and size histograms."""
+        self.client.get("/api/events/")
+        self.client.get(f"/api/events/{self.event.id}/")
+        self.client.get("/api/events/999999/")
+
+        response = self.scrape(HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn('events_http_requests_total{route="event-detail",method="GET",status="200"} 1', body)
+        self.assertIn('events_http_requests_total{route="event-detail",method="GET",status="404"} 1', body)
+        self.assertIn('events_http_request_queries_count{route="event-list",method="GET"} 1', body)
+        self.assertIn('events_http_request_duration_seconds_bucket{route="event-list",method="GET",le="+Inf"} 1', body)
+        self.assertIn('events_http_response_bytes_sum{route="event-list",method="GET"}', body)
+        # The list page ran at least one query, so the 0-query bucket stays empty
+        self.assertIn('events_http_request_queries_bucket{route="event-list",method="GET",le="0"} 0', body)
+
+    @override_settings(EVENTS_METRICS={"token": "scrape-secret"})
+    def test_metrics_access(self):
+        """❌ Anonymous users and wrong tokens are refused; staff sessions are allowed."""
+        self.assertEqual(self.scrape().status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.scrape(HTTP_AUTHORIZATION="Bearer wrong").status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_login(self.staff)
+        self.assertEqual(self.scrape().status_code, status.HTTP_200_OK)
+
+    @override_settings(EVENTS_METRICS={"token": "scrape-secret"}, EVENTS_TASK_BACKEND="inline")
+    def test_task_metrics_exposed(self):
+        """✅ Background task counters and latencies from events.dispatch appear on /metrics."""
+        dispatch.reset_backend()
+        self.addCleanup(dispatch.reset_backend)
+        dispatch.submit(purge_revoked_tokens)
+        body = self.scrape(HTTP_AUTHORIZATION="Bearer scrape-secret").content.decode()
+        self.assertIn('events_tasks_submitted_total{backend="inline"} 1', body)
+        self.assertIn('events_tasks_finished_total{backend="inline",outcome="succeeded"} 1', body)
+        self.assertIn('events_task_run_seconds_count{backend="inline"} 1', body)
+        self.assertIn('events_task_queue_wait_seconds_bucket{backend="inline",le="0.005"} 1', body)
+        self.assertNotIn("events_task_queue_depth", body)  # inline has no queue
+
+    @override_settings(EVENTS_METRICS={"token": "scrape-secret"}, EVENTS_TASK_BACKEND="celery")
+    def test_celery_task_metrics_come_from_the_result_backend(self):
+        """✅ With Celery, outcomes and run times are read from stored results and depth from the broker."""
+        dispatch.reset_backend()
+        self.addCleanup(dispatch.reset_backend)
+        started = timezone.now()
+        for index, (state, seconds) in enumerate((("SUCCESS", 2), ("SUCCESS", 3), ("FAILURE", 1), ("STARTED", 0))):
+            TaskResult.objects.create(task_id=f"task-{index}", status=state, date_started=started)
+            # date_done is auto_now, so it is set after the fact
+            TaskResult.objects.filter(task_id=f"task-{index}").update(date_done=started + timedelta(seconds=seconds))
+        with mock.patch.object(dispatch.CeleryBackend, "queue_depth", return_value=7):
+            body = self.scrape(HTTP_AUTHORIZATION="Bearer scrape-secret").content.decode()
+        self.assertIn('events_task_queue_depth{backend="celery"} 7', body)
+        self.assertIn('events_tasks_finished_total{backend="celery",outcome="succeeded"} 2', body)
+        self.assertIn('events_tasks_finished_total{backend="celery",outcome="failed"} 1', body)
+        self.assertIn('events_task_run_seconds_sum{backend="celery"} 6.0', body)
+        self.assertIn('events_task_run_seconds_count{backend="celery"} 3', body)
+        self.assertNotIn("events_task_queue_wait_seconds", body)
+
+    def test_sampled_profiler_saves_slow_requests(self):
+        """✅ With sampling on, requests over the threshold are dumped as cProfile files."""
+        with tempfile.TemporaryDirectory() as directory, override_settings(EVENTS_METRICS={
+            "profile_sample_rate": 1.0, "profile_threshold": 0, "profile_dir": directory, "profile_keep": 2,
+        }):
+            for _ in range(3):
+                self.client.get("/api/events/")
+            saved = sorted(os.listdir(directory))
+            self.assertEqual(len(saved), 2)
+            self.assertTrue(saved[-1].endswith("-GET-event-list.prof"))
+            pstats.Stats(os.path.join(directory, saved[-1]))  # readable dump
+
+
+@override_settings(EVENTS_TASK_BACKEND="inline")
+class ProfilePictureVariantTestCase(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.media.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.user = User.objects.create_user(username="dev", password="test123")
+
+    def upload(self, name="me.jpg", size=(1200, 800)):
+        image = Image.new("RGB", size, "red")
+        exif = Image.Exif()
+        exif[0x010F] = "SecretCam"  # Make
+        exif[0x0112] = 6  # Orientation: rotate 90° clockwise to display
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", exif=exif.tobytes())
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+    def test_variants_built_after_commit(self):
+        """✅ The upload only queues work; variants appear after commit, square and without EXIF."""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            profile = UserProfile.objects.create(user=self.user, full_name="Dev", profile_picture=self.upload())
+        self.assertEqual(UserProfileSerializer(profile).data["picture_variants"], {})
+        self.assertEqual(len(callbacks), 1)
+
+        callbacks[0]()
+        profile.refresh_from_db()
+        urls = UserProfileSerializer(profile).data["picture_variants"]
+        self.assertEqual(set(urls), {"thumb", "small", "medium"})
+        self.assertTrue(urls["thumb"]["webp"].endswith("_thumb.webp"))
+
+        for extension, format_name in (("webp", "WEBP"), ("jpeg", "JPEG")):
+            with profile.profile_picture.storage.open(profile.picture_variants["small"][extension]) as handle:
+                variant = Image.open(handle)
+                variant.load()
+            self.assertEqual(variant.format, format_name)
+            self.assertEqual(variant.size, (160, 160))
+            self.assertNotIn("exif", variant.info)
+
+    def test_replacing_picture_removes_old_variants(self):
+        """✅ A new upload rebuilds the variants and deletes the previous files."""
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = UserProfile.objects.create(user=self.user, full_name="Dev", profile_picture=self.upload())
+        profile.refresh_from_db()
+        old_thumb = profile.picture_variants["thumb"]["webp"]
+        storage = profile.profile_picture.storage
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.profile_picture = self.upload("new.jpg", size=(300, 900))
+            profile.save()
+        profile.refresh_from_db()
+        self.assertFalse(storage.exists(old_thumb))
+        self.assertTrue(profile.picture_variants["source"].startswith("profiles/new"))
+        self.assertTrue(storage.exists(profile.picture_variants["thumb"]["jpeg"]))
+
+
+class ConditionalRequestTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username="dev", password="test123")
+        self.guest = User.objects.create_user(username="guest", password="test123")
+        start = timezone.now() + timedelta(days=3)
+        self.event = Event.objects.create(
+            organizer=self.organizer, title="Meetup", description="", location="Berlin",
+            start_time=start, end_time=start + timedelta(hours=2), is_public=True,
+        )
+        self.url = f"/api/events/{self.event.id}/"
+
+    def test_detail_not_modified(self):
+        """✅ A repeated detail GET with the ETag gets 304 and no body."""
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        self.assertEqual(self.client.get(self.url)["ETag"], etag)  # Same validators from the response cache
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_old_cache_entries_are_ignored(self):
+        """✅ Payloads cached before validators were stored alongside them are not read back."""
+        cache.clear()  # setUp ran before the override
+        path = hashlib.md5(f"testserver{self.url}".encode("utf-8")).hexdigest()
+        version = event_cache.current_version()
+        cache.set(f"events:detail:anon:{path}", {"id": self.event.id}, version=version)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_detail_etag_follows_changes(self):
+        """✅ Edits, RSVP counters and invitations each produce a new ETag."""
+        self.client.force_authenticate(user=self.organizer)
+        etags = [self.client.get(self.url)["ETag"]]
+
+        response = self.client.patch(self.url, {"title": "Meetup 2"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etags.append(self.client.get(self.url)["ETag"])
+        self.assertEqual(response["ETag"], etags[-1])
+
+        self.client.force_authenticate(user=self.guest)
+        self.client.post(f"/api/events/{self.event.id}/rsvp/", {"status": "Going"}, format="json")
+        etags.append(self.client.get(self.url)["ETag"])
+
+        self.event.invited_users.add(self.guest)
+        etags.append(self.client.get(self.url)["ETag"])
+        self.assertEqual(len(set(etags)), 4)
+
+    def test_list_and_reviews_not_modified(self):
+        """✅ List pages and review lists answer 304 until their rows change."""
+        etag = self.client.get("/api/events/")["ETag"]
+        self.assertEqual(
+            self.client.get("/api/events/", HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertNotEqual(self.client.get("/api/events/?page=1")["ETag"], etag)
+
+    def test_list_drops_removed_rows(self):
+        """❌ Deleting an event from a list page never answers 304, whatever If-Modified-Since says."""
+        start = timezone.now() + timedelta(days=4)
+        other = Event.objects.create(
+            organizer=self.organizer, title="Later", description="", location="Berlin",
+            start_time=start, end_time=start + timedelta(hours=2), is_public=True,
+        )
+        response = self.client.get("/api/events/")
+        self.assertFalse(response.has_header("Last-Modified"))
+        etag = response["ETag"]
+
+        other.delete()
+        response = self.client.get(
+            "/api/events/", HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        response = self.client.get("/api/events/", HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        reviews = f"/api/events/{self.event.id}/reviews/"
+        etag = self.client.get(reviews)["ETag"]
+        self.assertEqual(self.client.get(reviews, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.client.force_authenticate(user=self.guest)
+        response = self.client.post(reviews, {"rating": 5, "comment": "Great"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get(reviews, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_stale_if_match_rejected(self):
+        """❌ A PATCH with an outdated If-Match gets 412 and changes nothing."""
+        self.client.force_authenticate(user=self.organizer)
+        etag = self.client.get(self.url)["ETag"]
+        self.client.patch(self.url, {"title": "First"}, format="json", HTTP_IF_MATCH=etag)
+
+        response = self.client.patch(self.url, {"title": "Second"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.title, "First")
+
+
+class InvitationBulkTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username="dev", password="test123")
+        self.users = [User.objects.create_user(username=f"guest{i}", password="test123") for i in range(4)]
+        start = timezone.now() + timedelta(days=3)
+        self.event = Event.objects.create(
+            organizer=self.organizer, title="Private Meetup", description="", location="Berlin",
+            start_time=start, end_time=start + timedelta(hours=2), is_public=False,
+        )
+        self.event.invited_users.add(self.users[0])
+        self.url = f"/api/events/{self.event.id}/invitations/"
+
+    def invited(self):
+        return set(self.event.invited_users.values_list("username", flat=True))
+
+    def test_add_ids_and_usernames(self):
+        """✅ Adding mixes ids and usernames; existing and unknown entries are skipped."""
+        self.client.force_authenticate(user=self.organizer)
+        etag = self.client.get(f"/api/events/{self.event.id}/")["ETag"]
+        response = self.client.post(self.url + "add/", {
+            "users": [self.users[0].id, self.users[1].id],
+            "usernames": ["guest2", "ghost"],
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"added": 2, "skipped": 2, "unknown": ["ghost"]})
+        self.assertEqual(self.invited(), {"guest0", "guest1", "guest2"})
+        # The direct M2M writes still invalidate the cache and move the ETag
+        detail = self.client.get(f"/api/events/{self.event.id}/")
+        self.assertNotEqual(detail["ETag"], etag)
+        self.assertEqual(len(detail.data["invited_users"]), 3)
+
+    def test_csv_upload_in_batches(self):
+        """✅ A CSV upload is read in batches with one lookup query per batch."""
+        self.client.force_authenticate(user=self.organizer)
+        upload = SimpleUploadedFile("invitees.csv", b"username\nguest1\nguest2\nguest3\nghost\n", content_type="text/csv")
+        with mock.patch("events.invitations.BATCH_SIZE", 2), CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url + "add/", {"file": upload}, format="multipart")
+        self.assertEqual(response.data, {"added": 3, "skipped": 1, "unknown": ["ghost"]})
+        lookups = [query for query in queries if 'FROM "auth_user"' in query["sql"] and "username" in query["sql"]]
+        self.assertEqual(len(lookups), 2)
+
+        upload = SimpleUploadedFile("remove.csv", f"{self.users[0].id}\n{self.users[3].id}\n".encode(), content_type="text/csv")
+        response = self.client.post(self.url + "remove/", {"file": upload}, format="multipart")
+        self.assertEqual(response.data, {"removed": 2, "skipped": 0, "unknown": []})
+        self.assertEqual(self.invited(), {"guest1", "guest2"})
+
+    def test_concurrent_add_not_counted(self):
+        """✅ An invitee added by a concurrent request in between is skipped, not counted as added."""
+        self.client.force_authenticate(user=self.organizer)
+        invitation = self.event.invited_users.through
+
+        def build(**fields):
+            # The other request commits guest1 after this one read who is invited
+            invitation.objects.get_or_create(event=self.event, user=self.users[1])
+            return invitation(**fields)
+
+        racing = mock.Mock(side_effect=build, objects=invitation.objects)
+        with mock.patch("events.invitations.Invitation", racing):
+            response = self.client.post(self.url + "add/", {"users": [u.id for u in self.users[1:3]]}, format="json")
+        self.assertEqual(response.data, {"added": 1, "skipped": 1, "unknown": []})
+        self.assertEqual(self.invited(), {"guest0", "guest1", "guest2"})
+
+    def test_unreadable_csv_rejected(self):
+        """❌ Non-UTF-8 or malformed CSV uploads get a 400 naming the line, and nothing is added."""
+        self.client.force_authenticate(user=self.organizer)
+        for name, content, line in (
+            ("latin1.csv", "username\nguest1\nJos\xe9\n".encode("latin-1"), 3),
+            ("quotes.csv", b'username\nguest1\n"guest2"x\n', 3),
+        ):
+            upload = SimpleUploadedFile(name, content, content_type="text/csv")
+            response = self.client.post(self.url + "add/", {"file": upload}, format="multipart")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertTrue(response.data["file"][0].startswith(f"Line {line}:"), response.data)
+        self.assertEqual(self.invited(), {"guest0"})
+
+    def test_only_organizer_or_staff(self):
+        """❌ Invitees and empty requests are rejected."""
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.post(self.url + "add/", {"users": [self.users[1].id]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.post(self.url + "add/", {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AdminChangelistTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="test123", email="admin@example.com")
+        self.client.force_login(self.admin)
+        self.guests = [User.objects.create_user(username=f"guest{i}", password="test123") for i in range(3)]
+        start = timezone.now() + timedelta(days=3)
+        self.events = [
+            Event.objects.create(
+                organizer=self.admin, title=title, description="", location="Berlin",
+                start_time=start, end_time=start + timedelta(hours=2), is_public=True,
+            )
+            for title in ("Python Meetup", "Jazz Night")
+        ]
+        Review.objects.create(event=self.events[0], user=self.guests[0], rating=5, comment="Fantastic venue")
+        Review.objects.create(event=self.events[1], user=self.guests[1], rating=3, comment="Too loud")
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """✅ Related columns are joined, so more rows cost no extra queries."""
+        RSVP.objects.create(event=self.events[0], user=self.guests[0], status="Going")
+        before = self.changelist_queries("/admin/events/rsvp/")
+        for event in self.events:
+            for guest in self.guests:
+                RSVP.objects.get_or_create(event=event, user=guest, defaults={"status": "Maybe"})
+        self.assertEqual(self.changelist_queries("/admin/events/rsvp/"), before)
+
+    def test_indexed_search(self):
+        """✅ Searches match comment words (FTS) and username prefixes."""
+        response = self.client.get("/admin/events/review/?q=fantas")
+        self.assertEqual([review.comment for review in response.context["cl"].result_list], ["Fantastic venue"])
+        response = self.client.get("/admin/events/review/?q=guest1")
+        self.assertEqual([review.comment for review in response.context["cl"].result_list], ["Too loud"])
+        response = self.client.get("/admin/events/event/?q=jazz")
+        self.assertEqual([event.title for event in response.context["cl"].result_list], ["Jazz Night"])
+
+    def test_user_search(self):
+        """✅ Users match by username, email, first or last name prefix, ignoring case, every word required."""
+        User.objects.create_user(
+            username="jdoe", password="test123", email="Jane.Doe@Example.com", first_name="Jane", last_name="Doe"
+        )
+        User.objects.create_user(username="Janet", password="test123", first_name="Janet", last_name="Smith")
+
+        def search(term):
+            response = self.client.get("/admin/auth/user/", {"q": term})
+            return sorted(user.username for user in response.context["cl"].result_list)
+
+        self.assertEqual(search("GUEST1"), ["guest1"])
+        self.assertEqual(search("jane.doe@"), ["jdoe"])
+        self.assertEqual(search("jan"), ["Janet", "jdoe"])
+        self.assertEqual(search("jane doe"), ["jdoe"])
+        self.assertEqual(search("smi"), ["Janet"])
+        self.assertEqual(search("oe"), [])  # Prefixes only, no substring scans
+
+    def test_search_without_condition_uses_search_fields(self):
+        """✅ An admin that defines no search_condition falls back to Django's search_fields search."""
+        class ProfileAdmin(ScalableModelAdmin):
+            search_fields = ("location",)
+
+        UserProfile.objects.create(user=self.guests[0], full_name="Guest", location="Hamburg")
+        model_admin = ProfileAdmin(UserProfile, admin.site)
+        request = RequestFactory().get("/admin/events/userprofile/", {"q": "burg"})
+        queryset, may_have_duplicates = model_admin.get_search_results(request, UserProfile.objects.all(), "burg")
+        self.assertEqual([profile.location for profile in queryset], ["Hamburg"])
+        self.assertFalse(may_have_duplicates)
+
+    def test_estimated_counts(self):
+        """✅ Large tables report the estimate; filtered counts stop at the cap."""
+        Review.objects.filter(user=self.guests[0]).delete()  # Leaves a gap below the highest id
+        Review.objects.create(event=self.events[0], user=self.guests[2], rating=4, comment="Nice")
+        with mock.patch.object(EstimatedCountPaginator, "exact_below", 1):
+            self.assertEqual(EstimatedCountPaginator(Review.objects.order_by("id"), 10).count, Review.objects.latest("id").id)
+        with mock.patch.object(EstimatedCountPaginator, "count_limit", 1):
+            self.assertEqual(EstimatedCountPaginator(Review.objects.filter(rating__gte=1).order_by("id"), 10).count, 1)
+        self.assertEqual(EstimatedCountPaginator(Review.objects.order_by("id"), 10).count, 2)
+
+    def test_autocomplete(self):
+        """✅ Invitee and organizer pickers search users by username prefix."""
+        response = self.client.get(
+            "/admin/autocomplete/?app_label=events&model_name=event&field_name=invited_users&term=guest"
+        )
+        self.assertEqual(len(response.json()["results"]), 3)
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import EventViewSet, RSVPViewSet, RSVPUpdateView,  ReviewViewSet
+from . import async_views
+from .views import EventViewSet, RSVPViewSet, RSVPUpdateView, RSVPBulkView, EventRSVPBulkView, InvitationBulkView, ReviewViewSet, ReviewSummaryView, BulkExportView
 
 router = DefaultRouter()
 router.register(r'events', EventViewSet, basename='event')
@@ -8,7 +9,18 @@ router.register(r'events', EventViewSet, basename='event')
 urlpatterns = [
     path('', include(router.urls)),
     path('events/<int:event_id>/rsvp/', RSVPViewSet.as_view({'post': 'create'})),
+    path('events/<int:event_id>/rsvp/bulk/', EventRSVPBulkView.as_view(), name='event-rsvp-bulk'),
     path('events/<int:event_id>/rsvp/<int:user_id>/', RSVPUpdateView.as_view(), name='rsvp-update'),
+    path('rsvps/bulk/', RSVPBulkView.as_view(), name='rsvp-bulk'),
+    path('events/<int:event_id>/invitations/add/', InvitationBulkView.as_view(add=True), name='invitation-add'),
+    path('events/<int:event_id>/invitations/remove/', InvitationBulkView.as_view(add=False), name='invitation-remove'),
     path('events/<int:event_id>/reviews/', ReviewViewSet.as_view({'get': 'list', 'post': 'create'})),
+    path('events/<int:event_id>/reviews/summary/', ReviewSummaryView.as_view(), name='review-summary'),
+    path('export/<slug:kind>.<slug:file_format>', BulkExportView.as_view(), name='bulk-export'),
+
+    # Async (ASGI-native) read endpoints
+    path('async/events/', async_views.event_list, name='async-event-list'),
+    path('async/events/<int:pk>/', async_views.event_detail, name='async-event-detail'),
+    path('async/events/<int:event_id>/reviews/', async_views.review_list, name='async-review-list'),
 
 ]
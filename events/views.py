@@ -1,12 +1,26 @@
-from django.http import JsonResponse
+from django.contrib.auth.models import User
+from django.db.models import Prefetch
+from django.db import transaction
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from rest_framework import viewsets, generics, permissions
-from django.db.models import Q
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK
 from django.shortcuts import get_object_or_404
-from .models import Event, RSVP, Review
-from .serializers import EventSerializer, RSVPSerializer, ReviewSerializer
+from django.utils import timezone
+from . import bulk, cache as event_cache, conditional, invitations, outbox
+from .authentication import get_user_cache
+from .facets import facet_counts, filter_events
+from .models import Event, EventStats, RSVP, Review
+from .serializers import (
+    EventCalendarQuerySerializer, EventFacetFilterSerializer, EventSerializer, EventListSerializer, EventRSVPBulkSerializer,
+    InvitationBulkSerializer, RSVPBulkSerializer, RSVPSerializer, ReviewSerializer,
+)
+from .pagination import EventPagination, EventStartCursorPagination, ReviewCursorPagination, SearchPagination
 from .permissions import IsOrganizerOrInvitedOrReadOnly
-from .tasks import send_event_email
+from .search import search_events
+from .stats import apply_rsvp_changes, record_rsvp_change
 
 
 
@@ -25,31 +39,183 @@ def home(request):
             
             # 🔹 Events
             "List Events": "/api/events/ (GET)",
+            "Filter Events with Facet Counts": "/api/events/?location=...&is_public=...&organizer=...&month=YYYY-MM&facets=true (GET)",
             "Create Event": "/api/events/ (POST)",
             "Event Details": "/api/events/{id}/ (GET)",
             "Update Event": "/api/events/{id}/ (PUT)",
             "Delete Event": "/api/events/{id}/ (DELETE)",
+            "Search Events": "/api/events/search/?q={text} (GET)",
+            "Events by Time": "/api/events/calendar/?when=upcoming|ongoing|overlap (GET)",
+            "My Conflicting Events": "/api/events/{id}/conflicts/ (GET)",
 
             # 🔹 RSVP
             "RSVP to Event": "/api/events/{event_id}/rsvp/ (POST)",
             "Update RSVP Status": "/api/events/{event_id}/rsvp/{user_id}/ (PATCH)",
+            "Bulk RSVP (own)": "/api/rsvps/bulk/ (POST)",
+            "Bulk RSVP (event import)": "/api/events/{event_id}/rsvp/bulk/ (POST)",
+
+            # 🔹 Invitations
+            "Invite Users (ids, usernames or CSV)": "/api/events/{event_id}/invitations/add/ (POST)",
+            "Uninvite Users (ids, usernames or CSV)": "/api/events/{event_id}/invitations/remove/ (POST)",
 
             # 🔹 Reviews
             "List Reviews for Event": "/api/events/{event_id}/reviews/ (GET)",
             "Add Review for Event": "/api/events/{event_id}/reviews/ (POST)",
+            "Review Summary for Event": "/api/events/{event_id}/reviews/summary/ (GET)",
+
+            # 🔹 Bulk export
+            "Export Events / RSVPs / Reviews (staff)": "/api/export/{events|rsvps|reviews}.{ndjson|csv} (GET)",
+
+            # 🔹 Monitoring
+            "Prometheus Metrics (staff or scrape token)": "/metrics (GET)",
+
+            # 🔹 Async (ASGI) reads
+            "List Events (async)": "/api/async/events/ (GET)",
+            "Event Details (async)": "/api/async/events/{id}/ (GET)",
+            "List Reviews (async)": "/api/async/events/{event_id}/reviews/ (GET)",
         },
         "note": "Use POST on /api/token/ with username and password to get access and refresh tokens.",
         
     })
 
 # ================================================
-# Custom Pagination for Events
+# Cached Reads
 # ================================================
-# Controls how many event records appear per page in API responses
-class EventPagination(PageNumberPagination):
-    page_size = 5  # Default number of events per page
-    page_size_query_param = 'page_size'  # Allows client to customize page size using a query parameter
-    max_page_size = 50  # Maximum limit for page size to prevent heavy responses
+# Serves list/retrieve from the versioned response cache (see events/cache.py).
+# View-level permission checks still run before the handler; object-level
+# checks ran when the entry was first cached for the same visibility scope.
+class CachedReadMixin:
+    def list(self, request, *args, **kwargs):
+        return self.cached_response('list', super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response('detail', super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, kind, handler, request, *args, **kwargs):
+        if not event_cache.enabled():
+            return handler(request, *args, **kwargs)  # No shared cache configured
+        version = event_cache.current_version()
+        cached = event_cache.get_response_data(kind, request, version)
+        if cached is not None:
+            # The ETag / Last-Modified the payload was built with come along with it
+            data, self.response_validators = cached
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            validators = getattr(self, 'response_validators', None)
+            event_cache.set_response_data(kind, request, (response.data, validators), version)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+# ================================================
+# Conditional Requests
+# ================================================
+# Answers If-None-Match / If-Modified-Since with 304 and enforces If-Match /
+# If-Unmodified-Since on writes (412) from one narrow `values_list` query,
+# before any instance is loaded or serialized. Responses carry the ETag (and,
+# for single objects, Last-Modified) of what they hold, read off the loaded
+# page/object (or the response cache), so plain reads cost no extra query.
+class ConditionalMixin:
+    validator_fields = ()  # Columns that, together, decide a row's representation
+    modified_fields = ()  # Those of them holding modification times
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(self.list_validators, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(self.detail_validators, super().retrieve, request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        # The row lock keeps the If-Match check and the write from interleaving with another edit
+        with transaction.atomic():
+            return self.conditional_response(
+                self.detail_validators, super().update, request, *args, lock=True, **kwargs
+            )
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return self.conditional_response(
+                self.detail_validators, super().destroy, request, *args, lock=True, **kwargs
+            )
+
+    def conditional_response(self, validators, handler, request, *args, lock=False, **kwargs):
+        self.response_validators = None
+        if conditional.has_preconditions(request):
+            current = validators(request, lock=lock)
+            if current is not None:
+                response = conditional.check(request, *current)
+                if response is not None:
+                    return response
+
+        response = handler(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD'):
+            current = self.response_validators
+        elif response.status_code == 200:
+            current = validators(request)  # After a write the old validators are stale
+        else:
+            current = None
+        if current is not None:
+            conditional.apply(response, *current)
+        return response
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and self.action == 'list':
+            self.response_validators = self.page_validators(*self.paginator.loaded_rows(self.validator_row))
+        return page
+
+    def get_object(self):
+        instance = super().get_object()
+        if self.action == 'retrieve':
+            self.response_validators = self.object_validators(self.validator_row(instance))
+        return instance
+
+    def validator_row(self, instance):
+        return tuple(conditional.lookup(instance, field) for field in self.validator_fields)
+
+    def list_validators(self, request, lock=False):
+        """
+        Validators of the list page this request asks for, from the page's
+        rows alone (same filters, ordering and cursor as the page itself).
+        """
+        page = self.paginator.page_rows(self.validator_queryset(), request, self.validator_fields)
+        return self.page_validators(*page) if page is not None else None
+
+    def detail_validators(self, request, lock=False):
+        """
+        Validators of one object, or None when it is missing so the regular
+        404 applies.
+        """
+        try:
+            pk = int(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (TypeError, ValueError):
+            return None
+        queryset = self.validator_queryset().filter(pk=pk)
+        if lock:
+            queryset = queryset.select_for_update(of=('self',))
+        row = queryset.values_list(*self.validator_fields).first()
+        return self.object_validators(row) if row is not None else None
+
+    def validator_queryset(self):
+        return self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None)
+
+    def page_validators(self, count, rows):
+        # ETag only: a row leaving the page doesn't make the newest remaining
+        # timestamp any newer, so a Last-Modified would answer 304 for it
+        etag = conditional.make_etag(conditional.representation(self.request), count, rows)
+        return etag, None
+
+    def object_validators(self, row):
+        etag = conditional.make_etag(conditional.representation(self.request), row)
+        return etag, self.last_modified([row])
+
+    def last_modified(self, rows):
+        indexes = [self.validator_fields.index(field) for field in self.modified_fields]
+        return conditional.newest(*(row[index] for row in rows for index in indexes))
 
 
 # ================================================
@@ -57,10 +223,14 @@ class EventPagination(PageNumberPagination):
 # ================================================
 # Handles CRUD operations for Event model
 # Includes filtering logic to show only accessible events for each user
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ConditionalMixin, CachedReadMixin, viewsets.ModelViewSet):
     serializer_class = EventSerializer
     permission_classes = [IsOrganizerOrInvitedOrReadOnly]  # Custom permission: organizers or invited users can modify
-    pagination_class = EventPagination  # Use custom pagination defined above
+    pagination_class = EventPagination  # Keyset pagination by default, page numbers on `?page=N`
+    lightweight_user = True  # Reads authenticate from token claims, without a user query
+    compact_actions = ('list', 'search', 'calendar', 'conflicts')  # Actions returning EventListSerializer rows
+    validator_fields = ('id', 'updated_at', 'stats__updated_at', 'organizer__username')  # ETag inputs (counters live in stats)
+    modified_fields = ('updated_at', 'stats__updated_at')
     
     def get_queryset(self):
         """
@@ -68,27 +238,148 @@ class EventViewSet(viewsets.ModelViewSet):
         - Authenticated users: Can see public, their own, or invited events.
         - Anonymous users: Only see public events.
         """
-        user = self.request.user
+        # Public OR organizer OR EXISTS(invitation): one pass over the feed index, no DISTINCT
+        queryset = Event.objects.visible_to(self.request.user).order_by('-created_at', '-id')
+
+        # Load everything the serializer touches up front (organizer username,
+        # RSVP counters, invitee ids on the full representation) to avoid per-row queries
+        queryset = queryset.select_related('organizer', 'stats')
+        if self.action not in self.compact_actions:
+            queryset = queryset.prefetch_related(
+                Prefetch('invited_users', queryset=User.objects.only('id'))
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        """
+        Uses the compact representation for list pages and search results and
+        the full one (with description and invitees) everywhere else.
+        """
+        if self.action in self.compact_actions:
+            return EventListSerializer
+        return EventSerializer
+
+    def get_facet_params(self):
+        """
+        Validated `/api/events/` facet filters (plain dict of the query string,
+        so absent booleans stay absent instead of reading as False).
+        """
+        if not hasattr(self, '_facet_params'):
+            params = EventFacetFilterSerializer(data=self.request.query_params.dict())
+            params.is_valid(raise_exception=True)
+            self._facet_params = params.validated_data
+        return self._facet_params
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == 'list':
+            queryset = filter_events(queryset, self.get_facet_params())
+        return queryset
+
+    def get_paginated_response(self, data):
+        """
+        Adds `facets` (counts per value over everything the user can see)
+        to list pages requested with `?facets=true`.
+        """
+        response = super().get_paginated_response(data)
+        if self.action == 'list' and self.get_facet_params()['facets']:
+            response.data['facets'] = facet_counts(self.request.user)
+        return response
+
+    def page_validators(self, count, rows):
+        # Facet counts span every visible event, not just the page
+        if self.get_facet_params()['facets']:
+            return None
+        return super().page_validators(count, rows)
+
+    @action(detail=False, methods=['get'], pagination_class=SearchPagination)
+    def search(self, request):
+        """
+        GET /api/events/search/?q=... — full-text search over title,
+        description and location among the events the user can see,
+        best matches first.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': ['This query parameter is required.']})
+        return self.cached_response('search', self.search_results, request, query)
+
+    def search_results(self, request, query):
+        queryset = search_events(self.get_queryset(), query)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'], pagination_class=EventStartCursorPagination)
+    def calendar(self, request):
+        """
+        GET /api/events/calendar/?when=upcoming|ongoing|overlap&start=...&end=...
+        Visible events by time, soonest first. Not cached: "now" keeps moving.
+        """
+        params = EventCalendarQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        when = params.validated_data['when']
 
-        if user.is_authenticated:
-            # Authenticated users can see their own, invited, or public events
-            return Event.objects.filter(
-                Q(is_public=True) |
-                Q(organizer=user) |
-                Q(invited_users=user)
-            ).distinct().order_by('-created_at')
+        queryset = self.get_queryset()
+        if when == 'overlap':
+            queryset = queryset.overlapping(params.validated_data['start'], params.validated_data['end'])
+        elif when == 'ongoing':
+            queryset = queryset.ongoing(timezone.now())
         else:
-            # Non-logged-in users can only see public events
-            return Event.objects.filter(is_public=True).order_by('-created_at')
+            queryset = queryset.upcoming(timezone.now())
 
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def conflicts(self, request, pk=None):
+        """
+        GET /api/events/{id}/conflicts/ — the caller's "Going" events whose
+        time overlaps this one. The RSVP ids stay in the database (IN
+        subquery on the user/status index); only overlapping events come back.
+        """
+        event = self.get_object()
+        going = RSVP.objects.filter(user_id=request.user.pk, status='Going').values('event_id')
+        conflicts = (
+            self.get_queryset()
+            .overlapping(event.start_time, event.end_time)
+            .filter(pk__in=going)
+            .exclude(pk=event.pk)
+            .order_by('start_time', 'id')
+        )
+        serializer = self.get_serializer(conflicts, many=True)
+        return Response({'event': event.pk, 'conflicts': serializer.data})
+
+    @action(
+        detail=False, methods=['get'], url_path='cache-stats',
+        permission_classes=[permissions.IsAdminUser], lightweight_user=False,  # needs the real is_staff
+    )
+    def cache_stats(self, request):
+        """
+        Hit/miss counters of this process's response cache, plus the current
+        version and the authenticated-user cache counters.
+        """
+        return Response({**event_cache.stats(), 'user_cache': get_user_cache().stats()})
 
     def perform_create(self, serializer):
         """
         Automatically sets the logged-in user as the event organizer upon creation.
-        Also triggers an asynchronous email notification using Celery.
+        The email notification is recorded in the outbox in the same transaction
+        and handed to Celery after commit, off the request path.
         """
-        event = serializer.save(organizer=self.request.user)
-        send_event_email.delay(event.id)  # Send email in background
+        with transaction.atomic():
+            event = serializer.save(organizer=self.request.user)
+            outbox.enqueue('event.created', event.id)
+
+    def perform_update(self, serializer):
+        """
+        Saves the edit and queues an update notification; repeated edits made
+        before the outbox is drained coalesce into one notification.
+        """
+        with transaction.atomic():
+            event = serializer.save()
+            outbox.enqueue('event.updated', event.id)
 
 
 # ================================================
@@ -102,22 +393,21 @@ class RSVPViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """
-        Prevents duplicate RSVPs for the same user and event.
-        If RSVP exists → update status.
+        Prevents duplicate RSVPs for the same user and event through
+        RSVP.objects.upsert_locked(), the same locked upsert the bulk views use:
+        If RSVP exists → update status (or keep it when none was sent).
         Else → create a new RSVP entry.
         """
         event_id = self.kwargs.get("event_id")
-        event = get_object_or_404(Event, id=event_id)
-
-        # Check if RSVP already exists
-        existing_rsvp = RSVP.objects.filter(event=event, user=self.request.user).first()
-        if existing_rsvp:
-            # Update existing RSVP instead of creating a duplicate
-            existing_rsvp.status = serializer.validated_data.get("status", existing_rsvp.status)
-            existing_rsvp.save()
-        else:
-            # Create a new RSVP record
-            serializer.save(user=self.request.user, event=event)
+        event = get_object_or_404(Event.objects.only("id"), id=event_id)
+
+        status = serializer.validated_data.get("status")
+        rsvp = RSVP(event=event, user=self.request.user, status=status or RSVP._meta.get_field("status").default)
+        with transaction.atomic():
+            # The previous status is read under the row lock to move the per-event counters
+            previous = RSVP.objects.upsert_locked([rsvp], update_status=status is not None)
+            record_rsvp_change(event.id, previous[event.id, self.request.user.pk], rsvp.status)
+        serializer.instance = rsvp
 
     def get_queryset(self):
         """
@@ -127,6 +417,101 @@ class RSVPViewSet(viewsets.ModelViewSet):
         return RSVP.objects.filter(event_id=event_id)
 
 
+# ================================================
+# Bulk RSVP Views
+# ================================================
+# Apply many RSVPs in one transaction with a single upsert statement
+class RSVPBulkView(generics.GenericAPIView):
+    """
+    POST /api/rsvps/bulk/ — many (event, status) pairs for the logged-in user.
+    """
+    serializer_class = RSVPBulkSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Last entry wins if the same event appears twice
+        statuses = {item["event"]: item["status"] for item in serializer.validated_data["rsvps"]}
+        # Events the user can't see are reported like missing ones, without revealing they exist
+        visible = Event.objects.visible_to(request.user).filter(id__in=statuses)
+        missing = sorted(set(statuses) - set(visible.values_list("id", flat=True)))
+        if missing:
+            raise ValidationError({"rsvps": [f"Unknown event ids: {missing}"]})
+
+        rows = [RSVP(event_id=event_id, user=request.user, status=status) for event_id, status in statuses.items()]
+        with transaction.atomic():
+            previous = RSVP.objects.upsert_locked(rows)
+            apply_rsvp_changes(
+                (event_id, previous[event_id, request.user.pk], status) for event_id, status in statuses.items()
+            )
+        return Response({"upserted": len(rows)}, status=HTTP_200_OK)
+
+
+class EventRSVPBulkView(generics.GenericAPIView):
+    """
+    POST /api/events/{event_id}/rsvp/bulk/ — many (user, status) pairs for one
+    event. Used by import tools, so only the organizer or staff may call it.
+    """
+    serializer_class = EventRSVPBulkSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        event = get_object_or_404(Event.objects.only("id", "organizer_id"), id=self.kwargs["event_id"])
+        if event.organizer_id != request.user.pk and not request.user.is_staff:
+            raise PermissionDenied("Only the organizer can import RSVPs for this event.")
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        statuses = {item["user"]: item["status"] for item in serializer.validated_data["rsvps"]}
+        found = set(User.objects.filter(id__in=statuses).values_list("id", flat=True))
+        missing = sorted(set(statuses) - found)
+        if missing:
+            raise ValidationError({"rsvps": [f"Unknown user ids: {missing}"]})
+
+        rows = [RSVP(event=event, user_id=user_id, status=status) for user_id, status in statuses.items()]
+        with transaction.atomic():
+            previous = RSVP.objects.upsert_locked(rows)
+            apply_rsvp_changes(
+                (event.id, previous[event.id, user_id], status) for user_id, status in statuses.items()
+            )
+        return Response({"upserted": len(rows)}, status=HTTP_200_OK)
+
+
+# ================================================
+# Bulk Invitation Views
+# ================================================
+# Adds or removes a batch of invitees without resending the whole
+# `invited_users` list through EventSerializer (see events/invitations.py)
+class InvitationBulkView(generics.GenericAPIView):
+    """
+    POST /api/events/{event_id}/invitations/add/ (or /remove/) with
+    {"users": [ids], "usernames": [...]} or a multipart CSV `file`.
+    Organizer or staff only. Answers with the added/removed and skipped counts.
+    """
+    serializer_class = InvitationBulkSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    add = True  # Set per route in urls.py
+
+    def post(self, request, *args, **kwargs):
+        event = get_object_or_404(Event.objects.only("id", "organizer_id"), id=self.kwargs["event_id"])
+        if event.organizer_id != request.user.pk and not request.user.is_staff:
+            raise PermissionDenied("Only the organizer can change invitations for this event.")
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        if "file" in data:
+            values = invitations.read_csv(data["file"])
+        else:
+            values = data.get("users", []) + data.get("usernames", [])
+        result = invitations.change_invitations(event.id, values, add=self.add)
+        return Response(result, status=HTTP_200_OK)
+
+
 # ================================================
 # RSVP Update View
 # ================================================
@@ -144,21 +529,34 @@ class RSVPUpdateView(generics.UpdateAPIView):
         print(user_id)  # Debugging/logging purpose
         return get_object_or_404(RSVP, event_id=event_id, user_id=user_id)
 
+    def perform_update(self, serializer):
+        """
+        Saves the new status and moves the event's RSVP counters accordingly.
+        """
+        previous_status = serializer.instance.status
+        with transaction.atomic():
+            rsvp = serializer.save()
+            record_rsvp_change(rsvp.event_id, previous_status, rsvp.status)
+
 
 
 # ================================================
 # Review ViewSet
 # ================================================
 # Handles creation and retrieval of event reviews
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    pagination_class = ReviewCursorPagination  # Newest first, cursor-based
+    lightweight_user = True
+    validator_fields = ('id', 'rating', 'comment', 'created_at', 'user__username')  # No updated_at: edits show in rating/comment
+    modified_fields = ('created_at',)
 
     def get_queryset(self):
         """
         Returns all reviews associated with a specific event.
         """
         event_id = self.kwargs['event_id']
-        return Review.objects.filter(event_id=event_id)
+        return Review.objects.filter(event_id=event_id).select_related('user')
 
     def perform_create(self, serializer):
         """
@@ -166,3 +564,49 @@ class ReviewViewSet(viewsets.ModelViewSet):
         """
         event_id = self.kwargs['event_id']
         serializer.save(user=self.request.user, event_id=event_id)
+
+
+# ================================================
+# Review Summary View
+# ================================================
+# Answers from the running aggregates in EventStats, never from the Review table
+class ReviewSummaryView(generics.GenericAPIView):
+    lightweight_user = True
+
+    def get(self, request, event_id):
+        """
+        Returns review count, average rating and the 1–5 rating histogram.
+        """
+        visible = Event.objects.visible_to(request.user).filter(id=event_id)
+        # Visibility rides along as a subquery, so a visible event is still one query
+        stats = EventStats.objects.filter(event__in=visible).first()
+        if stats is None:
+            # Stats rows are created with the event; hidden events answer like missing ones
+            get_object_or_404(visible.only('id'))
+            stats = EventStats(event_id=event_id)
+        return Response({
+            'event': int(event_id),
+            'review_count': stats.review_count,
+            'average_rating': stats.average_rating,
+            'rating_histogram': stats.rating_histogram,
+        })
+
+
+# ================================================
+# Bulk Export View
+# ================================================
+# Streams whole tables for reporting jobs instead of paging the API
+class BulkExportView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAdminUser]  # Raw dumps ignore event visibility: staff only
+
+    def get(self, request, kind, file_format):
+        """
+        GET /api/export/{events|rsvps|reviews}.{ndjson|csv} — every row, in id order.
+        """
+        if kind not in bulk.EXPORT_FIELDS or file_format not in bulk.EXPORT_FORMATS:
+            raise Http404
+        response = StreamingHttpResponse(
+            bulk.export_chunks(kind, file_format), content_type=bulk.EXPORT_FORMATS[file_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="{kind}.{file_format}"'
+        return response